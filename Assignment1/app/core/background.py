@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Sequence
+
+from fastapi import FastAPI
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicWorker:
+    """Runs ``job`` every ``interval`` seconds, or sooner when :meth:`wake` is called."""
+
+    def __init__(
+        self,
+        name: str,
+        job: Callable[[], Awaitable[None]],
+        *,
+        interval: float,
+    ) -> None:
+        self.name = name
+        self.job = job
+        self.interval = interval
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def run_once(self) -> None:
+        self._wakeup.clear()
+        await self.job()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("background_job_failed", extra={"worker": self.name})
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._loop(), name=self.name)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+def worker_lifespan(
+    workers: Callable[[], Sequence[PeriodicWorker]],
+) -> Callable[[FastAPI], AbstractAsyncContextManager[None]]:
+    """FastAPI lifespan that starts the workers on startup and stops them on shutdown."""
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        started = list(workers())
+        for worker in started:
+            worker.start()
+        try:
+            yield
+        finally:
+            for worker in started:
+                await worker.stop()
+
+    return lifespan
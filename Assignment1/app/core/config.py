@@ -21,6 +21,42 @@ class AppSettings(BaseSettings):
     patient_api_prefix: str = "/api/v1/patient"
     admin_api_prefix: str = "/api/v1/admin"
     gateway_request_timeout: float = 5.0
+    replica_dsns: list[str] = []
+    read_your_writes_seconds: float = 5.0
+    slow_query_threshold_ms: float = 200.0
+    clinic_timezone: str = "UTC"
+    availability_mode: Literal["live", "snapshot"] = "live"
+    availability_snapshot_days: int = 14
+    availability_snapshot_refresh_seconds: float = 30.0
+    booking_queue_mode: Literal["off", "doctor", "day"] = "off"
+    booking_queue_batch_size: int = 16
+    booking_queue_timeout_seconds: float = 5.0
+    booking_queue_max_pending: int = 256
+    known_full_ttl_seconds: float = 5.0
+    catalog_cache_ttl_seconds: float = 5.0
+    schedule_cache_ttl_seconds: float = 5.0
+    doctor_search_mode: Literal["index", "db"] = "index"
+    outbox_poll_seconds: float = 1.0
+    outbox_batch_size: int = 100
+    outbox_retention_hours: float = 24.0
+    # 아웃박스 커서 소유자 이름. 비어 있으면 호스트:pid 를 쓴다.
+    outbox_worker_name: str = ""
+    idempotency_ttl_hours: float = 24.0
+    idempotency_wait_seconds: float = 2.0
+    idempotency_lock_seconds: float = 30.0
+    idempotency_cleanup_seconds: float = 300.0
+    # 0 이면 보관 이동을 하지 않는다.
+    appointment_archive_after_days: int = 0
+    appointment_archive_batch_size: int = 1000
+    appointment_archive_interval_seconds: float = 3600.0
+    # 지난 예약 자동 전환 규칙 (현재 상태 -> 바꿀 상태). 비어 있으면 끈다.
+    # 예: APPOINTMENT_SWEEP_RULES='{"CONFIRMED": "COMPLETED", "PENDING": "CANCELLED"}'
+    appointment_sweep_rules: dict[str, str] = {}
+    appointment_sweep_grace_minutes: int = 60
+    appointment_sweep_batch_size: int = 500
+    appointment_sweep_max_batches: int = 20
+    appointment_sweep_batch_pause_seconds: float = 0.1
+    appointment_sweep_interval_seconds: float = 300.0
 
     model_config = SettingsConfigDict(
         env_file=(".env", ".env.development", ".env.test"),
@@ -98,6 +98,30 @@ class InvalidStatusTransitionError(ServiceError):
     default_message = "Status transition is not allowed"
 
 
+class IdempotencyKeyReusedError(ServiceError):
+    code = "IDEMPOTENCY_KEY_REUSED"
+    # starlette renamed the 422 constant; the literal works on every supported version
+    status_code = 422
+    default_message = "Idempotency key was already used for a different request"
+
+
+class IdempotencyInProgressError(ConflictError):
+    code = "IDEMPOTENCY_IN_PROGRESS"
+    default_message = "A request with this idempotency key is still being processed"
+
+
+class BookingQueueFullError(ServiceError):
+    code = "BOOKING_QUEUE_FULL"
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_message = "Too many bookings are waiting for this schedule; retry shortly"
+
+
+class BookingQueueTimeoutError(ServiceError):
+    code = "BOOKING_QUEUE_TIMEOUT"
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_message = "Booking was not started in time; retry later with the same Idempotency-Key"
+
+
 def _build_error_response(
     request: Request, *, message: str, status_code: int, code: str
 ) -> ErrorResponse:
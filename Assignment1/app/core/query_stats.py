@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from Assignment1.app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_START_KEY = "query_stats_start"
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        if elapsed >= self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_seconds * 1000
+
+    @property
+    def slowest_ms(self) -> float:
+        return self.slowest_seconds * 1000
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.total_ms:.2f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_ms:.2f}"
+        )
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar(
+    "query_stats", default=None
+)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def attach_query_stats(stats: QueryStats | None) -> Iterator[None]:
+    """Count the statements run here towards ``stats`` (e.g. work done for a request on another task)."""
+    token = _current_stats.set(stats)
+    try:
+        yield
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault(_START_KEY, []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    starts = conn.info.get(_START_KEY)
+    if stats is None or not starts:
+        return
+    stats.record(statement, perf_counter() - starts.pop())
+
+
+def install_query_hooks() -> None:
+    """Attach the cursor timing hooks to every engine (idempotent)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """Collects per-request SQL stats, exposes them via ``Server-Timing`` and logs slow requests."""
+
+    def __init__(self, app: ASGIApp, *, slow_threshold_ms: float | None = None) -> None:
+        self.app = app
+        self.slow_threshold_ms = (
+            get_settings().slow_query_threshold_ms
+            if slow_threshold_ms is None
+            else slow_threshold_ms
+        )
+        install_query_hooks()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            if stats.total_ms >= self.slow_threshold_ms:
+                logger.warning(
+                    "slow_db_request",
+                    extra={
+                        "method": scope.get("method"),
+                        "path": scope.get("path"),
+                        "db_statements": stats.count,
+                        "db_ms": round(stats.total_ms, 2),
+                        "db_slowest_ms": round(stats.slowest_ms, 2),
+                        "db_slowest_statement": stats.slowest_statement,
+                    },
+                )
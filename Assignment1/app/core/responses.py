@@ -0,0 +1,25 @@
+"""JSON responses for large list endpoints.
+
+List endpoints project rows straight into dicts and return
+:class:`FastJSONResponse`, which skips building and re-validating one
+Pydantic model per row. The route keeps its ``response_model`` so the OpenAPI
+schema is unchanged; FastAPI does not validate a returned ``Response``, so the
+projected dicts have to match that schema themselves.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def dumps(content: Any) -> bytes:
+    # OPT_UTC_Z: Pydantic 과 같이 UTC 는 "Z" 로 표기한다.
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -2,9 +2,17 @@ from .models import (
     Appointment,
     AppointmentSlot,
     AppointmentStatus,
+    ArchivedAppointment,
+    ArchivedAppointmentSlot,
     Base,
     Doctor,
     HospitalSlot,
+    HospitalSlotOverride,
+    HospitalSlotTemplate,
+    IdempotencyKey,
+    OutboxDeadLetter,
+    OutboxEvent,
+    OutboxGap,
     Patient,
     SystemConfig,
     TimestampMixin,
@@ -16,9 +24,17 @@ __all__ = [
     "Appointment",
     "AppointmentSlot",
     "AppointmentStatus",
+    "ArchivedAppointment",
+    "ArchivedAppointmentSlot",
     "Base",
     "Doctor",
     "HospitalSlot",
+    "HospitalSlotOverride",
+    "HospitalSlotTemplate",
+    "IdempotencyKey",
+    "OutboxDeadLetter",
+    "OutboxEvent",
+    "OutboxGap",
     "Patient",
     "SystemConfig",
     "TimestampMixin",
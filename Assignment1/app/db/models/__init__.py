@@ -2,10 +2,15 @@ from .base import Base, TimestampMixin
 from .doctor import Doctor
 from .treatment import Treatment
 from .hospital_slot import HospitalSlot
+from .hospital_slot_template import HospitalSlotTemplate
+from .hospital_slot_override import HospitalSlotOverride
 from .patient import Patient
 from .appointment import Appointment, AppointmentStatus, VisitType
 from .appointment_slot import AppointmentSlot
+from .appointment_archive import ArchivedAppointment, ArchivedAppointmentSlot
 from .system_config import SystemConfig
+from .outbox_event import OutboxDeadLetter, OutboxEvent, OutboxGap
+from .idempotency_key import IdempotencyKey
 
 __all__ = [
     "Base",
@@ -13,10 +18,18 @@ __all__ = [
     "Doctor",
     "Treatment",
     "HospitalSlot",
+    "HospitalSlotTemplate",
+    "HospitalSlotOverride",
     "Patient",
     "Appointment",
     "AppointmentStatus",
     "VisitType",
     "AppointmentSlot",
+    "ArchivedAppointment",
+    "ArchivedAppointmentSlot",
     "SystemConfig",
+    "OutboxEvent",
+    "OutboxGap",
+    "OutboxDeadLetter",
+    "IdempotencyKey",
 ]
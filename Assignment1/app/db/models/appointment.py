@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import DateTime, ForeignKey, Text, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey, Index, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
@@ -47,6 +47,7 @@ class Appointment(Base, TimestampMixin):
 
     __table_args__ = (
         UniqueConstraint("doctor_id", "start_at", name="uq_doctor_start_at"),
+        Index("idx_appointments_status_end_at", "status", "end_at", "id"),
     )
 
     patient: Mapped["Patient"] = relationship(back_populates="appointments")
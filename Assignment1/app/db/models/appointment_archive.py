@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .appointment import AppointmentStatus, VisitType
+from .base import Base
+
+
+class ArchivedAppointment(Base):
+    """Finished appointment moved out of ``appointments`` by the archiver.
+
+    Columns mirror :class:`Appointment` (ids included) so archived rows can be
+    queried with the same filters and unioned with live ones.
+    """
+
+    __tablename__ = "appointments_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    patient_id: Mapped[int] = mapped_column(ForeignKey("patients.id"), nullable=False)
+    doctor_id: Mapped[int] = mapped_column(ForeignKey("doctors.id"), nullable=False)
+    treatment_id: Mapped[int] = mapped_column(ForeignKey("treatments.id"), nullable=False)
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    status: Mapped[AppointmentStatus] = mapped_column(nullable=False)
+    visit_type: Mapped[VisitType] = mapped_column(nullable=False)
+    memo: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
+
+    __table_args__ = (
+        # 재방문 판정(환자의 COMPLETED 이력)과 기간 조회용
+        Index("idx_appointments_archive_patient_status", "patient_id", "status"),
+        Index("idx_appointments_archive_start_at", "start_at"),
+    )
+
+
+class ArchivedAppointmentSlot(Base):
+    __tablename__ = "appointment_slots_archive"
+
+    appointment_id: Mapped[int] = mapped_column(
+        ForeignKey("appointments_archive.id", ondelete="CASCADE"), primary_key=True
+    )
+    # 슬롯 구성이 바뀌어도 이력은 남도록 hospital_slots 는 참조하지 않는다.
+    slot_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    slot_date: Mapped[date] = mapped_column(Date, primary_key=True)
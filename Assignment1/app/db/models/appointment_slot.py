@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date
 
-from sqlalchemy import Date, ForeignKey
+from sqlalchemy import Date, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -19,6 +19,11 @@ class AppointmentSlot(Base):
     )
     slot_date: Mapped[date] = mapped_column(Date, primary_key=True)
 
+    __table_args__ = (
+        # 날짜별 점유 집계와 예약 시 슬롯 정원 확인용 (PK 는 appointment_id 로 시작한다)
+        Index("idx_appointment_slots_date_slot", "slot_date", "slot_id"),
+    )
+
     appointment: Mapped["Appointment"] = relationship(back_populates="slots")
     slot: Mapped["HospitalSlot"] = relationship(back_populates="appointment_slots")
 
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import CheckConstraint, Date, ForeignKey, Index, SmallInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, TimestampMixin
+
+
+class HospitalSlotOverride(Base, TimestampMixin):
+    """Capacity for one date; ``slot_id`` NULL applies to every slot of that date."""
+
+    __tablename__ = "hospital_slot_overrides"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    override_date: Mapped[date] = mapped_column(Date, nullable=False)
+    slot_id: Mapped[int | None] = mapped_column(
+        ForeignKey("hospital_slots.id", ondelete="CASCADE"), nullable=True
+    )
+    capacity: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    note: Mapped[str | None] = mapped_column(String(255))
+
+    __table_args__ = (
+        # slot_id가 NULL인 행은 유니크 제약으로 막을 수 없어 서비스에서 날짜 단위로 교체한다.
+        Index("idx_slot_overrides_date_slot", "override_date", "slot_id"),
+        CheckConstraint("capacity >= 0", name="ck_slot_override_capacity"),
+    )
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from sqlalchemy import CheckConstraint, ForeignKey, SmallInteger, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, TimestampMixin
+
+
+class HospitalSlotTemplate(Base, TimestampMixin):
+    """Weekly capacity of a hospital slot; slots without a row keep their default capacity."""
+
+    __tablename__ = "hospital_slot_templates"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    # 0=월요일 ... 6=일요일 (date.weekday()와 같다)
+    weekday: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    slot_id: Mapped[int] = mapped_column(
+        ForeignKey("hospital_slots.id", ondelete="CASCADE"), nullable=False
+    )
+    capacity: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("weekday", "slot_id", name="uq_slot_template_weekday_slot"),
+        CheckConstraint("weekday BETWEEN 0 AND 6", name="ck_slot_template_weekday"),
+        CheckConstraint("capacity >= 0", name="ck_slot_template_capacity"),
+    )
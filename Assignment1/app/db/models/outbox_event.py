@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Index, String, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class OutboxEvent(Base):
+    """Change event written in the same transaction as the mutation it describes."""
+
+    __tablename__ = "outbox_events"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    aggregate_id: Mapped[int] = mapped_column(nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        server_default=text("CURRENT_TIMESTAMP"),
+        nullable=False,
+    )
+
+    __table_args__ = (Index("idx_outbox_events_created_at", "created_at"),)
+
+
+class OutboxGap(Base):
+    """Event id a consumer moved past before it was committed; re-checked on every drain."""
+
+    __tablename__ = "outbox_gaps"
+
+    consumer: Mapped[str] = mapped_column(String(100), primary_key=True)
+    event_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("CURRENT_TIMESTAMP"),
+        nullable=False,
+    )
+
+
+class OutboxDeadLetter(Base):
+    """Event a consumer gave up on after ``max_attempts``; kept for inspection.
+
+    The payload is copied so the row outlives the retention purge of ``outbox_events``.
+    """
+
+    __tablename__ = "outbox_dead_letters"
+
+    consumer: Mapped[str] = mapped_column(String(100), primary_key=True)
+    event_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    aggregate_id: Mapped[int] = mapped_column(nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    attempts: Mapped[int] = mapped_column(nullable=False)
+    event_created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("CURRENT_TIMESTAMP"),
+        nullable=False,
+    )
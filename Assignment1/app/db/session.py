@@ -1,31 +1,197 @@
+from __future__ import annotations
+
+import itertools
+import math
+import time
 from collections.abc import AsyncIterator
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Callable, Sequence
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Depends, Request, Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import ORMExecuteState, Session
 
 from Assignment1.app.core.config import get_settings
 
 
 settings = get_settings()
 
-engine = create_async_engine(
-    settings.sqlalchemy_dsn,
-    pool_pre_ping=True,
-    pool_recycle=1800,
-    echo=False,
-    future=True,
-)
+READ_YOUR_WRITES_COOKIE = "medisolve_primary_until"
+_FLUSHED_KEY = "flushed"
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+def _build_engine(dsn: str, *, read_only: bool = False) -> AsyncEngine:
+    options: dict[str, object] = {}
+    if read_only:
+        # Read-only pools run in autocommit: no BEGIN/COMMIT/ROLLBACK per request
+        # and nothing to reset when the connection goes back to the pool.
+        options.update(
+            isolation_level="AUTOCOMMIT",
+            skip_autocommit_rollback=True,
+            pool_reset_on_return=None,
+        )
+    return create_async_engine(
+        dsn,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        echo=False,
+        future=True,
+        **options,
+    )
+
+
+def _build_session_factory(bind: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(bind, expire_on_commit=False, autoflush=False, future=True)
+
+
+engine = _build_engine(settings.sqlalchemy_dsn)
+read_only_engine = _build_engine(settings.sqlalchemy_dsn, read_only=True)
+replica_engines = [
+    _build_engine(dsn, read_only=True) for dsn in settings.replica_dsns
+]
+
+AsyncSessionFactory = _build_session_factory(engine)
+ReadOnlySessionFactory = _build_session_factory(read_only_engine)
+ReplicaSessionFactories = [_build_session_factory(item) for item in replica_engines]
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed(session: Session, flush_context) -> None:
+    session.info[_FLUSHED_KEY] = True
 
-AsyncSessionFactory = async_sessionmaker(
-    engine, expire_on_commit=False, autoflush=False, future=True
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_orm_writes(orm_execute_state: ORMExecuteState) -> None:
+    # update()/insert()/delete() 문은 flush 를 거치지 않으므로 여기서 쓰기로 표시한다.
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_FLUSHED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT_KEY, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT_KEY, None)
+
+
+def call_after_commit(session: AsyncSession | Session, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the current transaction commits; dropped on rollback."""
+    session.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+@asynccontextmanager
+async def savepoint(session: AsyncSession) -> AsyncIterator[None]:
+    """``begin_nested()`` that keeps after-commit callbacks registered before it.
+
+    Rolling back a savepoint fires ``after_rollback`` like a full rollback does,
+    which would otherwise drop callbacks of work that is still going to commit.
+    """
+    registered = list(session.info.get(_AFTER_COMMIT_KEY, ()))
+    try:
+        async with session.begin_nested():
+            yield
+    except BaseException:
+        session.info[_AFTER_COMMIT_KEY] = registered
+        raise
+
+
+def mark_written(session: AsyncSession) -> None:
+    """Flag writes issued as ``text()`` DML, which the ORM cannot recognise as writes.
+
+    ``insert()``/``update()``/``delete()`` statements are flagged automatically.
+    """
+    session.info[_FLUSHED_KEY] = True
+
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    return bool(
+        session.info.get(_FLUSHED_KEY)
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
+
+class SessionRouter:
+    """Routes writes to the primary and read-only handlers to replicas (round-robin)."""
+
+    def __init__(
+        self,
+        primary: async_sessionmaker,
+        replicas: Sequence[async_sessionmaker] = (),
+        *,
+        primary_reader: async_sessionmaker | None = None,
+        read_your_writes_seconds: float = 0.0,
+    ) -> None:
+        self.primary = primary
+        self.primary_reader = primary_reader or primary
+        self.replicas = list(replicas)
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._replica_cycle = itertools.cycle(self.replicas) if self.replicas else None
+
+    def writer(self) -> async_sessionmaker:
+        return self.primary
+
+    def reader(self, *, pin_primary: bool = False) -> async_sessionmaker:
+        if pin_primary or self._replica_cycle is None:
+            return self.primary_reader
+        return next(self._replica_cycle)
+
+    def mark_write(self, response: Response) -> None:
+        """Pin the caller's follow-up reads to the primary until replicas catch up."""
+        if self.read_your_writes_seconds <= 0:
+            return
+        until = time.time() + self.read_your_writes_seconds
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            f"{until:.3f}",
+            max_age=math.ceil(self.read_your_writes_seconds),
+            httponly=True,
+        )
+
+    def is_pinned_to_primary(self, request: Request) -> bool:
+        raw = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+        if not raw:
+            return False
+        try:
+            return time.time() < float(raw)
+        except ValueError:
+            return False
+
+
+session_router = SessionRouter(
+    AsyncSessionFactory,
+    ReplicaSessionFactories,
+    primary_reader=ReadOnlySessionFactory,
+    read_your_writes_seconds=settings.read_your_writes_seconds,
 )
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    session: AsyncSession = AsyncSessionFactory()
+def get_session_router() -> SessionRouter:
+    return session_router
+
+
+async def get_session(
+    router: SessionRouter = Depends(get_session_router),
+) -> AsyncGenerator[AsyncSession, None]:
+    # The session checks out a connection on its first statement only; requests
+    # that never flushed anything are released without a COMMIT round trip.
+    session: AsyncSession = router.writer()()
     try:
         yield session
-        await session.commit()
+        if has_pending_writes(session):
+            await session.commit()
     except Exception:
         await session.rollback()
         raise
@@ -33,6 +199,18 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         await session.close()
 
 
+async def get_read_session(
+    request: Request,
+    router: SessionRouter = Depends(get_session_router),
+) -> AsyncGenerator[AsyncSession, None]:
+    factory = router.reader(pin_primary=router.is_pinned_to_primary(request))
+    session: AsyncSession = factory()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
 async def session_scope() -> AsyncIterator[AsyncSession]:
     """Context manager utility for scripts."""
     session = AsyncSessionFactory()
@@ -0,0 +1,42 @@
+"""Dialect-specific ``INSERT ... ON CONFLICT`` statements.
+
+Production runs on MySQL (``ON DUPLICATE KEY UPDATE``); tests and benchmarks
+run on SQLite (``ON CONFLICT (...) DO UPDATE``). Both forms take a list of
+parameter dicts, so callers can upsert a whole batch with one executemany.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from sqlalchemy import Table, func
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.sql.dml import Insert
+
+
+def upsert_statement(
+    dialect_name: str,
+    table: Table,
+    *,
+    key: str,
+    update_columns: Sequence[str],
+) -> Insert:
+    """Insert rows, updating ``update_columns`` when ``key`` already exists.
+
+    Raises ``ValueError`` for dialects other than MySQL/MariaDB, SQLite and
+    PostgreSQL.
+    """
+    touch = {"updated_at": func.current_timestamp()} if "updated_at" in table.c else {}
+    if dialect_name in ("mysql", "mariadb"):
+        stmt = mysql.insert(table)
+        # MySQL 은 충돌한 유니크 키를 지정하지 않는다: key 외의 유니크 키가 없어야 한다.
+        return stmt.on_duplicate_key_update(
+            {column: stmt.inserted[column] for column in update_columns} | touch
+        )
+    if dialect_name in ("sqlite", "postgresql"):
+        stmt = (sqlite if dialect_name == "sqlite" else postgresql).insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=[key],
+            set_={column: stmt.excluded[column] for column in update_columns} | touch,
+        )
+    raise ValueError(f"Upsert is not supported on {dialect_name}")
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import Iterable
+from time import perf_counter
+from typing import Awaitable, Iterable
 
 import httpx
 from fastapi import Depends, Request, Response, status
 from starlette.responses import Response as StarletteResponse
 
 from Assignment1.app.core.config import AppSettings, get_settings
+from Assignment1.app.core.metrics import REGISTRY
 
 FILTERED_REQUEST_HEADERS: set[str] = {"host", "content-length", "accept-encoding"}
 FILTERED_RESPONSE_HEADERS: set[str] = {
@@ -16,6 +18,17 @@ FILTERED_RESPONSE_HEADERS: set[str] = {
     "connection",
 }
 
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    "gateway_upstream_requests_total",
+    "Proxied requests by upstream target and status code.",
+    ("upstream", "method", "status"),
+)
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "gateway_upstream_duration_seconds",
+    "Proxied request latency by upstream target.",
+    ("upstream", "method"),
+)
+
 
 class GatewayProxy:
     def __init__(
@@ -100,6 +113,20 @@ class GatewayProxy:
         return trimmed
 
 
+async def observe_upstream(
+    upstream: str, method: str, forward: Awaitable[Response]
+) -> Response:
+    start = perf_counter()
+    status_label = "error"
+    try:
+        response = await forward
+        status_label = str(response.status_code)
+        return response
+    finally:
+        UPSTREAM_LATENCY.observe(perf_counter() - start, upstream, method)
+        UPSTREAM_REQUESTS.inc(upstream, method, status_label)
+
+
 @lru_cache(maxsize=1)
 def _build_gateway_proxy(
     patient_base_url: str,
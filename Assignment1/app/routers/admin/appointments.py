@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+from collections import Counter
 from datetime import date
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from Assignment1.app.core.responses import FastJSONResponse
 from Assignment1.app.db.models import AppointmentStatus
-from Assignment1.app.db.session import get_session
+from Assignment1.app.db.session import (
+    SessionRouter,
+    get_read_session,
+    get_session,
+    get_session_router,
+)
 from Assignment1.app.routers.admin import schemas
-from Assignment1.app.services import admin_appointments
+from Assignment1.app.services import admin_appointments, appointment_export
+from Assignment1.app.services.slot_rules import to_clinic_aware
 
 router = APIRouter(
     prefix="/api/v1/admin",
@@ -35,20 +44,76 @@ def _to_response_model(appointment) -> schemas.AppointmentAdminResponse:
     )
 
 
-@router.get("/appointments", response_model=list[schemas.AppointmentAdminResponse])
+def _to_row(row: admin_appointments.AppointmentListRow) -> dict:
+    """``AppointmentAdminResponse`` 와 같은 모양의 dict (목록 응답용, 모델 생성 없음)."""
+    item = row._asdict()
+    item["start_at"] = to_clinic_aware(row.start_at)
+    item["end_at"] = to_clinic_aware(row.end_at)
+    item["status"] = row.status.value
+    item["visit_type"] = row.visit_type.value
+    return item
+
+
+@router.get(
+    "/appointments",
+    response_model=list[schemas.AppointmentAdminResponse],
+    response_class=FastJSONResponse,
+)
 async def list_admin_appointments(
     doctor_id: Optional[int] = Query(None),
     status: Optional[AppointmentStatus] = Query(None),
     target_date: Optional[date] = Query(None, alias="date"),
-    session: AsyncSession = Depends(get_session),
+    include_archived: bool = Query(False, description="Also list archived history"),
+    session: AsyncSession = Depends(get_read_session),
 ):
     appointments = await admin_appointments.list_appointments(
     session,
     doctor_id=doctor_id,
     status=status,
     target_date=target_date,
+    include_archived=include_archived,
+    )
+    return FastJSONResponse([_to_row(item) for item in appointments])
+
+
+@router.get(
+    "/appointments/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "One appointment per line (NDJSON) or per row (CSV with header).",
+            "content": {media_type: {} for media_type in appointment_export.EXPORT_MEDIA_TYPES.values()},
+        }
+    },
+)
+async def export_admin_appointments(
+    request: Request,
+    export_format: appointment_export.ExportFormat = Query("ndjson", alias="format"),
+    doctor_id: Optional[int] = Query(None),
+    status: Optional[AppointmentStatus] = Query(None),
+    target_date: Optional[date] = Query(None, alias="date"),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    include_archived: bool = Query(False, description="Also export archived history"),
+    session_router: SessionRouter = Depends(get_session_router),
+) -> StreamingResponse:
+    stmt = appointment_export.export_statement(
+        doctor_id=doctor_id,
+        status=status,
+        target_date=target_date,
+        date_from=date_from,
+        date_to=date_to,
+        include_archived=include_archived,
+    )
+    # 응답 본문은 핸들러가 끝난 뒤 흘려보내므로 세션은 스트림이 직접 연다.
+    factory = session_router.reader(pin_primary=session_router.is_pinned_to_primary(request))
+    return StreamingResponse(
+        appointment_export.stream_export(factory, stmt, export_format),
+        media_type=appointment_export.EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="appointments.{export_format}"'
+        },
     )
-    return [_to_response_model(item) for item in appointments]
 
 
 @router.post(
@@ -64,3 +129,40 @@ async def update_admin_appointment_status(
         session, appointment_id, AppointmentStatus(payload.status)
     )
     return _to_response_model(appointment)
+
+
+@router.post(
+    "/appointments/status",
+    response_model=schemas.AppointmentBulkStatusResponse,
+)
+async def bulk_update_admin_appointment_status(
+    payload: schemas.AppointmentBulkStatusUpdate,
+    session: AsyncSession = Depends(get_session),
+):
+    results = await admin_appointments.change_statuses(
+        session, payload.ids, AppointmentStatus(payload.status)
+    )
+    counts = Counter(result.outcome for result in results)
+    return schemas.AppointmentBulkStatusResponse(
+        items=[schemas.AppointmentStatusChange.model_validate(result) for result in results],
+        updated=counts["updated"],
+        unchanged=counts["unchanged"],
+        not_found=counts["not_found"],
+        invalid_transition=counts["invalid_transition"],
+    )
+
+
+@router.post(
+    "/appointments/{appointment_id}/status/compact",
+    response_model=schemas.AppointmentStatusChange,
+)
+async def update_admin_appointment_status_compact(
+    appointment_id: int,
+    payload: schemas.AppointmentStatusUpdate,
+    session: AsyncSession = Depends(get_session),
+):
+    """Same transition as ``/status`` without loading or returning the relations."""
+    result = await admin_appointments.change_status(
+        session, appointment_id, AppointmentStatus(payload.status)
+    )
+    return schemas.AppointmentStatusChange.model_validate(result)
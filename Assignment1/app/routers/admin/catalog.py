@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections import Counter
+
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,6 +16,17 @@ router = APIRouter(
 )
 
 
+def _bulk_response(results: list[admin_catalog.BulkItemResult]) -> schemas.BulkUpsertResponse:
+    counts = Counter(result.outcome for result in results)
+    return schemas.BulkUpsertResponse(
+        items=[schemas.BulkItemOutcome.model_validate(result) for result in results],
+        created=counts["created"],
+        updated=counts["updated"],
+        unchanged=counts["unchanged"],
+        skipped=counts["skipped"],
+    )
+
+
 @router.get("/doctors", response_model=list[schemas.DoctorResponse])
 async def get_doctors(session: AsyncSession = Depends(get_session)):
     doctors = await admin_catalog.list_doctors(session)
@@ -37,6 +50,18 @@ async def create_doctor(
     return schemas.DoctorResponse.model_validate(doctor)
 
 
+@router.post("/doctors/bulk", response_model=schemas.BulkUpsertResponse)
+async def bulk_upsert_doctors(
+    payload: schemas.DoctorBulkUpsert, session: AsyncSession = Depends(get_session)
+):
+    results = await admin_catalog.bulk_upsert_doctors(
+        session,
+        [item.model_dump() for item in payload.items],
+        update_existing=payload.on_conflict == "update",
+    )
+    return _bulk_response(results)
+
+
 @router.patch("/doctors/{doctor_id}", response_model=schemas.DoctorResponse)
 async def update_doctor(
     doctor_id: int,
@@ -86,6 +111,18 @@ async def create_treatment(
     return schemas.TreatmentResponse.model_validate(treatment)
 
 
+@router.post("/treatments/bulk", response_model=schemas.BulkUpsertResponse)
+async def bulk_upsert_treatments(
+    payload: schemas.TreatmentBulkUpsert, session: AsyncSession = Depends(get_session)
+):
+    results = await admin_catalog.bulk_upsert_treatments(
+        session,
+        [item.model_dump() for item in payload.items],
+        update_existing=payload.on_conflict == "update",
+    )
+    return _bulk_response(results)
+
+
 @router.patch("/treatments/{treatment_id}", response_model=schemas.TreatmentResponse)
 async def update_treatment(
     treatment_id: int,
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, status
+from datetime import date
+
+from fastapi import APIRouter, Depends, Path, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from Assignment1.app.core.exceptions import ValidationError
@@ -36,3 +38,60 @@ async def replace_hospital_slots(
     ]
     slots = await admin_catalog.replace_hospital_slots(session, slot_specs)
     return [schemas.HospitalSlotResponse.model_validate(slot) for slot in slots]
+
+
+@router.get(
+    "/hospital-slots/effective", response_model=list[schemas.HospitalSlotResponse]
+)
+async def get_effective_hospital_slots(
+    target_date: date = Query(..., alias="date"),
+    session: AsyncSession = Depends(get_session),
+):
+    slots = await admin_catalog.effective_hospital_slots(session, target_date)
+    return [schemas.HospitalSlotResponse.model_validate(slot) for slot in slots]
+
+
+@router.put(
+    "/hospital-slots/weekdays/{weekday}",
+    response_model=schemas.WeekdayTemplateResponse,
+)
+async def replace_weekday_template(
+    payload: schemas.WeekdayTemplateUpdate,
+    weekday: int = Path(..., ge=0, le=6),
+    session: AsyncSession = Depends(get_session),
+):
+    entries = await admin_catalog.replace_weekday_template(
+        session, weekday, [(slot.slot_id, slot.capacity) for slot in payload.slots]
+    )
+    return schemas.WeekdayTemplateResponse(
+        weekday=weekday,
+        slots=[schemas.SlotCapacity(slot_id=slot_id, capacity=capacity) for slot_id, capacity in entries],
+    )
+
+
+@router.put(
+    "/hospital-slots/overrides/{override_date}",
+    response_model=schemas.DateOverrideResponse,
+)
+async def replace_date_override(
+    override_date: date,
+    payload: schemas.DateOverrideUpdate,
+    session: AsyncSession = Depends(get_session),
+):
+    await admin_catalog.replace_date_override(
+        session,
+        override_date,
+        capacity=payload.capacity,
+        entries=[(slot.slot_id, slot.capacity) for slot in payload.slots],
+        note=payload.note,
+    )
+    return schemas.DateOverrideResponse(date=override_date, **payload.model_dump())
+
+
+@router.delete(
+    "/hospital-slots/overrides/{override_date}", status_code=status.HTTP_204_NO_CONTENT
+)
+async def delete_date_override(
+    override_date: date, session: AsyncSession = Depends(get_session)
+):
+    await admin_catalog.delete_date_override(session, override_date)
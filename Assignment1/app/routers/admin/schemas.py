@@ -6,6 +6,7 @@ from typing import Literal, Optional
 from pydantic import BaseModel, Field
 
 from Assignment1.app.db.models import AppointmentStatus, VisitType
+from Assignment1.app.services.slot_rules import ClinicDateTime
 
 
 # Doctor schemas
@@ -68,6 +69,41 @@ class TreatmentResponse(TreatmentBase):
         from_attributes = True
 
 
+# Bulk catalog import schemas
+
+# 한 요청에 담을 수 있는 최대 항목 수
+BULK_MAX_ITEMS = 5000
+
+
+class DoctorBulkUpsert(BaseModel):
+    items: list[DoctorCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+    # update: 같은 이름이 있으면 덮어쓴다, skip: 기존 행은 그대로 두고 skipped 로 알려 준다.
+    on_conflict: Literal["update", "skip"] = "update"
+
+
+class TreatmentBulkUpsert(BaseModel):
+    items: list[TreatmentCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+    on_conflict: Literal["update", "skip"] = "update"
+
+
+class BulkItemOutcome(BaseModel):
+    id: int
+    name: str
+    outcome: Literal["created", "updated", "unchanged", "skipped"]
+
+    class Config:
+        from_attributes = True
+
+
+class BulkUpsertResponse(BaseModel):
+    # 요청 items 와 같은 순서
+    items: list[BulkItemOutcome]
+    created: int
+    updated: int
+    unchanged: int
+    skipped: int
+
+
 # Hospital slot schemas
 
 
@@ -88,6 +124,31 @@ class HospitalSlotBulkUpsert(BaseModel):
     slots: list[HospitalSlotBase]
 
 
+class SlotCapacity(BaseModel):
+    slot_id: int
+    capacity: int = Field(..., ge=0)
+
+
+class WeekdayTemplateUpdate(BaseModel):
+    slots: list[SlotCapacity]
+
+
+class WeekdayTemplateResponse(BaseModel):
+    weekday: int
+    slots: list[SlotCapacity]
+
+
+class DateOverrideUpdate(BaseModel):
+    # 하루 전체 정원(0이면 휴진). slots에 있는 슬롯은 개별 값이 우선한다.
+    capacity: Optional[int] = Field(None, ge=0)
+    slots: list[SlotCapacity] = []
+    note: Optional[str] = Field(None, max_length=255)
+
+
+class DateOverrideResponse(DateOverrideUpdate):
+    date: date
+
+
 # Appointment schemas
 
 
@@ -100,8 +161,8 @@ class AppointmentAdminResponse(BaseModel):
     doctor_name: str
     treatment_id: int
     treatment_name: str
-    start_at: datetime
-    end_at: datetime
+    start_at: ClinicDateTime
+    end_at: ClinicDateTime
     status: AppointmentStatus
     visit_type: VisitType
     memo: Optional[str] = None
@@ -115,6 +176,29 @@ class AppointmentStatusUpdate(BaseModel):
     ]
 
 
+class AppointmentBulkStatusUpdate(AppointmentStatusUpdate):
+    ids: list[int] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class AppointmentStatusChange(BaseModel):
+    id: int
+    outcome: Literal["updated", "unchanged", "not_found", "invalid_transition"]
+    status: Optional[AppointmentStatus]
+    previous_status: Optional[AppointmentStatus]
+
+    class Config:
+        from_attributes = True
+
+
+class AppointmentBulkStatusResponse(BaseModel):
+    # 요청 ids 와 같은 순서 (중복 id 는 한 번만)
+    items: list[AppointmentStatusChange]
+    updated: int
+    unchanged: int
+    not_found: int
+    invalid_transition: int
+
+
 # Stats schemas
 
 
@@ -3,7 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from Assignment1.app.db.session import get_session
+from Assignment1.app.db.session import get_read_session
 from Assignment1.app.routers.admin import schemas
 from Assignment1.app.services import admin_appointments
 
@@ -14,6 +14,6 @@ router = APIRouter(
 
 
 @router.get("/stats/summary", response_model=schemas.AppointmentStatsResponse)
-async def get_appointment_stats(session: AsyncSession = Depends(get_session)):
+async def get_appointment_stats(session: AsyncSession = Depends(get_read_session)):
     stats = await admin_appointments.compute_stats(session)
     return schemas.AppointmentStatsResponse(**stats)
@@ -1,16 +1,26 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query
+from typing import Awaitable, Callable
+
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from Assignment1.app.core.exceptions import (
+    BookingQueueTimeoutError,
     DoctorNotFoundError,
     PatientNotFoundError,
     TreatmentNotFoundError,
     ValidationError,
 )
-from Assignment1.app.db import Appointment, Doctor, Patient, Treatment
-from Assignment1.app.db.session import get_session
+from Assignment1.app.core.responses import FastJSONResponse
+from Assignment1.app.db import Appointment, Patient
+from Assignment1.app.db.session import (
+    SessionRouter,
+    get_read_session,
+    get_session,
+    get_session_router,
+)
 from Assignment1.app.routers.patient.schemas import (
     AppointmentCreateRequest,
     AppointmentListResponse,
@@ -18,6 +28,18 @@ from Assignment1.app.routers.patient.schemas import (
     DoctorSummary,
     TreatmentSummary,
 )
+from Assignment1.app.services.booking_queue import get_booking_scheduler
+from Assignment1.app.services.catalog_cache import load_catalog
+from Assignment1.app.services.idempotency import (
+    IDEMPOTENCY_HEADER,
+    REPLAYED_HEADER,
+    IdempotentReplay,
+    claim_idempotency_key,
+    complete_idempotency_key,
+    release_idempotency_key,
+    request_fingerprint,
+)
+from Assignment1.app.services.slot_rules import to_clinic_aware
 from Assignment1.app.services.patient_reservations import (
     cancel_reservation,
     create_reservation,
@@ -52,16 +74,122 @@ def _to_summary(appointment: Appointment) -> AppointmentSummary:
     )
 
 
+def _to_row(appointment: Appointment) -> dict:
+    """``AppointmentSummary`` 와 같은 모양의 dict (목록 응답용, 모델 생성 없음)."""
+    doctor, treatment = appointment.doctor, appointment.treatment
+    return {
+        "id": appointment.id,
+        "doctor": {"id": doctor.id, "name": doctor.name, "department": doctor.department},
+        "treatment": {
+            "id": treatment.id,
+            "name": treatment.name,
+            "duration_minutes": treatment.duration_minutes,
+        },
+        "start_at": to_clinic_aware(appointment.start_at),
+        "end_at": to_clinic_aware(appointment.end_at),
+        "status": appointment.status.value,
+        "visit_type": appointment.visit_type.value,
+        "memo": appointment.memo,
+    }
+
+
+RecordResponse = Callable[[AsyncSession, AppointmentSummary], Awaitable[None]]
+
+
+async def _no_record(session: AsyncSession, summary: AppointmentSummary) -> None:
+    return None
+
+
+async def _run_idempotent(
+    session: AsyncSession,
+    idempotency_key: str | None,
+    *,
+    scope: str,
+    request_hash: str,
+    status_code: int,
+    operation: Callable[[RecordResponse], Awaitable[AppointmentSummary]],
+) -> AppointmentSummary | JSONResponse:
+    """Run ``operation`` under ``idempotency_key``.
+
+    ``operation`` gets a ``record(session, summary)`` callback and must call it
+    on the session that commits its write, so the stored response and the
+    write land in the same transaction.
+    """
+    if idempotency_key is None:
+        return await operation(_no_record)
+    claim = await claim_idempotency_key(
+        session, scope=scope, key=idempotency_key, request_hash=request_hash
+    )
+    if isinstance(claim, IdempotentReplay):
+        return JSONResponse(
+            claim.body, status_code=claim.status_code, headers={REPLAYED_HEADER: "true"}
+        )
+    claim_id = claim.id
+
+    async def record(write_session: AsyncSession, summary: AppointmentSummary) -> None:
+        await complete_idempotency_key(
+            write_session, claim_id, status_code, summary.model_dump(mode="json")
+        )
+
+    try:
+        return await operation(record)
+    except BookingQueueTimeoutError:
+        # 시작 전에 취소된 예약이라 쓰인 것은 없지만 키는 잡아 둔다. 재시도는 저장된
+        # 응답이 없으면 잠금 시간(idempotency_lock_seconds)이 지난 뒤 키를 이어받는다.
+        raise
+    except Exception:
+        await release_idempotency_key(session, claim)
+        raise
+
+
 @router.post("", response_model=AppointmentSummary, status_code=201)
 async def create_appointment(
     payload: AppointmentCreateRequest,
+    response: Response,
+    idempotency_key: str | None = Header(default=None, alias=IDEMPOTENCY_HEADER),
     session: AsyncSession = Depends(get_session),
+    session_router: SessionRouter = Depends(get_session_router),
+) -> AppointmentSummary | JSONResponse:
+    scheduler = get_booking_scheduler(session_router)
+
+    async def book(record: RecordResponse) -> AppointmentSummary:
+        async def run(write_session: AsyncSession) -> AppointmentSummary:
+            summary = await _book_appointment(payload, response, write_session, session_router)
+            await record(write_session, summary)
+            return summary
+
+        if scheduler is None:
+            return await run(session)
+        # 같은 의사(또는 날짜)의 예약은 큐에서 순서대로, 배치 단위로 커밋된다.
+        # 멱등성 응답도 같은 배치의 savepoint 안에서 기록된다.
+        return await scheduler.submit(
+            scheduler.key_for(payload.doctor_id, payload.start_at.date()), run
+        )
+
+    return await _run_idempotent(
+        session,
+        idempotency_key,
+        scope=f"appointments.create:{payload.patient_id}",
+        request_hash=request_fingerprint(payload.model_dump(mode="json")),
+        status_code=201,
+        operation=book,
+    )
+
+
+async def _book_appointment(
+    payload: AppointmentCreateRequest,
+    response: Response,
+    session: AsyncSession,
+    session_router: SessionRouter,
 ) -> AppointmentSummary:
-    treatment = await session.get(Treatment, payload.treatment_id)
+    catalog = await load_catalog(
+        session, doctor_ids=(payload.doctor_id,), treatment_ids=(payload.treatment_id,)
+    )
+    treatment = catalog.treatments.get(payload.treatment_id)
     if treatment is None:
         raise TreatmentNotFoundError()
 
-    doctor = await session.get(Doctor, payload.doctor_id)
+    doctor = catalog.doctors.get(payload.doctor_id)
     if doctor is None:
         raise DoctorNotFoundError()
     if not doctor.is_active:
@@ -81,27 +209,41 @@ async def create_appointment(
     )
 
     await session.refresh(appointment, attribute_names=["doctor", "treatment"])
+    session_router.mark_write(response)
     return _to_summary(appointment)
 
 
-@router.get("", response_model=AppointmentListResponse)
+@router.get("", response_model=AppointmentListResponse, response_class=FastJSONResponse)
 async def list_appointments_endpoint(
     patient_id: int = Query(...),
-    session: AsyncSession = Depends(get_session),
-) -> AppointmentListResponse:
+    session: AsyncSession = Depends(get_read_session),
+) -> FastJSONResponse:
     appointments = await list_patient_appointments(session, patient_id)
-    # Ensure relationships are loaded
-    for appointment in appointments:
-        await session.refresh(appointment, attribute_names=["doctor", "treatment"])
-    return AppointmentListResponse(items=[_to_summary(appt) for appt in appointments])
+    return FastJSONResponse({"items": [_to_row(appt) for appt in appointments]})
 
 
 @router.post("/{appointment_id}/cancel", response_model=AppointmentSummary)
 async def cancel_appointment_endpoint(
     appointment_id: int,
+    response: Response,
     patient_id: int = Query(...),
+    idempotency_key: str | None = Header(default=None, alias=IDEMPOTENCY_HEADER),
     session: AsyncSession = Depends(get_session),
-) -> AppointmentSummary:
-    appointment = await cancel_reservation(session, appointment_id, patient_id)
-    await session.refresh(appointment, attribute_names=["doctor", "treatment"])
-    return _to_summary(appointment)
+    session_router: SessionRouter = Depends(get_session_router),
+) -> AppointmentSummary | JSONResponse:
+    async def cancel(record: RecordResponse) -> AppointmentSummary:
+        appointment = await cancel_reservation(session, appointment_id, patient_id)
+        await session.refresh(appointment, attribute_names=["doctor", "treatment"])
+        session_router.mark_write(response)
+        summary = _to_summary(appointment)
+        await record(session, summary)
+        return summary
+
+    return await _run_idempotent(
+        session,
+        idempotency_key,
+        scope=f"appointments.cancel:{patient_id}",
+        request_hash=request_fingerprint(appointment_id),
+        status_code=200,
+        operation=cancel,
+    )
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
 from datetime import date
+from typing import Literal, Optional
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from Assignment1.app.db.session import get_session
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.db.session import SessionRouter, get_read_session, get_session_router
 from Assignment1.app.routers.patient.schemas import (
     AvailabilityResponse,
     AvailabilitySlot,
 )
+from Assignment1.app.services.availability_snapshots import (
+    AvailabilitySnapshotStore,
+    get_snapshot_store,
+)
 from Assignment1.app.services.patient_reservations import list_availability
 
 
@@ -23,16 +29,32 @@ router = APIRouter(
 async def get_available_slots(
     doctor_id: int,
     target_date: date = Query(..., alias="date"),
-    session: AsyncSession = Depends(get_session),
+    mode: Optional[Literal["live", "snapshot"]] = Query(None),
+    session: AsyncSession = Depends(get_read_session),
+    session_router: SessionRouter = Depends(get_session_router),
+    store: AvailabilitySnapshotStore = Depends(get_snapshot_store),
 ) -> AvailabilityResponse:
-    slots = await list_availability(session, doctor_id=doctor_id, target_date=target_date)
-    return AvailabilityResponse(
-        slots=[
-            AvailabilitySlot(
-                start_at=start_at,
-                end_at=end_at,
-                remaining_capacity=remaining,
+    if (mode or get_settings().availability_mode) == "snapshot":
+        snapshot = await store.get_or_compute(
+            session_router.reader(pin_primary=True), doctor_id, target_date
+        )
+        if snapshot is not None:
+            return AvailabilityResponse(
+                slots=_to_slots(snapshot.slots),
+                snapshot_version=snapshot.version,
+                computed_at=snapshot.computed_at,
             )
-            for start_at, end_at, remaining in slots
-        ]
-    )
+
+    slots = await list_availability(session, doctor_id=doctor_id, target_date=target_date)
+    return AvailabilityResponse(slots=_to_slots(slots))
+
+
+def _to_slots(slots) -> list[AvailabilitySlot]:
+    return [
+        AvailabilitySlot(
+            start_at=start_at,
+            end_at=end_at,
+            remaining_capacity=remaining,
+        )
+        for start_at, end_at, remaining in slots
+    ]
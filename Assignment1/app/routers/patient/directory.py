@@ -3,14 +3,16 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from Assignment1.app.db.session import get_session
+from Assignment1.app.db.session import get_read_session
 from Assignment1.app.routers.patient.schemas import (
+    DoctorSearchResponse,
     DoctorSummary,
     TreatmentDetail,
 )
 from Assignment1.app.services.patient_directory import (
     list_doctors,
     list_treatments,
+    search_doctors,
 )
 
 
@@ -25,15 +27,36 @@ async def list_patient_doctors(
     department: str | None = Query(
         None, description="Optional department name filter"
     ),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> list[DoctorSummary]:
     doctors = await list_doctors(session, department=department)
     return [DoctorSummary.model_validate(doc) for doc in doctors]
 
 
+@router.get("/doctors/search", response_model=DoctorSearchResponse)
+async def search_patient_doctors(
+    q: str = Query("", max_length=100, description="Case-insensitive doctor name prefix"),
+    department: str | None = Query(
+        None, description="Optional department name filter"
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    session: AsyncSession = Depends(get_read_session),
+) -> DoctorSearchResponse:
+    page = await search_doctors(
+        session, department=department or None, prefix=q, limit=limit, offset=offset
+    )
+    return DoctorSearchResponse(
+        items=[DoctorSummary.model_validate(doc) for doc in page.items],
+        total=page.total,
+        limit=limit,
+        offset=offset,
+    )
+
+
 @router.get("/treatments", response_model=list[TreatmentDetail])
 async def list_patient_treatments(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> list[TreatmentDetail]:
     treatments = await list_treatments(session)
     return [TreatmentDetail.model_validate(item) for item in treatments]
@@ -5,6 +5,8 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field, ConfigDict, validator
 
+from Assignment1.app.services.slot_rules import ClinicDateTime, to_clinic_local
+
 
 class DoctorSummary(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -14,6 +16,14 @@ class DoctorSummary(BaseModel):
     department: str
 
 
+class DoctorSearchResponse(BaseModel):
+    items: List[DoctorSummary]
+    # 페이지와 무관한 전체 일치 건수
+    total: int
+    limit: int
+    offset: int
+
+
 class TreatmentSummary(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -33,8 +43,8 @@ class TreatmentDetail(BaseModel):
 
 
 class AvailabilitySlot(BaseModel):
-    start_at: datetime
-    end_at: datetime
+    start_at: ClinicDateTime
+    end_at: ClinicDateTime
     remaining_capacity: int = Field(ge=0)
 
 
@@ -47,6 +57,8 @@ class AppointmentCreateRequest(BaseModel):
 
     @validator("start_at")
     def enforce_15_minute_boundary(cls, value: datetime) -> datetime:
+        # 시간대가 있으면 병원 현지 시각으로 바꾼 뒤 검사한다(+05:30 같은 오프셋 포함).
+        value = to_clinic_local(value)
         if value.minute % 15 != 0:
             raise ValueError("start_at must align to 15-minute intervals")
         return value.replace(second=0, microsecond=0)
@@ -58,8 +70,8 @@ class AppointmentSummary(BaseModel):
     id: int
     doctor: DoctorSummary
     treatment: TreatmentSummary
-    start_at: datetime
-    end_at: datetime
+    start_at: ClinicDateTime
+    end_at: ClinicDateTime
     status: str
     visit_type: str
     memo: Optional[str] = None
@@ -71,3 +83,6 @@ class AppointmentListResponse(BaseModel):
 
 class AvailabilityResponse(BaseModel):
     slots: List[AvailabilitySlot]
+    # snapshot 모드로 응답한 경우에만 채워진다.
+    snapshot_version: Optional[int] = None
+    computed_at: Optional[datetime] = None
@@ -1,25 +1,41 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from datetime import date
-from typing import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Literal, NamedTuple, Sequence
 
-from sqlalchemy import func, select
+from sqlalchemy import ColumnElement, Select, func, select, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from Assignment1.app.core.exceptions import (
     AppointmentNotFoundError,
     InvalidStatusTransitionError,
+    ValidationError,
 )
 from Assignment1.app.db import (
     Appointment,
     AppointmentSlot,
     AppointmentStatus,
+    ArchivedAppointment,
     Doctor,
     HospitalSlot,
+    Patient,
+    Treatment,
     VisitType,
 )
+from Assignment1.app.core.metrics import REGISTRY
+from Assignment1.app.services.availability_snapshots import mark_availability_changed
+from Assignment1.app.services.catalog_cache import load_catalog
+from Assignment1.app.services.known_full import mark_capacity_released
+from Assignment1.app.services.outbox import (
+    APPOINTMENT_CANCELLED,
+    APPOINTMENT_STATUS_CHANGED,
+    AppointmentRef,
+    OutboxMessage,
+    record_appointment_event,
+)
 
 
 ALLOWED_TRANSITIONS: dict[AppointmentStatus, set[AppointmentStatus]] = {
@@ -35,6 +51,108 @@ ALLOWED_TRANSITIONS: dict[AppointmentStatus, set[AppointmentStatus]] = {
     AppointmentStatus.CANCELLED: set(),
 }
 
+APPOINTMENT_EVENTS = REGISTRY.counter(
+    "appointment_events_total",
+    "Appointment changes rolled up from the outbox by event type and resulting status.",
+    ("event_type", "status"),
+)
+
+
+AppointmentSource = type[Appointment] | type[ArchivedAppointment]
+
+
+def appointment_filters(
+    *,
+    doctor_id: int | None = None,
+    status: AppointmentStatus | None = None,
+    target_date: date | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    source: AppointmentSource = Appointment,
+) -> list[ColumnElement[bool]]:
+    """WHERE clauses shared by the admin listing and export; ``date_to`` is inclusive.
+
+    ``source`` picks the live table or the archive, which share column names.
+    """
+    if date_from is not None and date_to is not None and date_from > date_to:
+        raise ValidationError("date_from must not be after date_to", code="INVALID_DATE_RANGE")
+    clauses: list[ColumnElement[bool]] = []
+    if doctor_id is not None:
+        clauses.append(source.doctor_id == doctor_id)
+    if status is not None:
+        clauses.append(source.status == status)
+    if target_date is not None:
+        clauses.append(func.date(source.start_at) == target_date)
+    if date_from is not None:
+        clauses.append(source.start_at >= datetime.combine(date_from, time.min))
+    if date_to is not None:
+        clauses.append(source.start_at < datetime.combine(date_to + timedelta(days=1), time.min))
+    return clauses
+
+
+class AppointmentListRow(NamedTuple):
+    """One admin listing row: exactly the columns ``AppointmentAdminResponse`` needs."""
+
+    id: int
+    patient_id: int
+    patient_name: str
+    patient_phone: str
+    doctor_id: int
+    doctor_name: str
+    treatment_id: int
+    treatment_name: str
+    start_at: datetime
+    end_at: datetime
+    status: AppointmentStatus
+    visit_type: VisitType
+    memo: str | None
+
+
+def _listing_select(source: AppointmentSource, *, with_names: bool, filters: dict) -> Select:
+    columns = [
+        source.id.label("id"),
+        source.patient_id.label("patient_id"),
+        Patient.name.label("patient_name"),
+        Patient.phone.label("patient_phone"),
+        source.doctor_id.label("doctor_id"),
+        *([Doctor.name.label("doctor_name")] if with_names else []),
+        source.treatment_id.label("treatment_id"),
+        *([Treatment.name.label("treatment_name")] if with_names else []),
+        source.start_at.label("start_at"),
+        source.end_at.label("end_at"),
+        source.status.label("status"),
+        source.visit_type.label("visit_type"),
+        source.memo.label("memo"),
+    ]
+    stmt = select(*columns).join(Patient, source.patient_id == Patient.id)
+    if with_names:
+        stmt = stmt.join(Doctor, source.doctor_id == Doctor.id).join(
+            Treatment, source.treatment_id == Treatment.id
+        )
+    return stmt.where(*appointment_filters(source=source, **filters))
+
+
+def _listing_statement(*, with_names: bool, include_archived: bool, filters: dict) -> Select:
+    if not include_archived:
+        return _listing_select(Appointment, with_names=with_names, filters=filters).order_by(
+            Appointment.start_at.asc(), Appointment.id.asc()
+        )
+    rows = union_all(
+        *(
+            _listing_select(source, with_names=with_names, filters=filters)
+            for source in (Appointment, ArchivedAppointment)
+        )
+    ).subquery()
+    return select(rows).order_by(rows.c.start_at.asc(), rows.c.id.asc())
+
+
+def appointment_rows_statement(*, include_archived: bool = False, **filters) -> Select:
+    """Projected listing query (no ORM entities) taking ``appointment_filters`` arguments.
+
+    ``include_archived`` unions ``appointments_archive`` into the result.
+    """
+    return _listing_statement(with_names=True, include_archived=include_archived, filters=filters)
+
 
 async def list_appointments(
     session: AsyncSession,
@@ -42,26 +160,61 @@ async def list_appointments(
     doctor_id: int | None = None,
     status: AppointmentStatus | None = None,
     target_date: date | None = None,
-) -> Sequence[Appointment]:
-    stmt = (
-        select(Appointment)
-        .options(
-            joinedload(Appointment.patient),
-            joinedload(Appointment.doctor),
-            joinedload(Appointment.treatment),
+    catalog_lookup: bool = False,
+    include_archived: bool = False,
+) -> list[AppointmentListRow]:
+    """Listing rows ordered by start time.
+
+    With ``catalog_lookup`` only the patient is joined; doctor and treatment
+    names come from the cached catalog by id. ``include_archived`` adds
+    archived history.
+    """
+    filters = {"doctor_id": doctor_id, "status": status, "target_date": target_date}
+    result = await session.execute(
+        _listing_statement(
+            with_names=not catalog_lookup, include_archived=include_archived, filters=filters
         )
-        .order_by(Appointment.start_at.asc())
     )
-    if doctor_id is not None:
-        stmt = stmt.where(Appointment.doctor_id == doctor_id)
-    if status is not None:
-        stmt = stmt.where(Appointment.status == status)
-    if target_date is not None:
-        start_of_day = target_date
-        stmt = stmt.where(func.date(Appointment.start_at) == start_of_day)
+    if not catalog_lookup:
+        return [AppointmentListRow._make(row) for row in result]
 
-    result = await session.scalars(stmt)
-    return result.all()
+    rows = result.all()
+    catalog = await load_catalog(
+        session,
+        doctor_ids={row.doctor_id for row in rows},
+        treatment_ids={row.treatment_id for row in rows},
+    )
+    doctors, treatments = catalog.doctors, catalog.treatments
+    return [
+        AppointmentListRow(
+            id_,
+            patient_id,
+            patient_name,
+            patient_phone,
+            doctor_id,
+            doctors[doctor_id].name,
+            treatment_id,
+            treatments[treatment_id].name,
+            start_at,
+            end_at,
+            status,
+            visit_type,
+            memo,
+        )
+        for (
+            id_,
+            patient_id,
+            patient_name,
+            patient_phone,
+            doctor_id,
+            treatment_id,
+            start_at,
+            end_at,
+            status,
+            visit_type,
+            memo,
+        ) in rows
+    ]
 
 
 async def update_status(
@@ -85,11 +238,121 @@ async def update_status(
             f"Cannot transition from {appointment.status} to {new_status}"
         )
 
+    previous_status = appointment.status
     appointment.status = new_status
     await session.flush()
+    if new_status == AppointmentStatus.CANCELLED:
+        mark_availability_changed(session, appointment.start_at.date())
+        mark_capacity_released(session, appointment.start_at.date())
+    record_appointment_event(
+        session,
+        APPOINTMENT_CANCELLED
+        if new_status == AppointmentStatus.CANCELLED
+        else APPOINTMENT_STATUS_CHANGED,
+        appointment,
+        previous_status=previous_status,
+    )
     return appointment
 
 
+StatusOutcome = Literal["updated", "unchanged", "not_found", "invalid_transition"]
+
+
+@dataclass(frozen=True)
+class StatusChangeResult:
+    id: int
+    outcome: StatusOutcome
+    # 호출 후 상태 / 바뀌기 전 상태 (not_found 면 둘 다 None)
+    status: AppointmentStatus | None
+    previous_status: AppointmentStatus | None
+
+
+async def change_statuses(
+    session: AsyncSession, appointment_ids: Sequence[int], new_status: AppointmentStatus
+) -> list[StatusChangeResult]:
+    """Apply ``ALLOWED_TRANSITIONS`` to many appointments with one set-based UPDATE.
+
+    Returns one result per distinct id in request order. Ids already in
+    ``new_status`` are ``unchanged``; nothing is loaded into the session.
+    """
+    ids = list(dict.fromkeys(appointment_ids))
+    allowed_from = [
+        current for current, targets in ALLOWED_TRANSITIONS.items() if new_status in targets
+    ]
+    result = await session.execute(
+        select(*(getattr(Appointment, field) for field in AppointmentRef._fields))
+        .where(Appointment.id.in_(ids))
+        .with_for_update()
+    )
+    found = {row.id: AppointmentRef(*row) for row in result}
+
+    results: list[StatusChangeResult] = []
+    changed: list[AppointmentRef] = []
+    for appointment_id in ids:
+        current = found.get(appointment_id)
+        if current is None:
+            results.append(StatusChangeResult(appointment_id, "not_found", None, None))
+        elif current.status == new_status:
+            results.append(
+                StatusChangeResult(appointment_id, "unchanged", new_status, current.status)
+            )
+        elif current.status not in allowed_from:
+            results.append(
+                StatusChangeResult(
+                    appointment_id, "invalid_transition", current.status, current.status
+                )
+            )
+        else:
+            results.append(
+                StatusChangeResult(appointment_id, "updated", new_status, current.status)
+            )
+            changed.append(current)
+    if not changed:
+        return results
+
+    # 행 잠금 뒤라도 WHERE 에 허용 상태를 다시 걸어 전이 규칙을 SQL 쪽에서도 지킨다.
+    await session.execute(
+        update(Appointment)
+        .where(Appointment.id.in_([row.id for row in changed]))
+        .where(Appointment.status.in_(allowed_from))
+        .values(status=new_status)
+        .execution_options(synchronize_session=False)
+    )
+    event_type = (
+        APPOINTMENT_CANCELLED
+        if new_status == AppointmentStatus.CANCELLED
+        else APPOINTMENT_STATUS_CHANGED
+    )
+    for row in changed:
+        record_appointment_event(
+            session, event_type, row._replace(status=new_status), previous_status=row.status
+        )
+    if new_status == AppointmentStatus.CANCELLED:
+        for day in {row.start_at.date() for row in changed}:
+            mark_availability_changed(session, day)
+            mark_capacity_released(session, day)
+    return results
+
+
+async def change_status(
+    session: AsyncSession, appointment_id: int, new_status: AppointmentStatus
+) -> StatusChangeResult:
+    """Single-id :func:`change_statuses` that raises like :func:`update_status`."""
+    (result,) = await change_statuses(session, [appointment_id], new_status)
+    if result.outcome == "not_found":
+        raise AppointmentNotFoundError("Appointment not found")
+    if result.outcome != "updated":
+        raise InvalidStatusTransitionError(
+            f"Cannot transition from {result.previous_status} to {new_status}"
+        )
+    return result
+
+
+async def rollup_appointment_event(message: OutboxMessage) -> None:
+    """Outbox subscriber feeding the appointment_events_total counter."""
+    APPOINTMENT_EVENTS.inc(message.event_type, message.payload["status"])
+
+
 async def compute_stats(session: AsyncSession) -> dict[str, object]:
     # Status counts
     status_rows = await session.execute(
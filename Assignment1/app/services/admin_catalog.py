@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import unicodedata
+from dataclasses import dataclass
 from datetime import date, datetime, time
-from typing import Iterable, Sequence
+from decimal import Decimal
+from typing import Any, Generic, Iterable, Literal, Mapping, Sequence, TypeVar
 
 from sqlalchemy import delete, select
 from sqlalchemy.exc import IntegrityError
@@ -12,12 +15,41 @@ from Assignment1.app.core.exceptions import (
     CatalogNotFoundError,
     ValidationError,
 )
-from Assignment1.app.db import Doctor, HospitalSlot, Treatment
+from Assignment1.app.db import (
+    AppointmentSlot,
+    Doctor,
+    HospitalSlot,
+    HospitalSlotOverride,
+    HospitalSlotTemplate,
+    Treatment,
+)
+from Assignment1.app.db.upsert import upsert_statement
+from Assignment1.app.services.availability_snapshots import mark_availability_changed
+from Assignment1.app.services.catalog_cache import bump_catalog_version
+from Assignment1.app.services.hospital_schedule import (
+    EffectiveSlot,
+    bump_schedule_version,
+    load_schedule,
+)
+from Assignment1.app.services.known_full import mark_capacity_released
+from Assignment1.app.services.slot_rules import overlaps_lunch
 
 OPERATING_START = time(hour=9, minute=0)
 OPERATING_END = time(hour=18, minute=0)
-LUNCH_START = time(hour=12, minute=0)
-LUNCH_END = time(hour=13, minute=0)
+
+# 한 문장에 묶는 행 수 (IN 목록·executemany 모두). SQLite 변수 한도보다 충분히 작다.
+BULK_CHUNK_SIZE = 500
+# 검증 오류 메시지에 담는 항목 수
+BULK_ERROR_PREVIEW = 10
+
+BulkOutcome = Literal["created", "updated", "unchanged", "skipped"]
+
+
+@dataclass(frozen=True)
+class BulkItemResult:
+    id: int
+    name: str
+    outcome: BulkOutcome
 
 
 def _validate_treatment_duration(duration_minutes: int | None) -> None:
@@ -59,7 +91,7 @@ def _validate_slot_spec(start_time: time, end_time: time, capacity: int) -> None
             code="INVALID_SLOT_OPERATING_HOURS",
         )
     # block lunch overlap
-    if not (end_time <= LUNCH_START or start_time >= LUNCH_END):
+    if overlaps_lunch(start_time, end_time):
         raise ValidationError(
             "Slots cannot overlap lunch break (12:00-13:00)",
             code="INVALID_SLOT_LUNCH_WINDOW",
@@ -81,6 +113,7 @@ async def create_doctor(
     except IntegrityError as exc:
         raise CatalogConflictError("Doctor with the same name already exists") from exc
     await session.refresh(doctor)
+    await bump_catalog_version(session)
     return doctor
 
 
@@ -106,6 +139,7 @@ async def update_doctor(
     except IntegrityError as exc:
         raise CatalogConflictError("Doctor with the same name already exists") from exc
     await session.refresh(doctor)
+    await bump_catalog_version(session)
     return doctor
 
 
@@ -114,6 +148,7 @@ async def delete_doctor(session: AsyncSession, doctor_id: int) -> None:
     if doctor is None:
         raise CatalogNotFoundError("Doctor not found")
     await session.delete(doctor)
+    await bump_catalog_version(session)
 
 
 async def list_treatments(session: AsyncSession) -> Sequence[Treatment]:
@@ -144,6 +179,7 @@ async def create_treatment(
     except IntegrityError as exc:
         raise CatalogConflictError("Treatment with the same name already exists") from exc
     await session.refresh(treatment)
+    await bump_catalog_version(session)
     return treatment
 
 
@@ -176,6 +212,7 @@ async def update_treatment(
     except IntegrityError as exc:
         raise CatalogConflictError("Treatment with the same name already exists") from exc
     await session.refresh(treatment)
+    await bump_catalog_version(session)
     return treatment
 
 
@@ -184,6 +221,170 @@ async def delete_treatment(session: AsyncSession, treatment_id: int) -> None:
     if treatment is None:
         raise CatalogNotFoundError("Treatment not found")
     await session.delete(treatment)
+    await bump_catalog_version(session)
+
+
+def _chunks(items: Sequence[Any]) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(items), BULK_CHUNK_SIZE):
+        yield items[start : start + BULK_CHUNK_SIZE]
+
+
+def _raise_bulk_errors(errors: list[tuple[int, str]]) -> None:
+    if not errors:
+        return
+    errors.sort(key=lambda error: error[0])
+    message = "; ".join(f"items[{index}]: {text}" for index, text in errors[:BULK_ERROR_PREVIEW])
+    if len(errors) > BULK_ERROR_PREVIEW:
+        message += f" (and {len(errors) - BULK_ERROR_PREVIEW} more)"
+    raise ValidationError(message, code="INVALID_BULK_ITEMS")
+
+
+def _name_key(name: str) -> str:
+    """``name`` folded like the case- and accent-insensitive MySQL collation of ``name``."""
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+_T = TypeVar("_T")
+
+
+class _NameMap(Generic[_T]):
+    """Values by stored name, also found by a name the collation treats as equal."""
+
+    def __init__(self) -> None:
+        self._exact: dict[str, _T] = {}
+        self._folded: dict[str, _T] = {}
+
+    def add(self, pairs: Iterable[tuple[str, _T]]) -> None:
+        for name, value in pairs:
+            self._exact[name] = value
+            self._folded.setdefault(_name_key(name), value)
+
+    def find(self, name: str) -> _T | None:
+        # 대소문자만 다른 행이 따로 있을 수 있는 SQLite 에서는 정확히 같은 이름이 먼저다.
+        if name in self._exact:
+            return self._exact[name]
+        return self._folded.get(_name_key(name))
+
+
+def _duplicate_name_errors(rows: Sequence[Mapping[str, Any]]) -> list[tuple[int, str]]:
+    errors: list[tuple[int, str]] = []
+    first_seen: dict[str, int] = {}
+    for index, row in enumerate(rows):
+        earlier = first_seen.setdefault(_name_key(row["name"]), index)
+        if earlier != index:
+            errors.append((index, f"name duplicates items[{earlier}]"))
+    return errors
+
+
+async def _bulk_upsert(
+    session: AsyncSession,
+    model: type[Doctor] | type[Treatment],
+    rows: Sequence[Mapping[str, Any]],
+    *,
+    update_existing: bool,
+) -> list[BulkItemResult]:
+    """Upsert ``rows`` by name with one executemany per chunk; rows must be validated.
+
+    Outcomes come from a read of the existing rows before the write, so a row
+    inserted concurrently by someone else is reported as ``created`` even though
+    the upsert updated it. Names are matched the way the MySQL collation
+    compares them (ignoring case and accents), so an item may update a row whose
+    stored name is spelled differently; the stored spelling is then kept.
+    """
+    if not rows:
+        return []
+    columns = [column for column in rows[0] if column != "name"]
+    names = [row["name"] for row in rows]
+    existing: _NameMap[tuple[Any, ...]] = _NameMap()
+    for chunk in _chunks(names):
+        result = await session.execute(
+            select(model.name, *(getattr(model, column) for column in columns)).where(
+                model.name.in_(chunk)
+            )
+        )
+        existing.add((name, tuple(values)) for name, *values in result)
+
+    outcomes: list[BulkOutcome] = []
+    writes: list[Mapping[str, Any]] = []
+    for row in rows:
+        current = existing.find(row["name"])
+        if current is None:
+            outcome: BulkOutcome = "created"
+        elif current == tuple(row[column] for column in columns):
+            outcome = "unchanged"
+        else:
+            outcome = "updated" if update_existing else "skipped"
+        if outcome in ("created", "updated"):
+            writes.append(row)
+        outcomes.append(outcome)
+
+    if writes:
+        stmt = upsert_statement(
+            session.bind.dialect.name, model.__table__, key="name", update_columns=columns
+        )
+        for chunk in _chunks(writes):
+            await session.execute(stmt, list(chunk))
+        await bump_catalog_version(session)
+
+    ids: _NameMap[int] = _NameMap()
+    for chunk in _chunks(names):
+        result = await session.execute(select(model.name, model.id).where(model.name.in_(chunk)))
+        ids.add(result.all())
+    return [
+        BulkItemResult(id=ids.find(row["name"]), name=row["name"], outcome=outcome)
+        for row, outcome in zip(rows, outcomes)
+    ]
+
+
+async def bulk_upsert_doctors(
+    session: AsyncSession,
+    items: Sequence[Mapping[str, Any]],
+    *,
+    update_existing: bool = True,
+) -> list[BulkItemResult]:
+    """Create doctors by name; existing names are updated, or skipped if not ``update_existing``.
+
+    The whole batch is validated first and nothing is written if any item fails.
+    """
+    rows = [
+        {
+            "name": item["name"],
+            "department": item["department"],
+            "is_active": item.get("is_active", True),
+        }
+        for item in items
+    ]
+    _raise_bulk_errors(_duplicate_name_errors(rows))
+    return await _bulk_upsert(session, Doctor, rows, update_existing=update_existing)
+
+
+async def bulk_upsert_treatments(
+    session: AsyncSession,
+    items: Sequence[Mapping[str, Any]],
+    *,
+    update_existing: bool = True,
+) -> list[BulkItemResult]:
+    """Treatment counterpart of :func:`bulk_upsert_doctors`."""
+    rows = [
+        {
+            "name": item["name"],
+            "duration_minutes": item["duration_minutes"],
+            # DB 의 DECIMAL(10,2) 와 같은 값으로 맞춰야 변경 여부를 비교할 수 있다.
+            "price": Decimal(str(item["price"])).quantize(Decimal("0.01")),
+            "description": item.get("description"),
+            "is_active": item.get("is_active", True),
+        }
+        for item in items
+    ]
+    errors = _duplicate_name_errors(rows)
+    for index, row in enumerate(rows):
+        try:
+            _validate_treatment_duration(row["duration_minutes"])
+        except ValidationError as exc:
+            errors.append((index, exc.message))
+    _raise_bulk_errors(errors)
+    return await _bulk_upsert(session, Treatment, rows, update_existing=update_existing)
 
 
 async def list_hospital_slots(session: AsyncSession) -> Sequence[HospitalSlot]:
@@ -196,22 +397,133 @@ async def list_hospital_slots(session: AsyncSession) -> Sequence[HospitalSlot]:
 async def replace_hospital_slots(
     session: AsyncSession, slot_specs: Iterable[tuple[time, time, int]]
 ) -> Sequence[HospitalSlot]:
-    new_slots: list[HospitalSlot] = []
+    """Make the slot table match ``slot_specs`` while keeping IDs of unchanged time ranges.
+
+    Kept ranges only get their capacity updated, so bookings, weekly templates and
+    date overrides that reference them survive. Only removed ranges are deleted.
+    """
+    wanted: dict[tuple[time, time], int] = {}
     for start_time, end_time, capacity in slot_specs:
         _validate_slot_spec(start_time, end_time, capacity)
-        new_slots.append(
-            HospitalSlot(
-                start_time=start_time,
-                end_time=end_time,
-                capacity=capacity,
+        if (start_time, end_time) in wanted:
+            raise ValidationError(
+                "Each slot time range may appear only once", code="DUPLICATE_SLOT"
             )
+        wanted[(start_time, end_time)] = capacity
+
+    existing = (await session.scalars(select(HospitalSlot))).all()
+    kept: list[HospitalSlot] = []
+    removed_ids: list[int] = []
+    for slot in existing:
+        capacity = wanted.pop((slot.start_time, slot.end_time), None)
+        if capacity is None:
+            removed_ids.append(slot.id)
+            continue
+        if slot.capacity != capacity:
+            # 같은 컬럼만 바뀌므로 flush 때 executemany UPDATE 한 번으로 묶인다.
+            slot.capacity = capacity
+        kept.append(slot)
+
+    if removed_ids:
+        # 파티션된 appointment_slots 에는 FK CASCADE 가 없으므로 직접 지운다.
+        await session.execute(
+            delete(AppointmentSlot).where(AppointmentSlot.slot_id.in_(removed_ids))
         )
+        await session.execute(delete(HospitalSlot).where(HospitalSlot.id.in_(removed_ids)))
+    added = [
+        HospitalSlot(start_time=start_time, end_time=end_time, capacity=capacity)
+        for (start_time, end_time), capacity in wanted.items()
+    ]
+    session.add_all(added)
+    await session.flush()
+    await bump_schedule_version(session)
+    mark_availability_changed(session, None)
+    mark_capacity_released(session, None)
+    return sorted(kept + added, key=lambda slot: slot.start_time)
+
+
+async def _validate_slot_capacities(
+    session: AsyncSession, entries: Sequence[tuple[int, int]]
+) -> None:
+    slot_ids = [slot_id for slot_id, _ in entries]
+    if len(set(slot_ids)) != len(slot_ids):
+        raise ValidationError("Each slot may appear only once", code="DUPLICATE_SLOT")
+    if any(capacity < 0 for _, capacity in entries):
+        raise ValidationError(
+            "Slot capacity must not be negative", code="INVALID_SLOT_CAPACITY"
+        )
+    if slot_ids:
+        known = set(
+            (await session.scalars(select(HospitalSlot.id).where(HospitalSlot.id.in_(slot_ids)))).all()
+        )
+        if len(known) != len(slot_ids):
+            raise CatalogNotFoundError("Hospital slot not found")
+
+
+async def effective_hospital_slots(session: AsyncSession, day: date) -> tuple[EffectiveSlot, ...]:
+    schedule = await load_schedule(session)
+    return schedule.for_date(day).slots
 
-    # Clear existing slots and recreate to simplify management only after validation passes.
-    await session.execute(delete(HospitalSlot))
-    for slot in new_slots:
-        session.add(slot)
+
+async def replace_weekday_template(
+    session: AsyncSession, weekday: int, entries: Sequence[tuple[int, int]]
+) -> Sequence[tuple[int, int]]:
+    """Set per-slot capacities for ``weekday``; slots left out fall back to their default."""
+    await _validate_slot_capacities(session, entries)
+    await session.execute(
+        delete(HospitalSlotTemplate).where(HospitalSlotTemplate.weekday == weekday)
+    )
+    session.add_all(
+        HospitalSlotTemplate(weekday=weekday, slot_id=slot_id, capacity=capacity)
+        for slot_id, capacity in entries
+    )
     await session.flush()
-    for slot in new_slots:
-        await session.refresh(slot)
-    return new_slots
+    await bump_schedule_version(session)
+    mark_availability_changed(session, None)
+    mark_capacity_released(session, None)
+    return sorted(entries)
+
+
+async def replace_date_override(
+    session: AsyncSession,
+    day: date,
+    *,
+    capacity: int | None,
+    entries: Sequence[tuple[int, int]],
+    note: str | None = None,
+) -> None:
+    """Override ``day``: ``capacity`` applies to every slot, ``entries`` to single slots."""
+    if capacity is None and not entries:
+        raise ValidationError(
+            "An override needs a day capacity or at least one slot", code="SLOT_REQUIRED"
+        )
+    if capacity is not None and capacity < 0:
+        raise ValidationError(
+            "Slot capacity must not be negative", code="INVALID_SLOT_CAPACITY"
+        )
+    await _validate_slot_capacities(session, entries)
+    await session.execute(
+        delete(HospitalSlotOverride).where(HospitalSlotOverride.override_date == day)
+    )
+    rows = [(slot_id, slot_capacity) for slot_id, slot_capacity in entries]
+    if capacity is not None:
+        rows.append((None, capacity))
+    session.add_all(
+        HospitalSlotOverride(override_date=day, slot_id=slot_id, capacity=slot_capacity, note=note)
+        for slot_id, slot_capacity in rows
+    )
+    await session.flush()
+    await bump_schedule_version(session)
+    mark_availability_changed(session, day)
+    mark_capacity_released(session, day)
+
+
+async def delete_date_override(session: AsyncSession, day: date) -> None:
+    result = await session.execute(
+        delete(HospitalSlotOverride).where(HospitalSlotOverride.override_date == day)
+    )
+    if not result.rowcount:
+        raise CatalogNotFoundError("No override for this date")
+    await bump_schedule_version(session)
+    mark_availability_changed(session, day)
+    mark_capacity_released(session, day)
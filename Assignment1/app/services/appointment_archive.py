@@ -0,0 +1,147 @@
+"""Moves finished appointments out of the hot ``appointments`` table.
+
+COMPLETED and CANCELLED appointments that ended before the archive horizon are
+copied, with their ``appointment_slots``, into ``appointments_archive`` /
+``appointment_slots_archive`` and deleted from the live tables, one batch per
+transaction. Booking checks, availability and the default admin listing only
+ever see the live tables, so their cost follows the size of the recent
+schedule rather than of the whole history. Admin history reads pass
+``include_archived`` to union the archive back in.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from Assignment1.app.core.background import PeriodicWorker
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.core.metrics import REGISTRY
+from Assignment1.app.db import (
+    Appointment,
+    AppointmentSlot,
+    AppointmentStatus,
+    ArchivedAppointment,
+    ArchivedAppointmentSlot,
+)
+from Assignment1.app.db.session import SessionRouter
+from Assignment1.app.services.slot_rules import to_clinic_local
+
+logger = logging.getLogger(__name__)
+
+ARCHIVABLE_STATUSES = (AppointmentStatus.COMPLETED, AppointmentStatus.CANCELLED)
+
+APPOINTMENT_COLUMNS = (
+    "id",
+    "patient_id",
+    "doctor_id",
+    "treatment_id",
+    "start_at",
+    "end_at",
+    "status",
+    "visit_type",
+    "memo",
+    "created_at",
+    "updated_at",
+)
+SLOT_COLUMNS = ("appointment_id", "slot_id", "slot_date")
+
+APPOINTMENTS_ARCHIVED = REGISTRY.counter(
+    "appointments_archived_total",
+    "Appointments moved from the live table into appointments_archive.",
+)
+
+
+def archive_cutoff(now: datetime, after_days: int) -> datetime:
+    """Clinic wall time before which ended appointments may be archived."""
+    return to_clinic_local(now) - timedelta(days=after_days)
+
+
+async def archive_batch(
+    session: AsyncSession, *, before: datetime, batch_size: int, after_id: int = 0
+) -> list[int]:
+    """Move up to ``batch_size`` eligible appointments past ``after_id``; caller commits.
+
+    Returns the moved ids in ascending order.
+    """
+    eligible = (
+        Appointment.end_at < before,
+        Appointment.status.in_(ARCHIVABLE_STATUSES),
+    )
+    ids = (
+        await session.scalars(
+            select(Appointment.id)
+            .where(Appointment.id > after_id, *eligible)
+            .order_by(Appointment.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+    ).all()
+    if not ids:
+        return []
+
+    await session.execute(
+        insert(ArchivedAppointment).from_select(
+            APPOINTMENT_COLUMNS,
+            select(*(getattr(Appointment, column) for column in APPOINTMENT_COLUMNS)).where(
+                Appointment.id.in_(ids)
+            ),
+        )
+    )
+    await session.execute(
+        insert(ArchivedAppointmentSlot).from_select(
+            SLOT_COLUMNS,
+            select(*(getattr(AppointmentSlot, column) for column in SLOT_COLUMNS)).where(
+                AppointmentSlot.appointment_id.in_(ids)
+            ),
+        )
+    )
+    await session.execute(delete(AppointmentSlot).where(AppointmentSlot.appointment_id.in_(ids)))
+    await session.execute(delete(Appointment).where(Appointment.id.in_(ids)))
+    return list(ids)
+
+
+async def archive_appointments(
+    session_factory: async_sessionmaker,
+    *,
+    before: datetime,
+    batch_size: int = 1000,
+) -> int:
+    """Archive everything eligible before ``before``, committing after each batch."""
+    moved = 0
+    after_id = 0
+    while True:
+        async with session_factory() as session:
+            ids = await archive_batch(
+                session, before=before, batch_size=batch_size, after_id=after_id
+            )
+            await session.commit()
+        if not ids:
+            break
+        moved += len(ids)
+        APPOINTMENTS_ARCHIVED.inc(amount=len(ids))
+        after_id = ids[-1]
+        if len(ids) < batch_size:
+            break
+    if moved:
+        logger.info("appointments_archived", extra={"count": moved, "before": before.isoformat()})
+    return moved
+
+
+def build_archive_worker(router: SessionRouter) -> PeriodicWorker:
+    settings = get_settings()
+
+    async def archive() -> None:
+        before = archive_cutoff(
+            datetime.now(timezone.utc), settings.appointment_archive_after_days
+        )
+        await archive_appointments(
+            router.writer(), before=before, batch_size=settings.appointment_archive_batch_size
+        )
+
+    return PeriodicWorker(
+        "appointment-archive", archive, interval=settings.appointment_archive_interval_seconds
+    )
@@ -0,0 +1,112 @@
+"""Streaming appointment export for admin reporting.
+
+Rows come from the admin listing's projected query (plain columns, no ORM
+identities) and are read through ``session.stream`` with ``yield_per`` so the
+driver fetches one batch at a time. Each batch is encoded into a single chunk,
+so memory stays bounded by ``batch_size`` regardless of how many appointments
+match.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+from datetime import date
+from typing import AsyncIterator, Literal, Sequence
+
+from sqlalchemy import Row, Select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from Assignment1.app.core.responses import dumps
+from Assignment1.app.db import AppointmentStatus
+from Assignment1.app.services.admin_appointments import appointment_rows_statement
+from Assignment1.app.services.slot_rules import to_clinic_aware
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_COLUMNS = (
+    "id",
+    "patient_id",
+    "patient_name",
+    "patient_phone",
+    "doctor_id",
+    "doctor_name",
+    "treatment_id",
+    "treatment_name",
+    "start_at",
+    "end_at",
+    "status",
+    "visit_type",
+    "memo",
+)
+
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def export_statement(
+    *,
+    doctor_id: int | None = None,
+    status: AppointmentStatus | None = None,
+    target_date: date | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    include_archived: bool = False,
+) -> Select:
+    """Build the export query; raises ``ValidationError`` before any row is streamed."""
+    return appointment_rows_statement(
+        include_archived=include_archived,
+        doctor_id=doctor_id,
+        status=status,
+        target_date=target_date,
+        date_from=date_from,
+        date_to=date_to,
+    )
+
+
+def _values(row: Row) -> list:
+    values = list(row)
+    values[8] = to_clinic_aware(values[8])
+    values[9] = to_clinic_aware(values[9])
+    values[10] = values[10].value
+    values[11] = values[11].value
+    return values
+
+
+def _encode_ndjson(rows: Sequence[Row]) -> bytes:
+    return b"".join(dumps(dict(zip(EXPORT_COLUMNS, _values(row)))) + b"\n" for row in rows)
+
+
+def _encode_csv(rows: Sequence[Row]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        values = _values(row)
+        values[8] = values[8].isoformat()
+        values[9] = values[9].isoformat()
+        writer.writerow(values)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def stream_export(
+    session_factory: async_sessionmaker,
+    stmt: Select,
+    export_format: ExportFormat,
+    *,
+    batch_size: int = 1000,
+) -> AsyncIterator[bytes]:
+    """Yield the encoded export one batch at a time from a dedicated session.
+
+    The session lives as long as the iterator, not the request handler, because
+    the response body is produced after the endpoint has returned.
+    """
+    encode = _encode_csv if export_format == "csv" else _encode_ndjson
+    if export_format == "csv":
+        yield (",".join(EXPORT_COLUMNS) + "\n").encode("utf-8")
+    async with session_factory() as session:
+        result = await session.stream(stmt.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield encode(rows)
@@ -0,0 +1,240 @@
+"""Closes out past appointments that nobody transitioned by hand.
+
+PENDING/CONFIRMED appointments that ended more than the grace period ago are
+moved along ``APPOINTMENT_SWEEP_RULES`` (e.g. CONFIRMED -> COMPLETED, PENDING
+-> CANCELLED as a no-show), in batches of one transaction each through
+:func:`admin_appointments.change_statuses`, so ``ALLOWED_TRANSITIONS``, outbox
+events and cache invalidation behave exactly like the admin API.
+
+A run handles at most ``max_batches`` batches with a pause between them. The
+``(end_at, id)`` of the last swept appointment is saved in ``system_configs``
+with each batch, so the next run (or a restarted process) resumes the pass
+where it stopped. Once a pass reaches the horizon the cursor is cleared and
+the next run starts over, which also picks up appointments booked into the
+past after the pass went by.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Mapping
+
+from sqlalchemy import Select, and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from Assignment1.app.core.background import PeriodicWorker
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.core.metrics import REGISTRY
+from Assignment1.app.db import Appointment, AppointmentStatus, SystemConfig
+from Assignment1.app.db.session import SessionRouter
+from Assignment1.app.services.admin_appointments import ALLOWED_TRANSITIONS, change_statuses
+from Assignment1.app.services.slot_rules import to_clinic_local
+
+logger = logging.getLogger(__name__)
+
+SWEEP_CURSOR_KEY = "appointment_sweep_cursor"
+
+APPOINTMENTS_SWEPT = REGISTRY.counter(
+    "appointments_swept_total",
+    "Past appointments moved on by the sweeper, by previous and new status.",
+    ("from_status", "to_status"),
+)
+SWEEP_LAG = REGISTRY.gauge(
+    "appointment_sweep_lag_seconds",
+    "Clinic time between the sweep horizon and the sweep cursor; 0 when caught up.",
+)
+
+SweepRules = Mapping[AppointmentStatus, AppointmentStatus]
+
+
+def parse_sweep_rules(raw: Mapping[str, str]) -> dict[AppointmentStatus, AppointmentStatus]:
+    """Validate ``APPOINTMENT_SWEEP_RULES`` against ``ALLOWED_TRANSITIONS``."""
+    rules = {
+        AppointmentStatus(current): AppointmentStatus(target) for current, target in raw.items()
+    }
+    for current, target in rules.items():
+        if target not in ALLOWED_TRANSITIONS[current]:
+            raise ValueError(
+                f"Sweep rule {current.value} -> {target.value} is not an allowed transition"
+            )
+    return rules
+
+
+def sweep_horizon(now: datetime, grace: timedelta) -> datetime:
+    """Clinic wall time before which an appointment's end makes it sweepable."""
+    return to_clinic_local(now) - grace
+
+
+@dataclass(frozen=True)
+class SweepCursor:
+    end_at: datetime
+    id: int
+
+    def encode(self) -> str:
+        return f"{self.end_at.isoformat()}|{self.id}"
+
+    @classmethod
+    def decode(cls, value: str | None) -> SweepCursor | None:
+        if not value:
+            return None
+        end_at, appointment_id = value.split("|")
+        return cls(datetime.fromisoformat(end_at), int(appointment_id))
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    swept: int
+    batches: int
+    # True 면 horizon 까지 다 훑었고 커서를 비웠다.
+    caught_up: bool
+    cursor: SweepCursor | None
+
+
+async def load_sweep_cursor(session: AsyncSession) -> SweepCursor | None:
+    stored = await session.scalar(
+        select(SystemConfig.value).where(SystemConfig.key == SWEEP_CURSOR_KEY)
+    )
+    return SweepCursor.decode(stored)
+
+
+async def _save_cursor(session: AsyncSession, cursor: SweepCursor | None) -> None:
+    value = cursor.encode() if cursor else ""
+    result = await session.execute(
+        update(SystemConfig).where(SystemConfig.key == SWEEP_CURSOR_KEY).values(value=value)
+    )
+    if not result.rowcount:
+        session.add(
+            SystemConfig(
+                key=SWEEP_CURSOR_KEY,
+                value=value,
+                description="(end_at, id) of the last appointment the sweeper processed",
+            )
+        )
+
+
+def sweep_statement(
+    *,
+    rules: SweepRules,
+    horizon: datetime,
+    after: SweepCursor | None,
+    batch_size: int,
+) -> Select:
+    """Keyset page of sweepable appointments; served by ``idx_appointments_status_end_at``."""
+    stmt = select(Appointment.id, Appointment.status, Appointment.end_at).where(
+        Appointment.status.in_(list(rules)), Appointment.end_at < horizon
+    )
+    if after is not None:
+        stmt = stmt.where(
+            or_(
+                Appointment.end_at > after.end_at,
+                and_(Appointment.end_at == after.end_at, Appointment.id > after.id),
+            )
+        )
+    return stmt.order_by(Appointment.end_at, Appointment.id).limit(batch_size)
+
+
+async def sweep_batch(
+    session: AsyncSession,
+    *,
+    rules: SweepRules,
+    horizon: datetime,
+    after: SweepCursor | None,
+    batch_size: int,
+) -> tuple[Counter[tuple[AppointmentStatus, AppointmentStatus]], SweepCursor | None]:
+    """Transition the next ``batch_size`` sweepable appointments past ``after``; caller commits.
+
+    Returns how many moved per (from, to) and the new cursor (``None`` when the
+    pass is finished). The cursor is saved in the same transaction.
+    """
+    rows = (
+        await session.execute(
+            sweep_statement(rules=rules, horizon=horizon, after=after, batch_size=batch_size)
+        )
+    ).all()
+
+    by_status: dict[AppointmentStatus, list[int]] = defaultdict(list)
+    for row in rows:
+        by_status[row.status].append(row.id)
+    moved: Counter[tuple[AppointmentStatus, AppointmentStatus]] = Counter()
+    for current, ids in by_status.items():
+        target = rules[current]
+        results = await change_statuses(session, ids, target)
+        # 그 사이 관리자가 바꾼 예약은 invalid_transition/unchanged 로 건너뛴다.
+        moved[(current, target)] += sum(result.outcome == "updated" for result in results)
+
+    cursor = SweepCursor(rows[-1].end_at, rows[-1].id) if len(rows) == batch_size else None
+    await _save_cursor(session, cursor)
+    return moved, cursor
+
+
+async def sweep_appointments(
+    session_factory: async_sessionmaker,
+    *,
+    now: datetime,
+    rules: SweepRules,
+    grace: timedelta = timedelta(hours=1),
+    batch_size: int = 500,
+    max_batches: int = 20,
+    pause_seconds: float = 0.0,
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+) -> SweepResult:
+    """One throttled run: up to ``max_batches`` batches, resuming from the saved cursor."""
+    horizon = sweep_horizon(now, grace)
+    async with session_factory() as session:
+        cursor = await load_sweep_cursor(session)
+
+    swept = 0
+    batches = 0
+    caught_up = False
+    while batches < max_batches:
+        if batches:
+            await sleep(pause_seconds)
+        async with session_factory() as session:
+            moved, cursor = await sweep_batch(
+                session, rules=rules, horizon=horizon, after=cursor, batch_size=batch_size
+            )
+            await session.commit()
+        batches += 1
+        for (current, target), count in moved.items():
+            if count:
+                APPOINTMENTS_SWEPT.inc(current.value, target.value, amount=count)
+                swept += count
+        if cursor is None:
+            caught_up = True
+            break
+
+    SWEEP_LAG.set(0.0 if cursor is None else (horizon - cursor.end_at).total_seconds())
+    if swept:
+        logger.info(
+            "appointments_swept",
+            extra={"count": swept, "batches": batches, "caught_up": caught_up},
+        )
+    return SweepResult(swept=swept, batches=batches, caught_up=caught_up, cursor=cursor)
+
+
+def build_sweeper_worker(
+    router: SessionRouter,
+    *,
+    clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+) -> PeriodicWorker:
+    settings = get_settings()
+    rules = parse_sweep_rules(settings.appointment_sweep_rules)
+
+    async def sweep() -> None:
+        await sweep_appointments(
+            router.writer(),
+            now=clock(),
+            rules=rules,
+            grace=timedelta(minutes=settings.appointment_sweep_grace_minutes),
+            batch_size=settings.appointment_sweep_batch_size,
+            max_batches=settings.appointment_sweep_max_batches,
+            pause_seconds=settings.appointment_sweep_batch_pause_seconds,
+        )
+
+    return PeriodicWorker(
+        "appointment-sweeper", sweep, interval=settings.appointment_sweep_interval_seconds
+    )
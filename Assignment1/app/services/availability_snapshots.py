@@ -0,0 +1,228 @@
+"""Precomputed availability per (doctor, date).
+
+Availability of one doctor depends on hospital-wide slot occupancy for the day,
+so snapshots are computed and invalidated a whole day at a time: four queries
+produce every active doctor's windows for that date. Writers mark the days
+they touch with :func:`mark_availability_changed`; the store drops those days
+once the transaction commits and the background worker recomputes them.
+"""
+
+from __future__ import annotations
+
+import itertools
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from time import monotonic
+from typing import Callable, Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from Assignment1.app.core.background import PeriodicWorker
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.db.session import SessionRouter, call_after_commit
+from Assignment1.app.services import reservation_queries as queries
+from Assignment1.app.services.hospital_schedule import load_schedule
+from Assignment1.app.services.outbox import OutboxMessage
+from Assignment1.app.services.slot_rules import available_windows, clinic_today
+
+Window = tuple[datetime, datetime, int]
+
+
+@dataclass(frozen=True)
+class DaySnapshot:
+    day: date
+    version: int
+    computed_at: datetime
+    computed_monotonic: float
+    by_doctor: dict[int, tuple[Window, ...]]
+
+
+@dataclass(frozen=True)
+class AvailabilitySnapshot:
+    doctor_id: int
+    day: date
+    version: int
+    computed_at: datetime
+    slots: tuple[Window, ...]
+
+
+async def compute_day(session: AsyncSession, day: date) -> dict[int, tuple[Window, ...]]:
+    slots = (await load_schedule(session)).for_date(day).slots
+    slot_counts = dict(
+        (await session.execute(queries.SLOT_OCCUPANCY_BY_DATE, {"slot_date": day})).all()
+    )
+    doctor_ids = (await session.scalars(queries.ACTIVE_DOCTOR_IDS)).all()
+    booked: dict[int, list[tuple[datetime, datetime]]] = defaultdict(list)
+    rows = await session.execute(
+        queries.APPOINTMENTS_IN_RANGE,
+        {
+            "range_start": datetime.combine(day, datetime.min.time()),
+            "range_end": datetime.combine(day, datetime.max.time()),
+        },
+    )
+    for doctor_id, start_at, end_at in rows:
+        booked[doctor_id].append((start_at, end_at))
+    return {
+        doctor_id: tuple(available_windows(day, slots, slot_counts, booked[doctor_id]))
+        for doctor_id in doctor_ids
+    }
+
+
+class AvailabilitySnapshotStore:
+    def __init__(
+        self,
+        *,
+        horizon_days: int,
+        max_age_seconds: float,
+        today: Callable[[], date] = clinic_today,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.horizon_days = horizon_days
+        self.max_age_seconds = max_age_seconds
+        self.today = today
+        self.clock = clock
+        self.on_invalidate: Callable[[], None] | None = None
+        self._days: dict[date, DaySnapshot] = {}
+        self._dirty: set[date] = set()
+        # 계산 도중 무효화가 끼어들면 결과를 버리기 위한 세대 번호
+        self._generations: dict[date, int] = defaultdict(int)
+        self._epoch = 0
+        self._versions = itertools.count(1)
+
+    def horizon(self) -> list[date]:
+        start = self.today()
+        return [start + timedelta(days=offset) for offset in range(self.horizon_days)]
+
+    def in_horizon(self, day: date) -> bool:
+        return 0 <= (day - self.today()).days < self.horizon_days
+
+    def _expired(self, snapshot: DaySnapshot) -> bool:
+        return self.clock() - snapshot.computed_monotonic >= self.max_age_seconds
+
+    def get(self, doctor_id: int, day: date) -> AvailabilitySnapshot | None:
+        """The stored snapshot, or ``None`` when missing or older than ``max_age_seconds``."""
+        snapshot = self._days.get(day)
+        # 워커·이벤트 구독이 없는 프로세스(AVAILABILITY_MODE=live)에서도 오래된 값을 계속 주지 않는다.
+        if snapshot is None or self._expired(snapshot) or doctor_id not in snapshot.by_doctor:
+            return None
+        return AvailabilitySnapshot(
+            doctor_id=doctor_id,
+            day=day,
+            version=snapshot.version,
+            computed_at=snapshot.computed_at,
+            slots=snapshot.by_doctor[doctor_id],
+        )
+
+    def invalidate(self, days: Iterable[date] | None = None) -> None:
+        """Drop snapshots for ``days`` (every day when ``None``) and flag them for refresh."""
+        if days is None:
+            self._epoch += 1
+            self._dirty.update(self._days)
+            self._days.clear()
+        else:
+            for day in days:
+                self._generations[day] += 1
+                if self._days.pop(day, None) is not None or self.in_horizon(day):
+                    self._dirty.add(day)
+        if self.on_invalidate is not None:
+            self.on_invalidate()
+
+    def clear(self) -> None:
+        self._days.clear()
+        self._dirty.clear()
+        self._epoch += 1
+
+    def _token(self, day: date) -> tuple[int, int]:
+        return self._epoch, self._generations[day]
+
+    def due_days(self) -> list[date]:
+        due = []
+        for day in self.horizon():
+            snapshot = self._days.get(day)
+            if snapshot is None or day in self._dirty or self._expired(snapshot):
+                due.append(day)
+        return due
+
+    async def refresh_day(self, session: AsyncSession, day: date) -> DaySnapshot | None:
+        token = self._token(day)
+        by_doctor = await compute_day(session, day)
+        if token != self._token(day):
+            return None
+        snapshot = DaySnapshot(
+            day=day,
+            version=next(self._versions),
+            computed_at=datetime.now(timezone.utc),
+            computed_monotonic=self.clock(),
+            by_doctor=by_doctor,
+        )
+        self._days[day] = snapshot
+        self._dirty.discard(day)
+        return snapshot
+
+    async def refresh_due(self, session_factory: async_sessionmaker) -> int:
+        today = self.today()
+        for day in [day for day in self._days if day < today]:
+            del self._days[day]
+        self._dirty = {day for day in self._dirty if self.in_horizon(day)}
+
+        refreshed = 0
+        due = self.due_days()
+        if due:
+            async with session_factory() as session:
+                for day in due:
+                    if await self.refresh_day(session, day) is not None:
+                        refreshed += 1
+        return refreshed
+
+    async def get_or_compute(
+        self, session_factory: async_sessionmaker, doctor_id: int, day: date
+    ) -> AvailabilitySnapshot | None:
+        """Serve from the snapshot, computing the day on a miss if it is in the horizon.
+
+        Returns ``None`` for days outside the horizon and doctors that are not
+        active; callers fall back to the live computation.
+        """
+        snapshot = self.get(doctor_id, day)
+        if snapshot is None and self.in_horizon(day):
+            async with session_factory() as session:
+                await self.refresh_day(session, day)
+            snapshot = self.get(doctor_id, day)
+        return snapshot
+
+
+settings = get_settings()
+snapshot_store = AvailabilitySnapshotStore(
+    horizon_days=settings.availability_snapshot_days,
+    max_age_seconds=settings.availability_snapshot_refresh_seconds,
+)
+
+
+def get_snapshot_store() -> AvailabilitySnapshotStore:
+    return snapshot_store
+
+
+def mark_availability_changed(session: AsyncSession, day: date | None) -> None:
+    """Invalidate ``day`` (every day when ``None``) once ``session`` commits."""
+    days = None if day is None else (day,)
+    call_after_commit(session, lambda: snapshot_store.invalidate(days))
+
+
+async def invalidate_from_event(message: OutboxMessage) -> None:
+    """Outbox subscriber: picks up changes committed by other processes (e.g. the admin API)."""
+    if message.day is not None:
+        snapshot_store.invalidate([message.day])
+
+
+def build_snapshot_worker(
+    store: AvailabilitySnapshotStore, router: SessionRouter
+) -> PeriodicWorker:
+    async def refresh() -> None:
+        # 레플리카 지연으로 무효화 직후 옛 값이 다시 저장되지 않도록 프라이머리에서 읽는다.
+        await store.refresh_due(router.reader(pin_primary=True))
+
+    worker = PeriodicWorker(
+        "availability-snapshots", refresh, interval=store.max_age_seconds
+    )
+    store.on_invalidate = worker.wake
+    return worker
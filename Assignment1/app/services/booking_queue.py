@@ -0,0 +1,189 @@
+"""Optional in-process serialization of bookings per doctor or per day.
+
+With ``BOOKING_QUEUE_MODE`` set, the booking endpoint hands its work to a
+:class:`BookingScheduler` instead of running it on the request session. Jobs
+for the same key run one after another on a single session: each inside its
+own savepoint, so a conflict only rolls back that job, and a whole batch is
+committed at once. Requests for different keys run in parallel. Conflicts
+between jobs of one key are resolved in memory by the serial order, not by
+waiting on row locks in the database.
+
+The queue only serializes requests within one process. The locking checks in
+``create_reservation`` still guard against other processes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date
+from time import monotonic
+from typing import Any, Awaitable, Callable, Hashable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.core.exceptions import BookingQueueFullError, BookingQueueTimeoutError
+from Assignment1.app.core.metrics import REGISTRY
+from Assignment1.app.core.query_stats import QueryStats, attach_query_stats, current_query_stats
+from Assignment1.app.db.session import SessionRouter, savepoint
+
+logger = logging.getLogger(__name__)
+
+BOOKING_QUEUE_WAIT = REGISTRY.histogram(
+    "booking_queue_wait_seconds",
+    "Time bookings spend queued before their batch starts.",
+)
+BOOKING_BATCH_SIZE = REGISTRY.histogram(
+    "booking_queue_batch_size",
+    "Bookings committed together per batch.",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+
+Operation = Callable[[AsyncSession], Awaitable[Any]]
+
+
+@dataclass
+class _Job:
+    operation: Operation
+    future: asyncio.Future
+    enqueued: float = field(default_factory=monotonic)
+    # 요청의 Server-Timing에 큐에서 실행된 쿼리도 포함되도록 넘겨받는다.
+    stats: QueryStats | None = field(default_factory=current_query_stats)
+    started: bool = False
+
+
+def _consume_result(future: asyncio.Future) -> None:
+    # 시간 초과로 아무도 기다리지 않는 작업의 예외가 경고로 남지 않게 한다.
+    if not future.cancelled():
+        future.exception()
+
+
+class BookingScheduler:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        *,
+        key_mode: str = "doctor",
+        batch_size: int = 16,
+        timeout_seconds: float = 5.0,
+        max_pending: int = 256,
+    ) -> None:
+        if key_mode not in {"doctor", "day"}:
+            raise ValueError(f"Unknown booking queue key mode: {key_mode}")
+        self.session_factory = session_factory
+        self.key_mode = key_mode
+        self.batch_size = batch_size
+        self.timeout_seconds = timeout_seconds
+        self.max_pending = max_pending
+        self._queues: dict[Hashable, deque[_Job]] = {}
+        self._workers: dict[Hashable, asyncio.Task] = {}
+
+    def key_for(self, doctor_id: int, day: date) -> Hashable:
+        return ("doctor", doctor_id) if self.key_mode == "doctor" else ("day", day)
+
+    def pending(self, key: Hashable) -> int:
+        return len(self._queues.get(key, ()))
+
+    async def submit(self, key: Hashable, operation: Operation) -> Any:
+        """Queue ``operation`` behind earlier jobs for ``key`` and wait for its committed result.
+
+        The timeout only applies while the job is still queued; a job that has
+        started is always awaited, so a timeout means nothing was written.
+        """
+        queue = self._queues.setdefault(key, deque())
+        if len(queue) >= self.max_pending:
+            raise BookingQueueFullError()
+        job = _Job(operation, asyncio.get_running_loop().create_future())
+        job.future.add_done_callback(_consume_result)
+        queue.append(job)
+        if key not in self._workers:
+            self._start_worker(key)
+        try:
+            return await asyncio.wait_for(asyncio.shield(job.future), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            if job.started:
+                # 이미 배치에서 실행 중인 예약은 커밋될 수 있으므로 결과를 끝까지 기다린다.
+                return await job.future
+            job.future.cancel()
+            raise BookingQueueTimeoutError() from None
+
+    def _start_worker(self, key: Hashable) -> None:
+        # 첫 요청의 컨텍스트(쿼리 집계 등)를 물려받지 않도록 빈 컨텍스트에서 돌린다.
+        self._workers[key] = asyncio.create_task(
+            self._drain(key), name=f"booking-queue-{key}", context=contextvars.Context()
+        )
+
+    async def _drain(self, key: Hashable) -> None:
+        queue = self._queues[key]
+        try:
+            while queue:
+                batch: list[_Job] = []
+                while queue and len(batch) < self.batch_size:
+                    job = queue.popleft()
+                    if not job.future.done():
+                        batch.append(job)
+                if batch:
+                    await self._run_batch(batch)
+                # 다른 키의 작업과 요청 처리에 이벤트 루프를 양보한다.
+                await asyncio.sleep(0)
+        finally:
+            del self._workers[key]
+            if queue:
+                self._start_worker(key)
+            else:
+                self._queues.pop(key, None)
+
+    async def _run_batch(self, batch: list[_Job]) -> None:
+        done: list[tuple[_Job, Any]] = []
+        try:
+            async with self.session_factory() as session:
+                for job in batch:
+                    if job.future.done():
+                        continue
+                    job.started = True
+                    BOOKING_QUEUE_WAIT.observe(monotonic() - job.enqueued)
+                    try:
+                        with attach_query_stats(job.stats):
+                            async with savepoint(session):
+                                result = await job.operation(session)
+                    except Exception as exc:
+                        job.future.set_exception(exc)
+                    else:
+                        done.append((job, result))
+                if done:
+                    await session.commit()
+        except Exception as exc:
+            logger.exception("booking_batch_failed", extra={"jobs": len(batch)})
+            for job in batch:
+                if not job.future.done():
+                    job.future.set_exception(exc)
+            return
+        BOOKING_BATCH_SIZE.observe(len(done))
+        for job, result in done:
+            if not job.future.done():
+                job.future.set_result(result)
+
+
+_schedulers: dict[tuple[async_sessionmaker, str], BookingScheduler] = {}
+
+
+def get_booking_scheduler(router: SessionRouter) -> BookingScheduler | None:
+    """Scheduler for ``router``'s primary, or ``None`` when the queue is off."""
+    settings = get_settings()
+    if settings.booking_queue_mode == "off":
+        return None
+    key = (router.writer(), settings.booking_queue_mode)
+    scheduler = _schedulers.get(key)
+    if scheduler is None:
+        scheduler = _schedulers[key] = BookingScheduler(
+            router.writer(),
+            key_mode=settings.booking_queue_mode,
+            batch_size=settings.booking_queue_batch_size,
+            timeout_seconds=settings.booking_queue_timeout_seconds,
+            max_pending=settings.booking_queue_max_pending,
+        )
+    return scheduler
@@ -0,0 +1,308 @@
+"""Per-process cache of the doctor and treatment catalog.
+
+Both catalogs are small and change rarely, so they are loaded whole (one query
+each) into a :class:`Catalog` that indexes doctors by id and by department and
+treatments by id. The patient directory, bookings and the admin listing's
+name lookup read from it instead of querying the tables; doctor search builds
+a sorted :class:`DoctorIndex` on the catalog the first time it is asked.
+
+Freshness is bounded by a version counter in ``system_configs`` that every
+admin catalog write bumps in the same transaction. A cached catalog is trusted
+for ``catalog_cache_ttl_seconds`` before the counter is checked again, so an
+edit made through another process shows up within that bound; edits made in
+this process drop the local copy as soon as they commit. Ids the catalog does
+not know (rows written around the admin API, or ids that do not exist) are
+looked up by primary key once; ids that are not found either are remembered
+until the next revalidation, so requests for unknown ids cannot force reloads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from functools import cached_property
+from time import monotonic
+from typing import Callable, Iterable, Mapping, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.core.metrics import REGISTRY
+from Assignment1.app.db import Doctor, Treatment
+from Assignment1.app.db.session import call_after_commit
+from Assignment1.app.services.config_versions import bump_version, version_statement
+
+CATALOG_VERSION_KEY = "catalog_version"
+
+CATALOG_VERSION = version_statement(CATALOG_VERSION_KEY)
+
+DOCTOR_ROWS = select(Doctor.id, Doctor.name, Doctor.department, Doctor.is_active)
+
+TREATMENT_ROWS = select(
+    Treatment.id,
+    Treatment.name,
+    Treatment.duration_minutes,
+    Treatment.price,
+    Treatment.description,
+    Treatment.is_active,
+)
+
+CATALOG_LOOKUPS = REGISTRY.counter(
+    "catalog_cache_lookups_total",
+    "Catalog cache lookups by outcome: hit (within TTL), revalidated (version unchanged),"
+    " fetched (unknown ids looked up) or reload.",
+    ("result",),
+)
+
+
+@dataclass(frozen=True)
+class CatalogDoctor:
+    id: int
+    name: str
+    department: str
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class CatalogTreatment:
+    id: int
+    name: str
+    duration_minutes: int
+    price: float
+    description: str | None
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class DoctorPage:
+    items: Sequence[CatalogDoctor]
+    total: int
+
+
+def search_key(name: str) -> str:
+    """Case-insensitive sort/prefix key shared by the index and the DB fallback."""
+    return name.lower()
+
+
+class DoctorIndex:
+    """Active doctors sorted by ``search_key(name)``, whole and per department.
+
+    A name prefix is a contiguous range of a sorted list, so a search is two
+    bisections and a slice instead of a scan over every doctor.
+    """
+
+    def __init__(self, doctors: Iterable[CatalogDoctor]) -> None:
+        ordered = sorted(doctors, key=lambda doctor: (search_key(doctor.name), doctor.id))
+        self._all = self._column(ordered)
+        grouped: dict[str, list[CatalogDoctor]] = {}
+        for doctor in ordered:
+            grouped.setdefault(doctor.department, []).append(doctor)
+        self._by_department = {
+            department: self._column(members) for department, members in grouped.items()
+        }
+
+    @staticmethod
+    def _column(doctors: list[CatalogDoctor]) -> tuple[list[str], list[CatalogDoctor]]:
+        return [search_key(doctor.name) for doctor in doctors], doctors
+
+    def search(
+        self,
+        *,
+        department: str | None = None,
+        prefix: str = "",
+        limit: int,
+        offset: int = 0,
+    ) -> DoctorPage:
+        keys, doctors = (
+            self._all if department is None else self._by_department.get(department, ([], []))
+        )
+        key = search_key(prefix)
+        lo = bisect_left(keys, key)
+        # 접두사로 시작하는 키는 모두 key 와 key + 최대 코드포인트 사이에 있다.
+        hi = bisect_left(keys, key + "\U0010ffff", lo) if key else len(keys)
+        start = min(lo + offset, hi)
+        return DoctorPage(items=doctors[start : min(start + limit, hi)], total=hi - lo)
+
+
+class Catalog:
+    def __init__(
+        self,
+        doctors: Iterable[CatalogDoctor],
+        treatments: Iterable[CatalogTreatment],
+        *,
+        version: str = "0",
+    ) -> None:
+        self.version = version
+        self.doctors: Mapping[int, CatalogDoctor] = {doctor.id: doctor for doctor in doctors}
+        self.treatments: Mapping[int, CatalogTreatment] = {
+            treatment.id: treatment for treatment in treatments
+        }
+        # 환자 API 목록은 활성 항목만, 이름순으로 미리 정렬해 둔다.
+        self.active_doctors = tuple(
+            sorted(
+                (doctor for doctor in self.doctors.values() if doctor.is_active),
+                key=lambda doctor: doctor.name,
+            )
+        )
+        by_department: dict[str, list[CatalogDoctor]] = {}
+        for doctor in self.active_doctors:
+            by_department.setdefault(doctor.department, []).append(doctor)
+        self._by_department = {
+            department: tuple(doctors) for department, doctors in by_department.items()
+        }
+        self.active_treatments = tuple(
+            sorted(
+                (treatment for treatment in self.treatments.values() if treatment.is_active),
+                key=lambda treatment: treatment.name,
+            )
+        )
+
+    @cached_property
+    def doctor_index(self) -> DoctorIndex:
+        # 검색이 처음 들어올 때 만든다. 버전이 바뀌면 Catalog 자체가 새로 만들어진다.
+        return DoctorIndex(self.active_doctors)
+
+    def doctors_in(self, department: str) -> tuple[CatalogDoctor, ...]:
+        return self._by_department.get(department, ())
+
+    def with_rows(
+        self, doctors: Iterable[CatalogDoctor], treatments: Iterable[CatalogTreatment]
+    ) -> Catalog:
+        """A copy of this catalog (same version) with ``doctors``/``treatments`` added."""
+        return Catalog(
+            [*self.doctors.values(), *doctors],
+            [*self.treatments.values(), *treatments],
+            version=self.version,
+        )
+
+
+@dataclass(frozen=True)
+class _CatalogEntry:
+    catalog: Catalog
+    expires_at: float
+    # 이번 TTL 동안 DB에도 없다고 확인한 ID: 같은 ID로는 다시 조회하지 않는다.
+    missing_doctors: frozenset[int] = field(default_factory=frozenset)
+    missing_treatments: frozenset[int] = field(default_factory=frozenset)
+
+
+def _treatment(row: Sequence) -> CatalogTreatment:
+    id_, name, duration, price, description, is_active = row
+    return CatalogTreatment(id_, name, duration, float(price), description, is_active)
+
+
+class CatalogCache:
+    def __init__(self, *, ttl_seconds: float, clock: Callable[[], float] = monotonic) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        # 레플리카와 프라이머리가 섞여도 DB마다 따로 보관한다.
+        self._entries: dict[object, _CatalogEntry] = {}
+        self._locks: dict[object, asyncio.Lock] = {}
+        # clear() 전에 시작한 재적재가 지워진 뒤의 캐시를 옛 카탈로그로 채우지 않게 한다.
+        self._generation = 0
+
+    def _fresh(self, bind: object) -> _CatalogEntry | None:
+        entry = self._entries.get(bind)
+        return entry if entry is not None and self.clock() < entry.expires_at else None
+
+    async def _revalidate(self, session: AsyncSession) -> tuple[_CatalogEntry, str]:
+        """Check the version once for every request that found the entry stale."""
+        bind = session.bind
+        async with self._locks.setdefault(bind, asyncio.Lock()):
+            # 기다리는 동안 앞선 요청이 확인·재적재를 끝냈으면 그 결과를 쓴다.
+            entry = self._fresh(bind)
+            if entry is not None:
+                return entry, "hit"
+            generation = self._generation
+            version = await session.scalar(CATALOG_VERSION) or "0"
+            entry = self._entries.get(bind)
+            if entry is None or entry.catalog.version != version:
+                doctors = [CatalogDoctor(*row) for row in await session.execute(DOCTOR_ROWS)]
+                treatments = [_treatment(row) for row in await session.execute(TREATMENT_ROWS)]
+                catalog = Catalog(doctors, treatments, version=version)
+                result = "reload"
+            else:
+                # 재확인할 때마다 지난번에 없던 ID도 다시 찾아볼 수 있게 한다.
+                catalog = entry.catalog
+                result = "revalidated"
+            entry = _CatalogEntry(catalog, self.clock() + self.ttl_seconds)
+            if generation == self._generation:
+                self._entries[bind] = entry
+            return entry, result
+
+    async def load(
+        self,
+        session: AsyncSession,
+        *,
+        doctor_ids: Iterable[int] = (),
+        treatment_ids: Iterable[int] = (),
+    ) -> Catalog:
+        """The cached catalog, revalidated if stale and extended with any unseen ids."""
+        entry = self._fresh(session.bind)
+        result = "hit"
+        if entry is None:
+            entry, result = await self._revalidate(session)
+            if result == "reload":
+                CATALOG_LOOKUPS.inc("reload")
+                return entry.catalog
+
+        catalog = entry.catalog
+        missing_doctors = set(doctor_ids) - catalog.doctors.keys() - entry.missing_doctors
+        missing_treatments = (
+            set(treatment_ids) - catalog.treatments.keys() - entry.missing_treatments
+        )
+        if not missing_doctors and not missing_treatments:
+            CATALOG_LOOKUPS.inc(result)
+            return catalog
+
+        # 버전은 그대로인데 모르는 ID: 카탈로그 전체가 아니라 그 ID만 읽는다.
+        CATALOG_LOOKUPS.inc("fetched")
+        doctors = []
+        if missing_doctors:
+            rows = await session.execute(DOCTOR_ROWS.where(Doctor.id.in_(missing_doctors)))
+            doctors = [CatalogDoctor(*row) for row in rows]
+        treatments = []
+        if missing_treatments:
+            rows = await session.execute(
+                TREATMENT_ROWS.where(Treatment.id.in_(missing_treatments))
+            )
+            treatments = [_treatment(row) for row in rows]
+        if doctors or treatments:
+            catalog = catalog.with_rows(doctors, treatments)
+        self._entries[session.bind] = _CatalogEntry(
+            catalog,
+            entry.expires_at,
+            entry.missing_doctors | (missing_doctors - {doctor.id for doctor in doctors}),
+            entry.missing_treatments
+            | (missing_treatments - {treatment.id for treatment in treatments}),
+        )
+        return catalog
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        # 잠금은 이벤트 루프에 묶이므로 루프가 바뀌는 테스트·벤치마크를 위해 함께 비운다.
+        self._locks.clear()
+
+
+catalog_cache = CatalogCache(ttl_seconds=get_settings().catalog_cache_ttl_seconds)
+
+
+async def load_catalog(
+    session: AsyncSession,
+    *,
+    doctor_ids: Iterable[int] = (),
+    treatment_ids: Iterable[int] = (),
+) -> Catalog:
+    return await catalog_cache.load(session, doctor_ids=doctor_ids, treatment_ids=treatment_ids)
+
+
+async def bump_catalog_version(session: AsyncSession) -> None:
+    """Invalidate every process's cached catalog when ``session`` commits."""
+    await bump_version(
+        session,
+        CATALOG_VERSION_KEY,
+        description="Bumped on every doctor/treatment catalog change",
+    )
+    call_after_commit(session, catalog_cache.clear)
@@ -0,0 +1,28 @@
+"""Version counters in ``system_configs`` backing the per-process caches.
+
+A cache remembers the counter value it was built from; writers bump the
+counter in the same transaction as their change, so every process notices on
+its next check and rebuilds.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Integer, Select, String, cast, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Assignment1.app.db import SystemConfig
+
+
+def version_statement(key: str) -> Select:
+    return select(SystemConfig.value).where(SystemConfig.key == key)
+
+
+async def bump_version(session: AsyncSession, key: str, *, description: str) -> None:
+    """Increment counter ``key``, creating it at "1"; takes effect when ``session`` commits."""
+    result = await session.execute(
+        update(SystemConfig)
+        .where(SystemConfig.key == key)
+        .values(value=cast(cast(SystemConfig.value, Integer) + 1, String))
+    )
+    if not result.rowcount:
+        session.add(SystemConfig(key=key, value="1", description=description))
@@ -0,0 +1,173 @@
+"""Effective hospital slot tables per date.
+
+Capacity for a date is resolved from three layers: the default capacity on
+``hospital_slots``, a weekly template (``hospital_slot_templates``) and
+date-specific overrides (``hospital_slot_overrides``, where a row without a
+slot applies to the whole day). Slots that resolve to capacity 0 are closed
+and left out of the table.
+
+All layers are loaded together into a :class:`HospitalSchedule`, which
+precomputes one table per weekday and one per overridden date, so resolving a
+day is a dict lookup. The schedule is cached per process and keyed by a
+version counter in ``system_configs`` that every schedule write bumps in the
+same transaction. Like the catalog cache, a cached schedule is trusted for
+``schedule_cache_ttl_seconds`` before the counter is checked again, and edits
+made in this process drop the local copy as soon as they commit. Checks and
+reloads for one database run one at a time, so a cold or stale cache costs a
+single reload however many requests arrive together. Rows written around the
+admin API (fixtures, seed scripts) are only seen after
+:meth:`ScheduleCache.clear` or the next version bump.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import date, time
+from time import monotonic
+from typing import Callable, Iterable, Mapping
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.db.session import call_after_commit
+from Assignment1.app.services import reservation_queries as queries
+from Assignment1.app.services.config_versions import bump_version
+
+SCHEDULE_VERSION_KEY = queries.SCHEDULE_VERSION_KEY
+
+
+@dataclass(frozen=True)
+class EffectiveSlot:
+    id: int
+    start_time: time
+    end_time: time
+    capacity: int
+
+
+@dataclass(frozen=True)
+class DaySchedule:
+    slots: tuple[EffectiveSlot, ...]
+    by_range: Mapping[tuple[time, time], EffectiveSlot]
+
+
+def _day_schedule(
+    slots: Iterable[EffectiveSlot], capacities: Mapping[int, int]
+) -> DaySchedule:
+    resolved = tuple(
+        EffectiveSlot(slot.id, slot.start_time, slot.end_time, capacities[slot.id])
+        for slot in slots
+        if capacities[slot.id] > 0
+    )
+    return DaySchedule(resolved, {(slot.start_time, slot.end_time): slot for slot in resolved})
+
+
+class HospitalSchedule:
+    def __init__(
+        self,
+        slots: Iterable[EffectiveSlot],
+        templates: Iterable[tuple[int, int, int]] = (),
+        overrides: Iterable[tuple[date, int | None, int]] = (),
+        *,
+        version: str = "0",
+    ) -> None:
+        """``templates`` holds ``(weekday, slot_id, capacity)`` rows and ``overrides``
+        ``(date, slot_id or None, capacity)`` rows; rows for unknown slots are ignored."""
+        self.version = version
+        slots = sorted(slots, key=lambda slot: slot.start_time)
+        defaults = {slot.id: slot.capacity for slot in slots}
+
+        weekday_capacities = [dict(defaults) for _ in range(7)]
+        for weekday, slot_id, capacity in templates:
+            if slot_id in defaults:
+                weekday_capacities[weekday][slot_id] = capacity
+        self._weekdays = tuple(_day_schedule(slots, capacities) for capacities in weekday_capacities)
+
+        per_date: dict[date, tuple[int | None, dict[int, int]]] = {}
+        for day, slot_id, capacity in overrides:
+            whole_day, per_slot = per_date.get(day, (None, {}))
+            if slot_id is None:
+                whole_day = capacity
+            elif slot_id in defaults:
+                per_slot[slot_id] = capacity
+            per_date[day] = (whole_day, per_slot)
+
+        self._dates: dict[date, DaySchedule] = {}
+        for day, (whole_day, per_slot) in per_date.items():
+            base = weekday_capacities[day.weekday()]
+            capacities = {
+                slot_id: per_slot.get(slot_id, base[slot_id] if whole_day is None else whole_day)
+                for slot_id in defaults
+            }
+            self._dates[day] = _day_schedule(slots, capacities)
+
+    def for_date(self, day: date) -> DaySchedule:
+        schedule = self._dates.get(day)
+        return schedule if schedule is not None else self._weekdays[day.weekday()]
+
+
+async def _read_schedule(session: AsyncSession, version: str) -> HospitalSchedule:
+    slots = [EffectiveSlot(*row) for row in await session.execute(queries.HOSPITAL_SLOT_ROWS)]
+    templates = (await session.execute(queries.SLOT_TEMPLATE_ROWS)).all()
+    overrides = (await session.execute(queries.SLOT_OVERRIDE_ROWS)).all()
+    return HospitalSchedule(slots, templates, overrides, version=version)
+
+
+class ScheduleCache:
+    def __init__(self, *, ttl_seconds: float, clock: Callable[[], float] = monotonic) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        # 레플리카와 프라이머리가 섞여도 DB마다 따로 보관한다: bind -> (schedule, 재확인 시각)
+        self._entries: dict[object, tuple[HospitalSchedule, float]] = {}
+        self._locks: dict[object, asyncio.Lock] = {}
+        # clear() 전에 시작한 재적재가 지워진 뒤의 캐시를 옛 표로 채우지 않게 한다.
+        self._generation = 0
+
+    def _fresh(self, bind: object) -> HospitalSchedule | None:
+        entry = self._entries.get(bind)
+        return entry[0] if entry is not None and self.clock() < entry[1] else None
+
+    async def load(self, session: AsyncSession) -> HospitalSchedule:
+        bind = session.bind
+        schedule = self._fresh(bind)
+        if schedule is not None:
+            return schedule
+        lock = self._locks.setdefault(bind, asyncio.Lock())
+        async with lock:
+            # 기다리는 동안 앞선 요청이 확인·재적재를 끝냈으면 그 결과를 쓴다.
+            schedule = self._fresh(bind)
+            if schedule is not None:
+                return schedule
+            generation = self._generation
+            version = await session.scalar(queries.SCHEDULE_VERSION) or "0"
+            entry = self._entries.get(bind)
+            if entry is not None and entry[0].version == version:
+                schedule = entry[0]
+            else:
+                schedule = await _read_schedule(session, version)
+            if generation == self._generation:
+                self._entries[bind] = (schedule, self.clock() + self.ttl_seconds)
+            return schedule
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        # 잠금은 이벤트 루프에 묶이므로 루프가 바뀌는 테스트·벤치마크를 위해 함께 비운다.
+        self._locks.clear()
+
+
+schedule_cache = ScheduleCache(ttl_seconds=get_settings().schedule_cache_ttl_seconds)
+
+
+async def load_schedule(session: AsyncSession) -> HospitalSchedule:
+    return await schedule_cache.load(session)
+
+
+async def bump_schedule_version(session: AsyncSession) -> None:
+    """Invalidate every process's cached schedule when ``session`` commits."""
+    await bump_version(
+        session,
+        SCHEDULE_VERSION_KEY,
+        description="Bumped on every hospital slot schedule change",
+    )
+    call_after_commit(session, schedule_cache.clear)
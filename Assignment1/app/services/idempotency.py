@@ -0,0 +1,164 @@
+"""Idempotency keys for retried write requests.
+
+The first request with a key claims it in a short transaction of its own; the
+response is stored on the claim in the same transaction as the write it
+describes. Retries find the stored response with one lookup on the
+``(scope, key)`` unique index and skip the write path entirely. A duplicate
+that arrives while the original is still running waits briefly for it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import Any
+
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from Assignment1.app.core.background import PeriodicWorker
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.core.exceptions import (
+    IdempotencyInProgressError,
+    IdempotencyKeyReusedError,
+    ValidationError,
+)
+from Assignment1.app.db import IdempotencyKey
+from Assignment1.app.db.session import SessionRouter
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 100
+_POLL_SECONDS = 0.05
+
+_LOOKUP = select(
+    IdempotencyKey.id,
+    IdempotencyKey.request_hash,
+    IdempotencyKey.status_code,
+    IdempotencyKey.response_body,
+    IdempotencyKey.created_at,
+    IdempotencyKey.expires_at,
+).where(IdempotencyKey.scope == bindparam("scope"), IdempotencyKey.key == bindparam("key"))
+
+
+@dataclass(frozen=True)
+class IdempotentReplay:
+    status_code: int
+    body: Any
+
+
+def request_fingerprint(*parts: Any) -> str:
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _naive(value: datetime) -> datetime:
+    return value.replace(tzinfo=None)
+
+
+async def claim_idempotency_key(
+    session: AsyncSession,
+    *,
+    scope: str,
+    key: str,
+    request_hash: str,
+) -> IdempotencyKey | IdempotentReplay:
+    """Claim ``key`` for this request, or return the response stored for it.
+
+    Raises :class:`IdempotencyKeyReusedError` when the key was used with a
+    different payload and :class:`IdempotencyInProgressError` when the original
+    request is still running after ``idempotency_wait_seconds``.
+    """
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise ValidationError(
+            f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters",
+            code="INVALID_IDEMPOTENCY_KEY",
+        )
+    settings = get_settings()
+    deadline = monotonic() + settings.idempotency_wait_seconds
+    while True:
+        now = datetime.utcnow()
+        row = (await session.execute(_LOOKUP, {"scope": scope, "key": key})).first()
+        stale = row is not None and (
+            _naive(row.expires_at) <= now
+            or (
+                row.status_code is None
+                and now - _naive(row.created_at)
+                >= timedelta(seconds=settings.idempotency_lock_seconds)
+            )
+        )
+        if row is None or stale:
+            if stale:
+                # 만료되었거나 처리 도중 죽은 요청의 키는 새 요청이 이어받는다.
+                await session.execute(delete(IdempotencyKey).where(IdempotencyKey.id == row.id))
+            claim = IdempotencyKey(
+                scope=scope,
+                key=key,
+                request_hash=request_hash,
+                created_at=now,
+                expires_at=now + timedelta(hours=settings.idempotency_ttl_hours),
+            )
+            session.add(claim)
+            try:
+                await session.commit()
+            except IntegrityError:
+                # 같은 키의 동시 요청이 먼저 선점했다.
+                await session.rollback()
+                continue
+            return claim
+
+        if row.request_hash != request_hash:
+            raise IdempotencyKeyReusedError()
+        if row.status_code is not None:
+            return IdempotentReplay(status_code=row.status_code, body=row.response_body)
+        if monotonic() >= deadline:
+            raise IdempotencyInProgressError()
+        await asyncio.sleep(_POLL_SECONDS)
+
+
+async def complete_idempotency_key(
+    session: AsyncSession, claim_id: int, status_code: int, body: Any
+) -> None:
+    """Store the response on the claim in ``session``, the one that commits the write itself.
+
+    Queued bookings commit on the batch session, not the request session that
+    made the claim, so the claim is updated by id rather than through its ORM
+    instance.
+    """
+    await session.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.id == claim_id)
+        .values(status_code=status_code, response_body=body)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def release_idempotency_key(session: AsyncSession, claim: IdempotencyKey) -> None:
+    """Drop the claim of a failed request so the client can retry it."""
+    claim_id = claim.id
+    await session.rollback()
+    await session.execute(delete(IdempotencyKey).where(IdempotencyKey.id == claim_id))
+    await session.commit()
+
+
+async def purge_expired_keys(session_factory: async_sessionmaker) -> int:
+    async with session_factory() as session:
+        result = await session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.utcnow())
+        )
+        await session.commit()
+    return result.rowcount or 0
+
+
+def build_idempotency_cleanup_worker(router: SessionRouter) -> PeriodicWorker:
+    async def purge() -> None:
+        await purge_expired_keys(router.writer())
+
+    return PeriodicWorker(
+        "idempotency-cleanup", purge, interval=get_settings().idempotency_cleanup_seconds
+    )
@@ -0,0 +1,87 @@
+"""Per-process negative cache of recently failed booking checks.
+
+When ``create_reservation`` finds a hospital slot at capacity or the doctor
+already booked, it remembers that for a short TTL so identical requests are
+rejected before any query runs. Entries are dropped when a cancellation in
+the same day commits (locally or, through the outbox, in another process);
+the TTL bounds how long anything else can keep an entry stale. A hit only
+ever turns a request away early, and the database checks still decide every
+booking that gets through.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, time
+from time import monotonic
+from typing import Callable, Hashable, Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.core.metrics import REGISTRY
+from Assignment1.app.db.session import call_after_commit
+from Assignment1.app.services.outbox import APPOINTMENT_CANCELLED, OutboxMessage
+
+PRECHECK_REJECTIONS = REGISTRY.counter(
+    "booking_precheck_rejections_total",
+    "Bookings rejected by the known-full cache before touching the database.",
+    ("reason",),
+)
+
+
+class KnownFullCache:
+    def __init__(self, *, ttl_seconds: float, clock: Callable[[], float] = monotonic) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        # 날짜별로 묶어 두어 취소 시 해당 날짜만 지운다.
+        self._entries: dict[date, dict[Hashable, float]] = defaultdict(dict)
+
+    def _hit(self, day: date, key: Hashable) -> bool:
+        entries = self._entries.get(day)
+        if not entries or key not in entries:
+            return False
+        if entries[key] <= self.clock():
+            del entries[key]
+            return False
+        return True
+
+    def _mark(self, day: date, key: Hashable) -> None:
+        if self.ttl_seconds > 0:
+            self._entries[day][key] = self.clock() + self.ttl_seconds
+
+    def doctor_busy(self, doctor_id: int, start_at: datetime, end_at: datetime) -> bool:
+        return self._hit(start_at.date(), ("doctor", doctor_id, start_at, end_at))
+
+    def mark_doctor_busy(self, doctor_id: int, start_at: datetime, end_at: datetime) -> None:
+        self._mark(start_at.date(), ("doctor", doctor_id, start_at, end_at))
+
+    def full_slot(self, day: date, slot_keys: Iterable[tuple[time, time]]) -> bool:
+        return any(self._hit(day, ("slot", *slot_key)) for slot_key in slot_keys)
+
+    def mark_slot_full(self, day: date, slot_key: tuple[time, time]) -> None:
+        self._mark(day, ("slot", *slot_key))
+
+    def release(self, day: date | None = None) -> None:
+        """Forget everything known about ``day`` (every day when ``None``)."""
+        if day is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(day, None)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+
+known_full_cache = KnownFullCache(ttl_seconds=get_settings().known_full_ttl_seconds)
+
+
+def mark_capacity_released(session: AsyncSession, day: date | None) -> None:
+    """Drop cached rejections for ``day`` (every day when ``None``) once ``session`` commits."""
+    call_after_commit(session, lambda: known_full_cache.release(day))
+
+
+async def release_from_event(message: OutboxMessage) -> None:
+    """Outbox subscriber: cancellations made by other processes free capacity here too."""
+    if message.event_type == APPOINTMENT_CANCELLED and message.day is not None:
+        known_full_cache.release(message.day)
@@ -0,0 +1,368 @@
+"""Transactional outbox for appointment changes.
+
+Mutations add an :class:`OutboxEvent` in their own transaction. Each process runs
+an :class:`OutboxDispatcher` under its own consumer name, which reads events past
+its cursor (kept in ``system_configs``) and hands them to in-process subscribers.
+The cursor only moves once every subscriber has accepted an event, so delivery
+is at-least-once and subscribers must be idempotent.
+
+Ids the cursor had to move past while their transaction might still be open
+are kept per consumer in ``outbox_gaps`` and looked up again on every drain, so
+a slow transaction's event is delivered late rather than lost. Events that keep
+failing are moved to ``outbox_dead_letters`` after ``max_attempts``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from time import monotonic
+from typing import Awaitable, Callable, NamedTuple, Sequence
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from Assignment1.app.core.background import PeriodicWorker
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.core.metrics import REGISTRY
+from Assignment1.app.db import (
+    Appointment,
+    AppointmentStatus,
+    OutboxDeadLetter,
+    OutboxEvent,
+    OutboxGap,
+    SystemConfig,
+)
+from Assignment1.app.db.session import SessionRouter, call_after_commit
+
+logger = logging.getLogger(__name__)
+
+APPOINTMENT_CREATED = "appointment.created"
+APPOINTMENT_CANCELLED = "appointment.cancelled"
+APPOINTMENT_STATUS_CHANGED = "appointment.status_changed"
+CURSOR_KEY_PREFIX = "outbox_cursor:"
+
+OUTBOX_LAG = REGISTRY.gauge(
+    "outbox_lag_seconds",
+    "Age of the oldest outbox event the consumer has not delivered yet.",
+    ("consumer",),
+)
+OUTBOX_DELIVERED = REGISTRY.counter(
+    "outbox_events_delivered_total",
+    "Outbox events delivered to every subscriber.",
+    ("consumer", "event_type"),
+)
+OUTBOX_FAILURES = REGISTRY.counter(
+    "outbox_delivery_failures_total",
+    "Subscriber errors while delivering outbox events.",
+    ("consumer", "subscriber"),
+)
+OUTBOX_DEAD_LETTERS = REGISTRY.counter(
+    "outbox_dead_letters_total",
+    "Outbox events moved to outbox_dead_letters after max_attempts failures.",
+    ("consumer", "event_type"),
+)
+
+EVENT_COLUMNS = select(
+    OutboxEvent.id,
+    OutboxEvent.event_type,
+    OutboxEvent.aggregate_id,
+    OutboxEvent.payload,
+    OutboxEvent.created_at,
+)
+
+
+def _utcnow() -> datetime:
+    # created_at 은 naive UTC 로 저장된다.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass(frozen=True)
+class OutboxMessage:
+    id: int
+    event_type: str
+    aggregate_id: int
+    payload: dict
+    created_at: datetime
+
+    @property
+    def day(self) -> date | None:
+        raw = self.payload.get("date")
+        return date.fromisoformat(raw) if raw else None
+
+
+class AppointmentRef(NamedTuple):
+    """The appointment columns an event payload needs, for writes that skip the ORM."""
+
+    id: int
+    patient_id: int
+    doctor_id: int
+    status: AppointmentStatus
+    start_at: datetime
+    end_at: datetime
+
+
+Subscriber = Callable[[OutboxMessage], Awaitable[None]]
+
+_commit_listeners: list[Callable[[], None]] = []
+
+
+def _notify_committed() -> None:
+    for listener in list(_commit_listeners):
+        listener()
+
+
+def record_appointment_event(
+    session: AsyncSession,
+    event_type: str,
+    appointment: Appointment | AppointmentRef,
+    *,
+    previous_status: AppointmentStatus | None = None,
+) -> None:
+    """Stage an event for ``appointment``; it becomes visible only if the session commits."""
+    session.add(
+        OutboxEvent(
+            event_type=event_type,
+            aggregate_id=appointment.id,
+            payload={
+                "appointment_id": appointment.id,
+                "patient_id": appointment.patient_id,
+                "doctor_id": appointment.doctor_id,
+                "status": appointment.status.value,
+                "previous_status": previous_status.value if previous_status else None,
+                "date": appointment.start_at.date().isoformat(),
+                "start_at": appointment.start_at.isoformat(),
+                "end_at": appointment.end_at.isoformat(),
+            },
+        )
+    )
+    call_after_commit(session, _notify_committed)
+
+
+class OutboxDispatcher:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        consumer: str,
+        subscribers: Sequence[Subscriber],
+        *,
+        batch_size: int = 100,
+        max_attempts: int = 5,
+        gap_timeout_seconds: float = 0.5,
+        retention: timedelta = timedelta(hours=24),
+        purge_interval_seconds: float = 600.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.consumer = consumer
+        self.subscribers = list(subscribers)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.gap_timeout_seconds = gap_timeout_seconds
+        self.retention = retention
+        self.purge_interval_seconds = purge_interval_seconds
+        self.cursor: int | None = None
+        self._attempts: dict[int, int] = {}
+        # 아직 커밋되지 않았을 수 있는 id 구멍 -> 처음 본 시각
+        self._gaps: dict[int, float] = {}
+        # 커서와 같은 트랜잭션에 저장할 건너뛴 id·dead letter 행
+        self._staged: list[OutboxGap | OutboxDeadLetter] = []
+        self._last_purge = monotonic()
+
+    @property
+    def cursor_key(self) -> str:
+        return f"{CURSOR_KEY_PREFIX}{self.consumer}"
+
+    async def _load_cursor(self, session: AsyncSession) -> int:
+        stored = await session.scalar(
+            select(SystemConfig.value).where(SystemConfig.key == self.cursor_key)
+        )
+        if stored is not None:
+            return int(stored)
+        # 새 소비자는 과거 이벤트를 재생하지 않고 현재 시점부터 받는다.
+        latest = await session.scalar(select(func.max(OutboxEvent.id))) or 0
+        session.add(
+            SystemConfig(
+                key=self.cursor_key,
+                value=str(latest),
+                description="Last outbox event id delivered to this consumer",
+            )
+        )
+        await session.commit()
+        return latest
+
+    async def _save_cursor(self, session: AsyncSession, cursor: int) -> None:
+        session.add_all(self._staged)
+        self._staged.clear()
+        await session.execute(
+            update(SystemConfig)
+            .where(SystemConfig.key == self.cursor_key)
+            .values(value=str(cursor))
+        )
+        await session.commit()
+        self.cursor = cursor
+
+    async def _dispatch(self, message: OutboxMessage) -> bool:
+        """Deliver to every subscriber; ``False`` means retry later."""
+        failed = False
+        for subscriber in self.subscribers:
+            try:
+                await subscriber(message)
+            except Exception:
+                failed = True
+                name = getattr(subscriber, "__name__", type(subscriber).__name__)
+                OUTBOX_FAILURES.inc(self.consumer, name)
+                logger.exception(
+                    "outbox_delivery_failed",
+                    extra={"consumer": self.consumer, "event_id": message.id, "subscriber": name},
+                )
+        if not failed:
+            self._attempts.pop(message.id, None)
+            OUTBOX_DELIVERED.inc(self.consumer, message.event_type)
+            return True
+
+        attempts = self._attempts[message.id] = self._attempts.get(message.id, 0) + 1
+        if attempts < self.max_attempts:
+            return False
+        logger.error(
+            "outbox_event_dead_lettered",
+            extra={"consumer": self.consumer, "event_id": message.id, "attempts": attempts},
+        )
+        OUTBOX_DEAD_LETTERS.inc(self.consumer, message.event_type)
+        self._staged.append(
+            OutboxDeadLetter(
+                consumer=self.consumer,
+                event_id=message.id,
+                event_type=message.event_type,
+                aggregate_id=message.aggregate_id,
+                payload=message.payload,
+                attempts=attempts,
+                event_created_at=message.created_at,
+            )
+        )
+        self._attempts.pop(message.id, None)
+        return True
+
+    async def _deliver(self, rows: Sequence) -> tuple[int, bool]:
+        cursor = self.cursor
+        for row in rows:
+            message = OutboxMessage(*row)
+            skipped = range(cursor + 1, message.id)
+            if skipped:
+                # 더 작은 id의 트랜잭션이 아직 진행 중일 수 있다. 잠시 기다린 뒤에는 그 id를
+                # outbox_gaps 에 남기고 넘어가, 늦게 커밋되더라도 다음 drain 에서 전달한다.
+                first_seen = self._gaps.setdefault(cursor + 1, monotonic())
+                if monotonic() - first_seen < self.gap_timeout_seconds:
+                    return cursor, True
+            if not await self._dispatch(message):
+                return cursor, True
+            self._staged.extend(
+                OutboxGap(consumer=self.consumer, event_id=event_id) for event_id in skipped
+            )
+            cursor = message.id
+        return cursor, False
+
+    async def _deliver_gaps(self, session: AsyncSession) -> int:
+        """Deliver events that committed after the cursor had moved past their id."""
+        rows = (
+            await session.execute(
+                EVENT_COLUMNS.join(
+                    OutboxGap,
+                    (OutboxGap.event_id == OutboxEvent.id)
+                    & (OutboxGap.consumer == self.consumer),
+                ).order_by(OutboxEvent.id)
+            )
+        ).all()
+        done = []
+        for row in rows:
+            if await self._dispatch(OutboxMessage(*row)):
+                done.append(row.id)
+        if done:
+            await session.execute(
+                delete(OutboxGap).where(
+                    OutboxGap.consumer == self.consumer, OutboxGap.event_id.in_(done)
+                )
+            )
+            session.add_all(self._staged)
+            self._staged.clear()
+            await session.commit()
+        return len(done)
+
+    async def drain(self) -> int:
+        """Deliver pending events in batches; returns how many were delivered."""
+        delivered = 0
+        async with self.session_factory() as session:
+            if self.cursor is None:
+                self.cursor = await self._load_cursor(session)
+            delivered += await self._deliver_gaps(session)
+            while True:
+                rows = (
+                    await session.execute(
+                        EVENT_COLUMNS.where(OutboxEvent.id > self.cursor)
+                        .order_by(OutboxEvent.id)
+                        .limit(self.batch_size)
+                    )
+                ).all()
+                if not rows:
+                    break
+                cursor, blocked = await self._deliver(rows)
+                if cursor == self.cursor:
+                    self._staged.clear()
+                else:
+                    delivered += sum(1 for row in rows if row[0] <= cursor)
+                    await self._save_cursor(session, cursor)
+                    self._gaps = {key: seen for key, seen in self._gaps.items() if key > cursor}
+                if blocked or len(rows) < self.batch_size:
+                    break
+
+            oldest = await session.scalar(
+                select(func.min(OutboxEvent.created_at)).where(OutboxEvent.id > self.cursor)
+            )
+            lag = (_utcnow() - oldest.replace(tzinfo=None)).total_seconds() if oldest else 0.0
+            OUTBOX_LAG.set(max(lag, 0.0), self.consumer)
+
+            if monotonic() - self._last_purge >= self.purge_interval_seconds:
+                await self.purge(session)
+        return delivered
+
+    async def purge(self, session: AsyncSession) -> None:
+        cutoff = _utcnow() - self.retention
+        await session.execute(delete(OutboxEvent).where(OutboxEvent.created_at < cutoff))
+        # 보관 기간이 지나도록 나타나지 않은 id는 롤백된 것이다.
+        await session.execute(delete(OutboxGap).where(OutboxGap.created_at < cutoff))
+        await session.commit()
+        self._last_purge = monotonic()
+
+
+def consumer_name(service: str, worker: str = "") -> str:
+    """``service@worker``; without a configured worker name, ``service@host:pid``.
+
+    Each process needs its own cursor: two workers sharing one would both
+    deliver some events and skip others.
+    """
+    return f"{service}@{worker or f'{socket.gethostname()}:{os.getpid()}'}"
+
+
+def build_outbox_worker(dispatcher: OutboxDispatcher, *, interval: float) -> PeriodicWorker:
+    async def drain() -> None:
+        await dispatcher.drain()
+
+    worker = PeriodicWorker(f"outbox-{dispatcher.consumer}", drain, interval=interval)
+    _commit_listeners.append(worker.wake)
+    return worker
+
+
+def build_service_outbox_worker(
+    service: str, router: SessionRouter, subscribers: Sequence[Subscriber]
+) -> PeriodicWorker:
+    settings = get_settings()
+    dispatcher = OutboxDispatcher(
+        router.writer(),
+        consumer_name(service, settings.outbox_worker_name),
+        subscribers,
+        batch_size=settings.outbox_batch_size,
+        retention=timedelta(hours=settings.outbox_retention_hours),
+    )
+    return build_outbox_worker(dispatcher, interval=settings.outbox_poll_seconds)
@@ -2,28 +2,81 @@ from __future__ import annotations
 
 from typing import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from Assignment1.app.db import Doctor, Treatment
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.db import Doctor
+from Assignment1.app.services.catalog_cache import (
+    CatalogDoctor,
+    CatalogTreatment,
+    DoctorPage,
+    load_catalog,
+)
 
 
 async def list_doctors(
     session: AsyncSession, *, department: str | None = None
-) -> Sequence[Doctor]:
-    stmt = select(Doctor).where(Doctor.is_active.is_(True))
+) -> Sequence[CatalogDoctor]:
+    catalog = await load_catalog(session)
     if department:
-        stmt = stmt.where(Doctor.department == department)
-    stmt = stmt.order_by(Doctor.name.asc())
-    result = await session.scalars(stmt)
-    return result.all()
+        return catalog.doctors_in(department)
+    return catalog.active_doctors
 
 
-async def list_treatments(session: AsyncSession) -> Sequence[Treatment]:
-    stmt = (
-        select(Treatment)
-        .where(Treatment.is_active.is_(True))
-        .order_by(Treatment.name.asc())
+async def list_treatments(session: AsyncSession) -> Sequence[CatalogTreatment]:
+    catalog = await load_catalog(session)
+    return catalog.active_treatments
+
+
+async def search_doctors(
+    session: AsyncSession,
+    *,
+    department: str | None = None,
+    prefix: str = "",
+    limit: int = 20,
+    offset: int = 0,
+) -> DoctorPage:
+    """Active doctors whose name starts with ``prefix`` (case-insensitive), by name.
+
+    Served from the catalog's sorted index unless ``doctor_search_mode`` is
+    ``db``; both paths return the same page for the same catalog.
+    """
+    if get_settings().doctor_search_mode == "db":
+        return await _search_doctors_in_db(
+            session, department=department, prefix=prefix, limit=limit, offset=offset
+        )
+    catalog = await load_catalog(session)
+    return catalog.doctor_index.search(
+        department=department, prefix=prefix, limit=limit, offset=offset
+    )
+
+
+def _like_prefix(prefix: str) -> str:
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+async def _search_doctors_in_db(
+    session: AsyncSession,
+    *,
+    department: str | None,
+    prefix: str,
+    limit: int,
+    offset: int,
+) -> DoctorPage:
+    clauses = [Doctor.is_active.is_(True)]
+    if department is not None:
+        clauses.append(Doctor.department == department)
+    if prefix:
+        clauses.append(func.lower(Doctor.name).like(_like_prefix(prefix.lower()), escape="\\"))
+
+    total = await session.scalar(select(func.count()).select_from(Doctor).where(*clauses))
+    rows = await session.execute(
+        select(Doctor.id, Doctor.name, Doctor.department, Doctor.is_active)
+        .where(*clauses)
+        .order_by(func.lower(Doctor.name), Doctor.id)
+        .limit(limit)
+        .offset(offset)
     )
-    result = await session.scalars(stmt)
-    return result.all()
+    return DoctorPage(items=[CatalogDoctor(*row) for row in rows], total=total or 0)
@@ -1,24 +1,39 @@
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 from typing import Sequence
 
-from sqlalchemy import and_, func, select, tuple_
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from Assignment1.app.db import (
     Appointment,
     AppointmentSlot,
     AppointmentStatus,
-    HospitalSlot,
     Treatment,
     VisitType,
 )
 from Assignment1.app.core.exceptions import (
     ReservationConflictError,
 )
+from Assignment1.app.services import reservation_queries as queries
+from Assignment1.app.services.availability_snapshots import mark_availability_changed
+from Assignment1.app.services.catalog_cache import CatalogTreatment
+from Assignment1.app.services.hospital_schedule import load_schedule
+from Assignment1.app.services.known_full import (
+    PRECHECK_REJECTIONS,
+    known_full_cache,
+    mark_capacity_released,
+)
+from Assignment1.app.services.outbox import (
+    APPOINTMENT_CANCELLED,
+    APPOINTMENT_CREATED,
+    record_appointment_event,
+)
 from Assignment1.app.services.slot_rules import (
-    RESERVATION_STEP,
+    available_windows,
     expand_reservation,
     iter_slot_keys,
     validate_slot_alignment,
@@ -30,100 +45,40 @@ async def get_doctor_appointments(
 ) -> Sequence[Appointment]:
     start_of_day = datetime.combine(day, datetime.min.time())
     end_of_day = datetime.combine(day, datetime.max.time())
-    stmt = (
-        select(Appointment)
-        .where(Appointment.doctor_id == doctor_id)
-        .where(Appointment.status != AppointmentStatus.CANCELLED)
-        .where(Appointment.start_at < end_of_day)
-        .where(Appointment.end_at > start_of_day)
+    result = await session.scalars(
+        queries.DOCTOR_APPOINTMENTS_IN_RANGE,
+        {"doctor_id": doctor_id, "range_start": start_of_day, "range_end": end_of_day},
     )
-    result = await session.scalars(stmt)
     return result.all()
 
 
 async def list_availability(
     session: AsyncSession, doctor_id: int, target_date: date
 ) -> list[tuple[datetime, datetime, int]]:
-    hospital_slots = await session.scalars(
-        select(HospitalSlot).order_by(HospitalSlot.start_time)
-    )
-    slots = hospital_slots.all()
+    schedule = await load_schedule(session)
+    slots = schedule.for_date(target_date).slots
     if not slots:
         return []
 
-    slot_map = {(slot.start_time, slot.end_time): slot for slot in slots}
-    capacity_map = {slot.id: slot.capacity for slot in slots}
-
     slot_counts_rows = await session.execute(
-        select(AppointmentSlot.slot_id, func.count(AppointmentSlot.appointment_id))
-        .join(Appointment)
-        .where(AppointmentSlot.slot_date == target_date)
-        .where(Appointment.status != AppointmentStatus.CANCELLED)
-        .group_by(AppointmentSlot.slot_id)
-    )
-    slot_counts = dict(slot_counts_rows.all())
-
-    first_start = slots[0].start_time
-    last_end = slots[-1].end_time
-    duration = 30  # 기본 공개 슬롯은 30분 단위
-
-    availability: list[tuple[datetime, datetime, int]] = []
-    cursor = datetime.combine(target_date, first_start)
-    close_boundary = (
-        datetime.combine(target_date, last_end) - timedelta(minutes=duration)
+        queries.SLOT_OCCUPANCY_BY_DATE, {"slot_date": target_date}
     )
-    while cursor <= close_boundary:
-        validate_slot_alignment(cursor)
-        reservation_slots = expand_reservation(cursor, duration)
-        try:
-            slot_ids = []
-            min_remaining = None
-            for slot_start, slot_end in iter_slot_keys(reservation_slots):
-                slot = slot_map.get((slot_start, slot_end))
-                if slot is None:
-                    raise ReservationConflictError("Slot definition missing")
-                occupied = slot_counts.get(slot.id, 0)
-                remaining = capacity_map[slot.id] - occupied
-                if remaining <= 0:
-                    raise ReservationConflictError("Capacity exhausted")
-                if min_remaining is None or remaining < min_remaining:
-                    min_remaining = remaining
-                slot_ids.append(slot.id)
-        except ReservationConflictError:
-            cursor += RESERVATION_STEP
-            continue
-
-        overlap_exists = await session.scalar(
-            select(func.count())
-            .select_from(Appointment)
-            .where(Appointment.doctor_id == doctor_id)
-            .where(Appointment.status != AppointmentStatus.CANCELLED)
-            .where(
-                and_(
-                    Appointment.start_at < reservation_slots[-1][1],
-                    Appointment.end_at > reservation_slots[0][0],
-                )
-            )
-        )
-        if overlap_exists:
-            cursor += RESERVATION_STEP
-            continue
-
-        availability.append(
-            (reservation_slots[0][0], reservation_slots[-1][1], min_remaining or 0)
-        )
-        cursor += RESERVATION_STEP
-
-    return availability
+    booked_ranges = [
+        (appointment.start_at, appointment.end_at)
+        for appointment in await get_doctor_appointments(session, doctor_id, target_date)
+    ]
+    return available_windows(target_date, slots, dict(slot_counts_rows.all()), booked_ranges)
 
 
 async def _determine_visit_type(session: AsyncSession, patient_id: int) -> VisitType:
     completed_exists = await session.scalar(
-        select(func.count())
-        .select_from(Appointment)
-        .where(Appointment.patient_id == patient_id)
-        .where(Appointment.status == AppointmentStatus.COMPLETED)
+        queries.PATIENT_COMPLETED_COUNT, {"patient_id": patient_id}
     )
+    if not completed_exists:
+        # 오래된 방문은 보관 테이블로 옮겨졌을 수 있다.
+        completed_exists = await session.scalar(
+            queries.ARCHIVED_PATIENT_COMPLETED, {"patient_id": patient_id}
+        )
     return (
         VisitType.FOLLOW_UP
         if completed_exists and completed_exists > 0
@@ -136,54 +91,47 @@ async def create_reservation(
     *,
     patient_id: int,
     doctor_id: int,
-    treatment: Treatment,
+    treatment: CatalogTreatment | Treatment,
     start_at: datetime,
     memo: str | None = None,
 ) -> Appointment:
     validate_slot_alignment(start_at)
     reservation_slots = expand_reservation(start_at, treatment.duration_minutes)
     slot_keys = iter_slot_keys(reservation_slots)
+    range_start, range_end = reservation_slots[0][0], reservation_slots[-1][1]
+    slot_date = range_start.date()
 
-    slots_result = await session.scalars(
-        select(HospitalSlot).where(
-            tuple_(HospitalSlot.start_time, HospitalSlot.end_time).in_(slot_keys)
-        )
-    )
-    slot_lookup = {(slot.start_time, slot.end_time): slot for slot in slots_result.all()}
-    if len(slot_lookup) != len(slot_keys):
+    # 방금 실패한 것과 같은 요청은 DB 잠금 없이 바로 돌려보낸다.
+    if known_full_cache.doctor_busy(doctor_id, range_start, range_end):
+        PRECHECK_REJECTIONS.inc("doctor")
+        raise ReservationConflictError("Doctor is already booked for this period")
+    if known_full_cache.full_slot(slot_date, slot_keys):
+        PRECHECK_REJECTIONS.inc("slot")
+        raise ReservationConflictError("Hospital capacity exceeded for selected slot")
+
+    schedule = await load_schedule(session)
+    slot_lookup = schedule.for_date(slot_date).by_range
+    if any(slot_key not in slot_lookup for slot_key in slot_keys):
         raise ReservationConflictError("Requested time is outside hospital operating hours")
 
     # Check doctor overlap
     overlap_exists = await session.scalar(
-        select(func.count())
-        .select_from(Appointment)
-        .where(Appointment.doctor_id == doctor_id)
-        .where(Appointment.status != AppointmentStatus.CANCELLED)
-        .where(
-            and_(
-                Appointment.start_at < reservation_slots[-1][1],
-                Appointment.end_at > reservation_slots[0][0],
-            )
-        )
-        .with_for_update()
+        queries.DOCTOR_OVERLAP_COUNT_FOR_UPDATE,
+        {"doctor_id": doctor_id, "range_start": range_start, "range_end": range_end},
     )
     if overlap_exists and overlap_exists > 0:
+        known_full_cache.mark_doctor_busy(doctor_id, range_start, range_end)
         raise ReservationConflictError("Doctor is already booked for this period")
 
-    slot_date = reservation_slots[0][0].date()
     # Capacity check per hospital slot
     for slot_start, slot_end in slot_keys:
         slot = slot_lookup[(slot_start, slot_end)]
         occupied = await session.scalar(
-            select(func.count())
-            .select_from(AppointmentSlot)
-            .join(Appointment)
-            .where(AppointmentSlot.slot_id == slot.id)
-            .where(AppointmentSlot.slot_date == slot_date)
-            .where(Appointment.status != AppointmentStatus.CANCELLED)
-            .with_for_update()
+            queries.SLOT_USAGE_COUNT_FOR_UPDATE,
+            {"slot_id": slot.id, "slot_date": slot_date},
         )
         if occupied is not None and occupied >= slot.capacity:
+            known_full_cache.mark_slot_full(slot_date, (slot_start, slot_end))
             raise ReservationConflictError("Hospital capacity exceeded for selected slot")
 
     visit_type = await _determine_visit_type(session, patient_id)
@@ -191,14 +139,20 @@ async def create_reservation(
         patient_id=patient_id,
         doctor_id=doctor_id,
         treatment_id=treatment.id,
-        start_at=reservation_slots[0][0],
-        end_at=reservation_slots[-1][1],
+        start_at=range_start,
+        end_at=range_end,
         status=AppointmentStatus.PENDING,
         visit_type=visit_type,
         memo=memo,
     )
     session.add(appointment)
-    await session.flush()
+    try:
+        await session.flush()
+    except IntegrityError as exc:
+        # SQLite 처럼 FOR UPDATE 가 없으면 동시 요청이 모두 중복 검사를 통과할 수 있다.
+        # 그 경우 uq_doctor_start_at 가 막아 주므로 같은 409 로 돌려준다.
+        known_full_cache.mark_doctor_busy(doctor_id, range_start, range_end)
+        raise ReservationConflictError("Doctor is already booked for this period") from exc
 
     for slot_start_dt, slot_end_dt in reservation_slots:
         slot = slot_lookup[(slot_start_dt.time(), slot_end_dt.time())]
@@ -210,6 +164,8 @@ async def create_reservation(
             )
         )
 
+    mark_availability_changed(session, slot_date)
+    record_appointment_event(session, APPOINTMENT_CREATED, appointment)
     return appointment
 
 
@@ -218,6 +174,7 @@ async def list_patient_appointments(
 ) -> Sequence[Appointment]:
     stmt = (
         select(Appointment)
+        .options(joinedload(Appointment.doctor), joinedload(Appointment.treatment))
         .where(Appointment.patient_id == patient_id)
         .order_by(Appointment.start_at.desc())
     )
@@ -233,5 +190,11 @@ async def cancel_reservation(
         raise ReservationConflictError("Appointment not found for patient")
     if appointment.status == AppointmentStatus.COMPLETED:
         raise ReservationConflictError("Completed appointments cannot be cancelled")
+    previous_status = appointment.status
     appointment.status = AppointmentStatus.CANCELLED
+    mark_availability_changed(session, appointment.start_at.date())
+    mark_capacity_released(session, appointment.start_at.date())
+    record_appointment_event(
+        session, APPOINTMENT_CANCELLED, appointment, previous_status=previous_status
+    )
     return appointment
@@ -0,0 +1,100 @@
+"""Prebuilt statements for the reservation hot paths.
+
+Each statement is constructed once at import time with named bind parameters.
+Callers only pass values, so SQLAlchemy skips rebuilding the construct and
+serves the compiled SQL from its cache on every call after the first.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import bindparam, func, select
+
+from Assignment1.app.db import (
+    Appointment,
+    AppointmentSlot,
+    AppointmentStatus,
+    ArchivedAppointment,
+    Doctor,
+    HospitalSlot,
+    HospitalSlotOverride,
+    HospitalSlotTemplate,
+    SystemConfig,
+)
+
+SCHEDULE_VERSION_KEY = "hospital_schedule_version"
+
+SCHEDULE_VERSION = select(SystemConfig.value).where(SystemConfig.key == SCHEDULE_VERSION_KEY)
+
+HOSPITAL_SLOT_ROWS = select(
+    HospitalSlot.id, HospitalSlot.start_time, HospitalSlot.end_time, HospitalSlot.capacity
+)
+
+SLOT_TEMPLATE_ROWS = select(
+    HospitalSlotTemplate.weekday, HospitalSlotTemplate.slot_id, HospitalSlotTemplate.capacity
+)
+
+SLOT_OVERRIDE_ROWS = select(
+    HospitalSlotOverride.override_date,
+    HospitalSlotOverride.slot_id,
+    HospitalSlotOverride.capacity,
+)
+
+SLOT_OCCUPANCY_BY_DATE = (
+    select(AppointmentSlot.slot_id, func.count(AppointmentSlot.appointment_id))
+    .join(Appointment)
+    .where(AppointmentSlot.slot_date == bindparam("slot_date"))
+    .where(Appointment.status != AppointmentStatus.CANCELLED)
+    .group_by(AppointmentSlot.slot_id)
+)
+
+DOCTOR_APPOINTMENTS_IN_RANGE = (
+    select(Appointment)
+    .where(Appointment.doctor_id == bindparam("doctor_id"))
+    .where(Appointment.status != AppointmentStatus.CANCELLED)
+    .where(Appointment.start_at < bindparam("range_end"))
+    .where(Appointment.end_at > bindparam("range_start"))
+)
+
+APPOINTMENTS_IN_RANGE = (
+    select(Appointment.doctor_id, Appointment.start_at, Appointment.end_at)
+    .where(Appointment.status != AppointmentStatus.CANCELLED)
+    .where(Appointment.start_at < bindparam("range_end"))
+    .where(Appointment.end_at > bindparam("range_start"))
+)
+
+ACTIVE_DOCTOR_IDS = select(Doctor.id).where(Doctor.is_active.is_(True)).order_by(Doctor.id)
+
+DOCTOR_OVERLAP_COUNT_FOR_UPDATE = (
+    select(func.count())
+    .select_from(Appointment)
+    .where(Appointment.doctor_id == bindparam("doctor_id"))
+    .where(Appointment.status != AppointmentStatus.CANCELLED)
+    .where(Appointment.start_at < bindparam("range_end"))
+    .where(Appointment.end_at > bindparam("range_start"))
+    .with_for_update()
+)
+
+SLOT_USAGE_COUNT_FOR_UPDATE = (
+    select(func.count())
+    .select_from(AppointmentSlot)
+    .join(Appointment)
+    .where(AppointmentSlot.slot_id == bindparam("slot_id"))
+    .where(AppointmentSlot.slot_date == bindparam("slot_date"))
+    .where(Appointment.status != AppointmentStatus.CANCELLED)
+    .with_for_update()
+)
+
+PATIENT_COMPLETED_COUNT = (
+    select(func.count())
+    .select_from(Appointment)
+    .where(Appointment.patient_id == bindparam("patient_id"))
+    .where(Appointment.status == AppointmentStatus.COMPLETED)
+)
+
+# 보관된 COMPLETED 이력은 라이브 테이블에 없을 때만 확인한다.
+ARCHIVED_PATIENT_COMPLETED = (
+    select(ArchivedAppointment.id)
+    .where(ArchivedAppointment.patient_id == bindparam("patient_id"))
+    .where(ArchivedAppointment.status == AppointmentStatus.COMPLETED)
+    .limit(1)
+)
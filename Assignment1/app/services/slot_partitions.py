@@ -0,0 +1,310 @@
+"""Monthly ``RANGE COLUMNS(slot_date)`` partitions for ``appointment_slots`` (MySQL).
+
+Every booking check and availability read filters ``appointment_slots`` by one
+``slot_date``; with ``idx_appointment_slots_date_slot`` that is an index range
+scan, and with partitioning MySQL additionally prunes to the single month that
+holds the date. Old months can then be removed with ``DROP PARTITION`` instead
+of row-by-row deletes.
+
+Partitioning is opt-in because MySQL does not allow foreign keys on
+partitioned tables: ``enable`` drops the two FKs on ``appointment_slots``, and
+the code paths that relied on their ``ON DELETE CASCADE`` (archiving,
+``replace_hospital_slots``) delete slot rows explicitly.
+
+    python -m Assignment1.app.services.slot_partitions plan --months-ahead 3
+    python -m Assignment1.app.services.slot_partitions enable --months-back 12
+    python -m Assignment1.app.services.slot_partitions maintain --retain-months 12
+
+``maintain`` first archives finished appointments older than the retention
+boundary, then splits the coming months out of ``pmax`` and drops old
+partitions that are now empty. Partitions that still hold rows (e.g. past
+PENDING/CONFIRMED bookings that were never closed) are kept and reported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from typing import Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.services.appointment_archive import archive_appointments
+from Assignment1.app.services.slot_rules import clinic_today
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLE = "appointment_slots"
+MAXVALUE_PARTITION = "pmax"
+
+
+@dataclass(frozen=True)
+class SlotPartition:
+    """One month of ``appointment_slots``; ``upper`` is the exclusive bound."""
+
+    name: str
+    upper: date | None  # None == MAXVALUE
+    has_rows: bool = False
+
+
+@dataclass(frozen=True)
+class MaintenancePlan:
+    create: list[SlotPartition] = field(default_factory=list)
+    drop: list[SlotPartition] = field(default_factory=list)
+    kept: list[SlotPartition] = field(default_factory=list)
+    statements: list[str] = field(default_factory=list)
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def monthly_partitions(first_month: date, last_month: date) -> list[SlotPartition]:
+    """Partitions covering ``first_month`` .. ``last_month`` inclusive (no ``pmax``)."""
+    partitions = []
+    month = month_start(first_month)
+    while month <= month_start(last_month):
+        partitions.append(SlotPartition(f"p{month:%Y%m}", add_months(month, 1)))
+        month = add_months(month, 1)
+    return partitions
+
+
+def _definitions(partitions: Sequence[SlotPartition]) -> str:
+    parts = [
+        f"PARTITION {partition.name} VALUES LESS THAN ('{partition.upper.isoformat()}')"
+        for partition in partitions
+    ]
+    parts.append(f"PARTITION {MAXVALUE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return ",\n    ".join(parts)
+
+
+def enable_statements(
+    partitions: Sequence[SlotPartition], foreign_keys: Sequence[str]
+) -> list[str]:
+    """DDL that turns ``appointment_slots`` into a partitioned table."""
+    statements = [
+        f"ALTER TABLE {PARTITIONED_TABLE} DROP FOREIGN KEY {name}" for name in foreign_keys
+    ]
+    statements.append(
+        f"ALTER TABLE {PARTITIONED_TABLE} PARTITION BY RANGE COLUMNS(slot_date) (\n"
+        f"    {_definitions(partitions)}\n)"
+    )
+    return statements
+
+
+def plan_maintenance(
+    existing: Sequence[SlotPartition],
+    *,
+    today: date,
+    months_ahead: int,
+    retain_months: int,
+) -> MaintenancePlan:
+    """Split months up to ``today + months_ahead`` out of ``pmax``; drop empty expired ones.
+
+    A partition has expired when all of its dates are before the first day of
+    the month ``retain_months`` before ``today``.
+    """
+    bounded = [partition for partition in existing if partition.upper is not None]
+    last_upper = max((partition.upper for partition in bounded), default=month_start(today))
+    create = [
+        partition
+        for partition in monthly_partitions(last_upper, add_months(today, months_ahead))
+        if partition.upper > last_upper
+    ]
+
+    boundary = add_months(month_start(today), -retain_months)
+    expired = [partition for partition in bounded if partition.upper <= boundary]
+    drop = [partition for partition in expired if not partition.has_rows]
+    kept = [partition for partition in expired if partition.has_rows]
+
+    statements = []
+    if create:
+        statements.append(
+            f"ALTER TABLE {PARTITIONED_TABLE} REORGANIZE PARTITION {MAXVALUE_PARTITION} INTO (\n"
+            f"    {_definitions(create)}\n)"
+        )
+    if drop:
+        names = ", ".join(partition.name for partition in drop)
+        statements.append(f"ALTER TABLE {PARTITIONED_TABLE} DROP PARTITION {names}")
+    return MaintenancePlan(create=create, drop=drop, kept=kept, statements=statements)
+
+
+def _require_mysql(conn: AsyncConnection) -> None:
+    if conn.dialect.name not in ("mysql", "mariadb"):
+        raise RuntimeError(f"appointment_slots partitioning needs MySQL, not {conn.dialect.name}")
+
+
+async def load_partitions(conn: AsyncConnection) -> list[SlotPartition]:
+    """Current partitions in order; empty list when the table is not partitioned."""
+    _require_mysql(conn)
+    rows = (
+        await conn.execute(
+            text(
+                "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS"
+                " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+                " AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION"
+            ),
+            {"table": PARTITIONED_TABLE},
+        )
+    ).all()
+    partitions = []
+    for name, description in rows:
+        # TABLE_ROWS 는 추정치라 비어 있는지는 파티션을 직접 확인한다.
+        has_rows = (
+            await conn.scalar(text(f"SELECT 1 FROM {PARTITIONED_TABLE} PARTITION ({name}) LIMIT 1"))
+            is not None
+        )
+        upper = None if description == "MAXVALUE" else date.fromisoformat(description.strip("'"))
+        partitions.append(SlotPartition(name, upper, has_rows))
+    return partitions
+
+
+async def enable_partitioning(
+    engine: AsyncEngine, *, today: date, months_back: int, months_ahead: int, dry_run: bool = False
+) -> list[str]:
+    async with engine.connect() as conn:
+        _require_mysql(conn)
+        if await load_partitions(conn):
+            raise RuntimeError(f"{PARTITIONED_TABLE} is already partitioned")
+        first = await conn.scalar(text(f"SELECT MIN(slot_date) FROM {PARTITIONED_TABLE}"))
+        foreign_keys = (
+            await conn.scalars(
+                text(
+                    "SELECT CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS"
+                    " WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+                ),
+                {"table": PARTITIONED_TABLE},
+            )
+        ).all()
+        earliest = add_months(today, -months_back)
+        partitions = monthly_partitions(
+            min(first, earliest) if first else earliest, add_months(today, months_ahead)
+        )
+        statements = enable_statements(partitions, foreign_keys)
+        if not dry_run:
+            for statement in statements:
+                await conn.execute(text(statement))
+            await conn.commit()
+    return statements
+
+
+async def maintain_partitions(
+    engine: AsyncEngine,
+    *,
+    today: date,
+    months_ahead: int,
+    retain_months: int,
+    archive_batch_size: int = 1000,
+    dry_run: bool = False,
+) -> MaintenancePlan:
+    boundary = add_months(month_start(today), -retain_months)
+    if not dry_run:
+        # 경계 이전의 COMPLETED/CANCELLED 예약을 먼저 옮겨 파티션을 비운다.
+        await archive_appointments(
+            async_sessionmaker(engine, expire_on_commit=False),
+            before=datetime.combine(boundary, time.min),
+            batch_size=archive_batch_size,
+        )
+    async with engine.connect() as conn:
+        existing = await load_partitions(conn)
+        if not existing:
+            raise RuntimeError(f"{PARTITIONED_TABLE} is not partitioned; run enable first")
+        plan = plan_maintenance(
+            existing, today=today, months_ahead=months_ahead, retain_months=retain_months
+        )
+        if not dry_run:
+            for statement in plan.statements:
+                await conn.execute(text(statement))
+            await conn.commit()
+    if plan.kept:
+        logger.warning(
+            "slot_partitions_not_empty",
+            extra={"partitions": [partition.name for partition in plan.kept]},
+        )
+    return plan
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m Assignment1.app.services.slot_partitions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plan = commands.add_parser("plan", help="print the partition DDL for a date range")
+    plan.add_argument("--months-back", type=int, default=12)
+    plan.add_argument("--months-ahead", type=int, default=3)
+
+    enable = commands.add_parser("enable", help="partition appointment_slots (drops its FKs)")
+    enable.add_argument("--months-back", type=int, default=12)
+    enable.add_argument("--months-ahead", type=int, default=3)
+    enable.add_argument("--dry-run", action="store_true")
+
+    maintain = commands.add_parser("maintain", help="add future and drop expired partitions")
+    maintain.add_argument("--months-ahead", type=int, default=3)
+    maintain.add_argument("--retain-months", type=int, default=12)
+    maintain.add_argument("--batch-size", type=int, default=1000)
+    maintain.add_argument("--dry-run", action="store_true")
+
+    for command in (enable, maintain):
+        command.add_argument("--database-url", default=None, help="defaults to the app DSN")
+    return parser
+
+
+async def _run(args: argparse.Namespace, today: date) -> None:
+    engine = create_async_engine(args.database_url or get_settings().sqlalchemy_dsn)
+    try:
+        if args.command == "enable":
+            statements = await enable_partitioning(
+                engine,
+                today=today,
+                months_back=args.months_back,
+                months_ahead=args.months_ahead,
+                dry_run=args.dry_run,
+            )
+            print(";\n".join(statements) + ";")
+            return
+        plan = await maintain_partitions(
+            engine,
+            today=today,
+            months_ahead=args.months_ahead,
+            retain_months=args.retain_months,
+            archive_batch_size=args.batch_size,
+            dry_run=args.dry_run,
+        )
+    finally:
+        await engine.dispose()
+    print(f"created: {', '.join(p.name for p in plan.create) or '-'}")
+    print(f"dropped: {', '.join(p.name for p in plan.drop) or '-'}")
+    if plan.kept:
+        print(f"not empty, kept: {', '.join(p.name for p in plan.kept)}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    today = clinic_today()
+    if args.command == "plan":
+        partitions = monthly_partitions(
+            add_months(today, -args.months_back), add_months(today, args.months_ahead)
+        )
+        print(";\n".join(enable_statements(partitions, [])) + ";")
+        return 0
+    asyncio.run(_run(args, today))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
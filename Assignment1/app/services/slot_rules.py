@@ -1,37 +1,130 @@
+"""Slot arithmetic on integer minute-of-day offsets in the clinic's local time.
+
+Appointments and hospital slots are stored as naive wall-clock times in the
+clinic time zone (``CLINIC_TIMEZONE``). Everything here works on minutes since
+local midnight, so a DST change shifts no slot; aware datetimes are produced
+and consumed only at the API boundary (:func:`to_clinic_aware` /
+:func:`to_clinic_local`). Window layouts are derived once per slot layout and
+duration and reused for every doctor and day.
+"""
+
 from __future__ import annotations
 
-from datetime import datetime, time, timedelta
-from typing import Iterable, List, Tuple
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Annotated, Iterable, List, Mapping, Protocol, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+from pydantic import AfterValidator
+
+from Assignment1.app.core.config import get_settings
+
+SLOT_MINUTES = 30
+STEP_MINUTES = 15
+SLOT_INTERVAL = timedelta(minutes=SLOT_MINUTES)
+RESERVATION_STEP = timedelta(minutes=STEP_MINUTES)
+PUBLIC_WINDOW_MINUTES = 30  # 기본 공개 슬롯은 30분 단위
+MINUTES_PER_DAY = 24 * 60
+# 점심시간에는 병원 슬롯을 둘 수 없다.
+LUNCH_START = time(12, 0)
+LUNCH_END = time(13, 0)
+
+# 분 단위 오프셋 -> time/timedelta 변환표. 루프 안에서 객체를 새로 만들지 않는다.
+_TIMES: Tuple[time, ...] = tuple(time(m // 60, m % 60) for m in range(MINUTES_PER_DAY))
+_OFFSETS: Tuple[timedelta, ...] = tuple(timedelta(minutes=m) for m in range(2 * MINUTES_PER_DAY + 1))
+_MINUTE = timedelta(minutes=1)
+
+MinuteRange = Tuple[int, int]
+
+
+class SlotLike(Protocol):
+    id: int
+    start_time: time
+    end_time: time
+    capacity: int
+
+
+@lru_cache(maxsize=8)
+def _zone(name: str) -> tzinfo:
+    return timezone.utc if name.upper() == "UTC" else ZoneInfo(name)
+
+
+def clinic_zone() -> tzinfo:
+    return _zone(get_settings().clinic_timezone)
+
+
+def to_clinic_local(value: datetime) -> datetime:
+    """Naive clinic wall time for ``value``; naive input is taken as clinic time already."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(clinic_zone()).replace(tzinfo=None)
+
+
+def clinic_today() -> date:
+    """Today's date at the clinic, which can differ from the server's local date."""
+    return to_clinic_local(datetime.now(timezone.utc)).date()
+
+
+def to_clinic_aware(value: datetime) -> datetime:
+    """Attach the clinic zone to a stored wall time (aware input is converted)."""
+    zone = clinic_zone()
+    if value.tzinfo is None:
+        return value.replace(tzinfo=zone)
+    return value.astimezone(zone)
+
+
+# 저장값(병원 현지 시각)을 API 응답에서 시간대가 붙은 값으로 내보낸다.
+ClinicDateTime = Annotated[datetime, AfterValidator(to_clinic_aware)]
 
 
-SLOT_INTERVAL = timedelta(minutes=30)
-RESERVATION_STEP = timedelta(minutes=15)
+def minute_of_day(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _offset(minutes: int) -> timedelta:
+    return _OFFSETS[minutes] if 0 <= minutes < len(_OFFSETS) else timedelta(minutes=minutes)
+
+
+def _midnight(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+@lru_cache(maxsize=32)
+def _slot_windows(open_minute: int, close_minute: int) -> Tuple[Tuple[time, time], ...]:
+    return tuple(
+        (_TIMES[start], _TIMES[(start + SLOT_MINUTES) % MINUTES_PER_DAY])
+        for start in range(open_minute, close_minute, SLOT_MINUTES)
+    )
 
 
 def generate_slot_windows(open_time: time, close_time: time) -> list[tuple[time, time]]:
-    slots: list[tuple[time, time]] = []
-    cursor = datetime.combine(datetime.today(), open_time)
-    boundary = datetime.combine(datetime.today(), close_time)
-    while cursor < boundary:
-        slot_end = cursor + SLOT_INTERVAL
-        slots.append((cursor.time(), slot_end.time()))
-        cursor = slot_end
-    return slots
+    return list(_slot_windows(minute_of_day(open_time), minute_of_day(close_time)))
 
 
-def expand_reservation(start_at: datetime, duration_minutes: int) -> list[tuple[datetime, datetime]]:
-    if duration_minutes % 30 != 0:
+def overlaps_lunch(start_time: time, end_time: time) -> bool:
+    return not (end_time <= LUNCH_START or start_time >= LUNCH_END)
+
+
+@lru_cache(maxsize=256)
+def reservation_minutes(start_minute: int, duration_minutes: int) -> Tuple[MinuteRange, ...]:
+    """30-minute slot ranges covered by a reservation starting at ``start_minute``."""
+    if duration_minutes % SLOT_MINUTES != 0:
         raise ValueError("Duration must align to 30-minute slots")
+    start = start_minute - start_minute % STEP_MINUTES
+    return tuple(
+        (cursor, cursor + SLOT_MINUTES)
+        for cursor in range(start, start + duration_minutes, SLOT_MINUTES)
+    )
+
 
-    slots: list[tuple[datetime, datetime]] = []
-    cursor = start_at.replace(minute=(start_at.minute // 15) * 15, second=0, microsecond=0)
-    remaining = timedelta(minutes=duration_minutes)
-    while remaining > timedelta():
-        slot_end = cursor + SLOT_INTERVAL
-        slots.append((cursor, slot_end))
-        cursor = slot_end
-        remaining -= SLOT_INTERVAL
-    return slots
+def expand_reservation(start_at: datetime, duration_minutes: int) -> list[tuple[datetime, datetime]]:
+    midnight = _midnight(start_at)
+    return [
+        (midnight + _offset(slot_start), midnight + _offset(slot_end))
+        for slot_start, slot_end in reservation_minutes(
+            start_at.hour * 60 + start_at.minute, duration_minutes
+        )
+    ]
 
 
 def iter_slot_keys(
@@ -41,5 +134,75 @@ def iter_slot_keys(
 
 
 def validate_slot_alignment(start_at: datetime) -> None:
-    if start_at.minute % 15 != 0:
+    if start_at.minute % STEP_MINUTES != 0:
         raise ValueError("Reservation must start on a 15-minute boundary")
+
+
+@lru_cache(maxsize=64)
+def window_table(
+    layout: Tuple[MinuteRange, ...], duration_minutes: int
+) -> Tuple[Tuple[int, int, Tuple[int, ...]], ...]:
+    """Bookable ``(start, end, slot indexes)`` windows for a slot layout ordered by start.
+
+    Windows that need a slot missing from ``layout`` are left out, so callers
+    only have to check capacity and the doctor's own bookings.
+    """
+    if not layout:
+        return ()
+    index_by_range = {slot_range: index for index, slot_range in enumerate(layout)}
+    table: list[Tuple[int, int, Tuple[int, ...]]] = []
+    for cursor in range(layout[0][0], layout[-1][1] - duration_minutes + 1, STEP_MINUTES):
+        ranges = reservation_minutes(cursor, duration_minutes)
+        indexes = tuple(index_by_range.get(slot_range, -1) for slot_range in ranges)
+        if -1 not in indexes:
+            table.append((ranges[0][0], ranges[-1][1], indexes))
+    return tuple(table)
+
+
+def _booked_minutes(
+    target_date: date, booked_ranges: Iterable[tuple[datetime, datetime]]
+) -> list[MinuteRange]:
+    midnight = datetime.combine(target_date, time())
+    booked: list[MinuteRange] = []
+    for booked_start, booked_end in booked_ranges:
+        start = to_clinic_local(booked_start) - midnight
+        end = to_clinic_local(booked_end) - midnight
+        # 시작은 내림, 끝은 올림해야 분 단위 비교가 겹침 판정을 넓히기만 한다.
+        booked.append((start // _MINUTE, -(-end // _MINUTE)))
+    return booked
+
+
+def available_windows(
+    target_date: date,
+    slots: Sequence[SlotLike],
+    slot_counts: Mapping[int, int],
+    booked_ranges: Iterable[tuple[datetime, datetime]],
+    duration_minutes: int = PUBLIC_WINDOW_MINUTES,
+) -> list[tuple[datetime, datetime, int]]:
+    """Bookable windows of a doctor's day given hospital slots ordered by start time.
+
+    ``slot_counts`` maps hospital slot id to active reservations on ``target_date`` and
+    ``booked_ranges`` holds the doctor's own active appointments. Results are naive
+    clinic wall times.
+    """
+    if not slots:
+        return []
+    table = window_table(
+        tuple((minute_of_day(slot.start_time), minute_of_day(slot.end_time)) for slot in slots),
+        duration_minutes,
+    )
+    remaining = [slot.capacity - slot_counts.get(slot.id, 0) for slot in slots]
+    booked = _booked_minutes(target_date, booked_ranges)
+    midnight = datetime.combine(target_date, time())
+
+    availability: list[tuple[datetime, datetime, int]] = []
+    for window_start, window_end, indexes in table:
+        min_remaining = min(remaining[index] for index in indexes)
+        if min_remaining <= 0:
+            continue
+        if any(start < window_end and end > window_start for start, end in booked):
+            continue
+        availability.append(
+            (midnight + _OFFSETS[window_start], midnight + _OFFSETS[window_end], min_remaining)
+        )
+    return availability
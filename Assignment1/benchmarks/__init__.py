@@ -0,0 +1,12 @@
+from .dataset import Dataset, seed_dataset
+from .runner import compare_reports, run_scenario, run_suite
+from .scenarios import SCENARIOS
+
+__all__ = [
+    "Dataset",
+    "SCENARIOS",
+    "compare_reports",
+    "run_scenario",
+    "run_suite",
+    "seed_dataset",
+]
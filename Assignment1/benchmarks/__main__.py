@@ -0,0 +1,126 @@
+"""Benchmark CLI.
+
+    python -m Assignment1.benchmarks run --sizes 100 1000 --concurrency 1 8 --output bench.json
+    python -m Assignment1.benchmarks compare baseline.json bench.json
+    python -m Assignment1.benchmarks generate --appointments 1000000 --months 12 --reset
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from Assignment1.app.core.config import get_settings
+from Assignment1.benchmarks.generator import DatasetSpec, generate_dataset
+from Assignment1.benchmarks.runner import DEFAULT_DATABASE_URL, compare_reports, run_suite
+from Assignment1.benchmarks.scenarios import SCENARIOS
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m Assignment1.benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run scenarios and write a JSON report")
+    run.add_argument("--sizes", type=int, nargs="+", default=[1000])
+    run.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    run.add_argument("--requests", type=int, default=200, help="operations per scenario")
+    run.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=None)
+    run.add_argument(
+        "--database-url",
+        default=DEFAULT_DATABASE_URL,
+        help="dropped and recreated per dataset size; use a throwaway database",
+    )
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument(
+        "--booking-queue",
+        choices=["off", "doctor", "day"],
+        default=None,
+        help="override BOOKING_QUEUE_MODE for this run",
+    )
+    run.add_argument("--output", type=Path, default=Path("benchmark-report.json"))
+
+    compare = commands.add_parser("compare", help="print deltas between two reports")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("current", type=Path)
+
+    generate = commands.add_parser("generate", help="bulk-load a synthetic dataset")
+    generate.add_argument("--doctors", type=int, default=200)
+    generate.add_argument("--patients", type=int, default=200_000)
+    generate.add_argument("--treatments", type=int, default=20)
+    generate.add_argument("--appointments", type=int, default=1_000_000)
+    generate.add_argument("--months", type=int, default=12)
+    generate.add_argument("--future-days", type=int, default=30)
+    generate.add_argument("--batch-size", type=int, default=10_000)
+    generate.add_argument("--seed", type=int, default=42)
+    generate.add_argument("--database-url", default=None, help="defaults to the app DSN")
+    generate.add_argument(
+        "--reset", action="store_true", help="drop and recreate all tables first"
+    )
+    return parser
+
+
+async def _generate(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.database_url or get_settings().sqlalchemy_dsn)
+    spec = DatasetSpec.for_months(
+        args.months,
+        future_days=args.future_days,
+        doctors=args.doctors,
+        patients=args.patients,
+        treatments=args.treatments,
+        appointments=args.appointments,
+        seed=args.seed,
+        batch_size=args.batch_size,
+    )
+    try:
+        summary = await generate_dataset(engine, spec, reset=args.reset)
+    finally:
+        await engine.dispose()
+    print(
+        f"{summary.appointments} appointments ({summary.appointment_slots} slot rows), "
+        f"{summary.doctors} doctors, {summary.patients} patients, "
+        f"{summary.treatments} treatments in {summary.elapsed_s:.1f}s "
+        f"({summary.appointments_per_second:.0f} appointments/s)"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.command == "compare":
+        baseline = json.loads(args.baseline.read_text())
+        current = json.loads(args.current.read_text())
+        print("\n".join(compare_reports(baseline, current)))
+        return 0
+    if args.command == "generate":
+        asyncio.run(_generate(args))
+        return 0
+
+    report = asyncio.run(
+        run_suite(
+            sizes=args.sizes,
+            concurrencies=args.concurrency,
+            requests=args.requests,
+            scenarios=args.scenarios,
+            database_url=args.database_url,
+            seed=args.seed,
+            booking_queue_mode=args.booking_queue,
+        )
+    )
+    args.output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    for key, result in report["results"].items():
+        latency = result["latency_ms"]
+        print(
+            f"{key}: {result['throughput_ops_s']:.1f} ops/s, "
+            f"p50 {latency['p50']:.2f} / p95 {latency['p95']:.2f} / p99 {latency['p99']:.2f} ms, "
+            f"{result['queries_per_op']['mean']:.1f} queries/op, errors {result['errors']}"
+        )
+    print(f"report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
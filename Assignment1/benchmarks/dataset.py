@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import date, time, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from Assignment1.benchmarks.generator import DatasetSpec, generate_dataset
+
+SEEDED_DAYS = 14
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Ids and calendar layout of a seeded benchmark database."""
+
+    size: int
+    doctor_ids: list[int]
+    patient_ids: list[int]
+    treatment_id: int
+    windows: list[tuple[time, time]]
+    first_day: date
+    seeded_days: int
+    write_day_offset: int = 0
+
+    @property
+    def free_day(self) -> date:
+        """First day with no seeded appointments; write scenarios book from here on."""
+        return self.first_day + timedelta(days=self.seeded_days + self.write_day_offset)
+
+    def shifted(self, days: int) -> Dataset:
+        return replace(self, write_day_offset=self.write_day_offset + days)
+
+    def seeded_day(self, index: int) -> date:
+        return self.first_day + timedelta(days=index % self.seeded_days)
+
+
+async def seed_dataset(
+    engine: AsyncEngine,
+    size: int,
+    *,
+    seed: int = 42,
+    first_day: date | None = None,
+) -> Dataset:
+    """Recreate the schema and seed ``size`` upcoming appointments for the scenarios."""
+    first_day = first_day or date.today() + timedelta(days=1)
+    summary = await generate_dataset(
+        engine,
+        DatasetSpec(
+            doctors=max(2, -(-size // 100)),
+            patients=max(10, size // 2),
+            treatments=3,
+            appointments=size,
+            start_date=first_day,
+            days=SEEDED_DAYS,
+            seed=seed,
+        ),
+        reset=True,
+    )
+    return Dataset(
+        size=size,
+        doctor_ids=list(range(1, summary.doctors + 1)),
+        patient_ids=list(range(1, summary.patients + 1)),
+        # generate_dataset는 항상 1번 시술을 30분짜리로 만든다.
+        treatment_id=1,
+        windows=summary.windows,
+        first_day=first_day,
+        seeded_days=SEEDED_DAYS,
+    )
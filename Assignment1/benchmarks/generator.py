@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from time import perf_counter
+from typing import Iterator
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from Assignment1.app.db import (
+    Appointment,
+    AppointmentSlot,
+    AppointmentStatus,
+    Base,
+    Doctor,
+    HospitalSlot,
+    Patient,
+    Treatment,
+    VisitType,
+)
+from Assignment1.app.services.slot_rules import generate_slot_windows, overlaps_lunch
+
+OPEN_TIME = time(9, 0)
+CLOSE_TIME = time(18, 0)
+DEPARTMENTS = ("Dermatology", "Cosmetic", "Laser", "Allergy", "Pediatric Dermatology")
+# 시술 길이는 30분 단위 슬롯 개수로 표현한다. 첫 시술은 항상 30분짜리다.
+TREATMENT_SLOT_WEIGHTS = {1: 6, 2: 3, 3: 1}
+PAST_STATUS_MIX = {
+    AppointmentStatus.COMPLETED: 80,
+    AppointmentStatus.CANCELLED: 15,
+    AppointmentStatus.CONFIRMED: 5,
+}
+FUTURE_STATUS_MIX = {
+    AppointmentStatus.PENDING: 55,
+    AppointmentStatus.CONFIRMED: 35,
+    AppointmentStatus.CANCELLED: 10,
+}
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    doctors: int
+    patients: int
+    treatments: int
+    appointments: int
+    start_date: date
+    days: int
+    today: date = field(default_factory=date.today)
+    seed: int = 42
+    batch_size: int = 10_000
+
+    @classmethod
+    def for_months(cls, months: int, *, future_days: int = 30, **kwargs) -> DatasetSpec:
+        """History that ends ``future_days`` after today, ``months`` long in total."""
+        today = kwargs.pop("today", date.today())
+        days = months * 30
+        return cls(
+            start_date=today - timedelta(days=days - future_days),
+            days=days,
+            today=today,
+            **kwargs,
+        )
+
+
+@dataclass
+class GenerationSummary:
+    doctors: int = 0
+    patients: int = 0
+    treatments: int = 0
+    hospital_slots: int = 0
+    appointments: int = 0
+    appointment_slots: int = 0
+    elapsed_s: float = 0.0
+    windows: list[tuple[time, time]] = field(default_factory=list)
+
+    @property
+    def appointments_per_second(self) -> float:
+        return self.appointments / self.elapsed_s if self.elapsed_s else 0.0
+
+
+class _Batcher:
+    """Buffers rows per table and flushes them as executemany inserts."""
+
+    def __init__(self, conn: AsyncConnection, batch_size: int) -> None:
+        self.conn = conn
+        self.batch_size = batch_size
+        self._buffers: dict[object, list[dict]] = {}
+        self._pending = 0
+
+    async def add(self, table, row: dict) -> None:
+        self._buffers.setdefault(table, []).append(row)
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        # 부모 테이블이 먼저 들어가도록 등록 순서대로 비운다.
+        for table, rows in self._buffers.items():
+            if rows:
+                await self.conn.execute(insert(table), rows)
+                rows.clear()
+        self._pending = 0
+        await self.conn.commit()
+
+
+def _weighted(rng: random.Random, mix: dict) -> Iterator:
+    population, weights = list(mix), list(mix.values())
+    while True:
+        yield from rng.choices(population, weights, k=1024)
+
+
+def _split_quota(rng: random.Random, total: int, buckets: int) -> list[int]:
+    base, remainder = divmod(total, buckets)
+    quota = [base] * buckets
+    for index in rng.sample(range(buckets), remainder):
+        quota[index] += 1
+    return quota
+
+
+def _place_block(
+    rng: random.Random, count: int, durations: list[int], windows: int
+) -> list[tuple[int, int]]:
+    """Pick ``count`` non-overlapping (first_window, length) placements in a run of windows."""
+    lengths = [rng.choice(durations) for _ in range(count)]
+    while sum(lengths) > windows:
+        lengths[lengths.index(max(lengths))] = 1
+    free = windows - sum(lengths)
+    # 남는 슬롯을 count+1개의 빈 구간으로 무작위 분배한다.
+    cuts = sorted(rng.randint(0, free) for _ in range(count))
+    placements: list[tuple[int, int]] = []
+    cursor = 0
+    previous_cut = 0
+    for length, cut in zip(lengths, cuts):
+        cursor += cut - previous_cut
+        previous_cut = cut
+        placements.append((cursor, length))
+        cursor += length
+    return placements
+
+
+def _place_day(
+    rng: random.Random, count: int, durations: list[int], blocks: list[int]
+) -> list[tuple[int, int]]:
+    """Placements for a doctor's day made of contiguous ``blocks`` (morning, afternoon).
+
+    The count is shared out by block size, so no appointment spans the lunch break.
+    """
+    placements: list[tuple[int, int]] = []
+    offset = 0
+    remaining = count
+    for index, size in enumerate(blocks):
+        rest = sum(blocks[index + 1 :])
+        share = min(size, remaining, round(remaining * size / (size + rest)))
+        share = max(share, remaining - rest)
+        placements += [
+            (offset + first, length) for first, length in _place_block(rng, share, durations, size)
+        ]
+        offset += size
+        remaining -= share
+    return placements
+
+
+def _blocks(windows: list[tuple[time, time]]) -> list[int]:
+    """Sizes of the runs of back-to-back windows."""
+    blocks = [1]
+    for previous, window in zip(windows, windows[1:]):
+        if previous[1] == window[0]:
+            blocks[-1] += 1
+        else:
+            blocks.append(1)
+    return blocks
+
+
+async def _ensure_empty(conn: AsyncConnection) -> None:
+    for model in (Doctor, Patient, Treatment, HospitalSlot, Appointment):
+        if await conn.scalar(select(func.count()).select_from(model)):
+            raise ValueError(
+                f"{model.__tablename__} already has rows; generate into an empty schema "
+                "or pass reset=True"
+            )
+
+
+async def generate_dataset(
+    engine: AsyncEngine, spec: DatasetSpec, *, reset: bool = False
+) -> GenerationSummary:
+    """Bulk-create doctors, patients, treatments, hospital slots and appointments.
+
+    Rows are produced day by day and written in ``spec.batch_size`` executemany
+    batches, so memory stays flat regardless of the appointment count. Each
+    doctor's day is laid out without overlaps and every appointment gets one
+    ``AppointmentSlot`` row per 30-minute window it covers.
+    """
+    # 관리자 API가 거부하는 점심시간 슬롯은 만들지 않는다.
+    windows = [
+        window
+        for window in generate_slot_windows(OPEN_TIME, CLOSE_TIME)
+        if not overlaps_lunch(*window)
+    ]
+    blocks = _blocks(windows)
+    capacity = spec.doctors * spec.days * len(windows)
+    if spec.appointments > capacity:
+        raise ValueError(
+            f"{spec.appointments} appointments do not fit {spec.doctors} doctors "
+            f"over {spec.days} days ({capacity} slots)"
+        )
+    if spec.treatments < 1 or spec.doctors < 1 or spec.patients < 1:
+        raise ValueError("doctors, patients and treatments must be positive")
+
+    rng = random.Random(spec.seed)
+    summary = GenerationSummary(windows=windows)
+    started = perf_counter()
+
+    async with engine.connect() as conn:
+        if reset:
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.commit()
+        await _ensure_empty(conn)
+        batcher = _Batcher(conn, spec.batch_size)
+
+        for doctor_id in range(1, spec.doctors + 1):
+            await batcher.add(
+                Doctor,
+                {
+                    "id": doctor_id,
+                    "name": f"Doctor {doctor_id:06d}",
+                    "department": DEPARTMENTS[doctor_id % len(DEPARTMENTS)],
+                },
+            )
+        treatment_lengths: dict[int, int] = {}
+        for treatment_id in range(1, spec.treatments + 1):
+            length = 1 if treatment_id == 1 else rng.choices(
+                list(TREATMENT_SLOT_WEIGHTS), list(TREATMENT_SLOT_WEIGHTS.values())
+            )[0]
+            treatment_lengths[treatment_id] = length
+            await batcher.add(
+                Treatment,
+                {
+                    "id": treatment_id,
+                    "name": f"Treatment {treatment_id:04d}",
+                    "duration_minutes": length * 30,
+                    "price": 30000 + 10000 * rng.randint(0, 20),
+                },
+            )
+        for slot_id, (start, end) in enumerate(windows, start=1):
+            await batcher.add(
+                HospitalSlot,
+                # 의사별 일정이 겹치지 않으므로 슬롯당 최대 동시 예약 수는 의사 수다.
+                {"id": slot_id, "start_time": start, "end_time": end, "capacity": spec.doctors},
+            )
+        for patient_id in range(1, spec.patients + 1):
+            await batcher.add(
+                Patient,
+                {
+                    "id": patient_id,
+                    "name": f"Patient {patient_id}",
+                    "phone": f"019-{patient_id // 10000:04d}-{patient_id % 10000:04d}",
+                },
+            )
+        await batcher.flush()
+
+        by_length: dict[int, list[int]] = {}
+        for treatment_id, length in treatment_lengths.items():
+            by_length.setdefault(length, []).append(treatment_id)
+        lengths = [length for length, ids in by_length.items() for _ in ids]
+        past_statuses = _weighted(rng, PAST_STATUS_MIX)
+        future_statuses = _weighted(rng, FUTURE_STATUS_MIX)
+        # 단골 환자 20%가 예약의 80%를 차지하도록 치우친 분포를 쓴다.
+        regulars = max(1, spec.patients // 5)
+        seen_completed: set[int] = set()
+
+        appointment_id = 0
+        quotas = _split_quota(rng, spec.appointments, spec.days * spec.doctors)
+        for day_index in range(spec.days):
+            slot_date = spec.start_date + timedelta(days=day_index)
+            statuses = past_statuses if slot_date < spec.today else future_statuses
+            for doctor_index in range(spec.doctors):
+                quota = quotas[day_index * spec.doctors + doctor_index]
+                if not quota:
+                    continue
+                for first_window, length in _place_day(rng, quota, lengths, blocks):
+                    appointment_id += 1
+                    if rng.random() < 0.8:
+                        patient_id = rng.randint(1, regulars)
+                    else:
+                        patient_id = rng.randint(1, spec.patients)
+                    status = next(statuses)
+                    await batcher.add(
+                        Appointment,
+                        {
+                            "id": appointment_id,
+                            "patient_id": patient_id,
+                            "doctor_id": doctor_index + 1,
+                            "treatment_id": rng.choice(by_length[length]),
+                            "start_at": datetime.combine(slot_date, windows[first_window][0]),
+                            "end_at": datetime.combine(
+                                slot_date, windows[first_window + length - 1][1]
+                            ),
+                            "status": status,
+                            "visit_type": (
+                                VisitType.FOLLOW_UP
+                                if patient_id in seen_completed
+                                else VisitType.FIRST
+                            ),
+                        },
+                    )
+                    if status == AppointmentStatus.COMPLETED:
+                        seen_completed.add(patient_id)
+                    for window in range(first_window, first_window + length):
+                        await batcher.add(
+                            AppointmentSlot,
+                            {
+                                "appointment_id": appointment_id,
+                                "slot_id": window + 1,
+                                "slot_date": slot_date,
+                            },
+                        )
+                        summary.appointment_slots += 1
+        await batcher.flush()
+
+    summary.doctors = spec.doctors
+    summary.patients = spec.patients
+    summary.treatments = spec.treatments
+    summary.hospital_slots = len(windows)
+    summary.appointments = appointment_id
+    summary.elapsed_s = perf_counter() - started
+    return summary
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import platform
+import re
+import subprocess
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from itertools import count
+from time import perf_counter
+from typing import Iterable, Sequence
+
+import sqlalchemy
+from httpx import ASGITransport, AsyncClient, Response
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.db.session import SessionRouter, get_session_router
+from Assignment1.app.services.catalog_cache import catalog_cache
+from Assignment1.app.services.hospital_schedule import schedule_cache
+from Assignment1.app.services.known_full import known_full_cache
+from Assignment1.benchmarks.dataset import seed_dataset
+from Assignment1.benchmarks.scenarios import SCENARIOS, WRITE_DAYS_PER_RUN, ScenarioContext
+from Assignment1.main_admin import create_app as create_admin_app
+from Assignment1.main_patient import create_app as create_patient_app
+
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+SERVER_TIMING_QUERY_COUNT = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def query_count(response: Response) -> int:
+    match = SERVER_TIMING_QUERY_COUNT.search(response.headers.get("server-timing", ""))
+    return int(match.group(1)) if match else 0
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    dataset_size: int
+    concurrency: int
+    ops: int
+    errors: int
+    duration_s: float
+    throughput_ops_s: float
+    latency_ms: dict[str, float]
+    queries_per_op: dict[str, float]
+    statuses: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"{self.scenario}[size={self.dataset_size},concurrency={self.concurrency}]"
+
+
+def summarize(
+    scenario: str,
+    *,
+    dataset_size: int,
+    concurrency: int,
+    duration: float,
+    latencies: list[float],
+    queries: list[int],
+    statuses: Counter,
+    errors: int,
+) -> ScenarioResult:
+    latencies = sorted(latencies)
+    ops = len(latencies)
+    return ScenarioResult(
+        scenario=scenario,
+        dataset_size=dataset_size,
+        concurrency=concurrency,
+        ops=ops,
+        errors=errors,
+        duration_s=round(duration, 4),
+        throughput_ops_s=round(ops / duration, 2) if duration else 0.0,
+        latency_ms={
+            "mean": round(sum(latencies) / ops * 1000, 3) if ops else 0.0,
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if ops else 0.0,
+        },
+        queries_per_op={
+            "mean": round(sum(queries) / ops, 2) if ops else 0.0,
+            "max": max(queries, default=0),
+        },
+        statuses={str(code): statuses[code] for code in sorted(statuses)},
+    )
+
+
+async def run_scenario(
+    name: str,
+    ctx: ScenarioContext,
+    *,
+    requests: int,
+) -> ScenarioResult:
+    scenario = SCENARIOS[name]
+    latencies: list[float] = []
+    queries: list[int] = []
+    statuses: Counter = Counter()
+    errors = 0
+    indices = count()
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in indices:
+            if index >= requests:
+                return
+            start = perf_counter()
+            responses = await scenario.op(ctx, index)
+            latencies.append(perf_counter() - start)
+            queries.append(sum(query_count(resp) for resp in responses))
+            for resp in responses:
+                statuses[resp.status_code] += 1
+                if resp.status_code not in scenario.expected_statuses:
+                    errors += 1
+
+    started = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(ctx.concurrency)))
+    return summarize(
+        name,
+        dataset_size=ctx.dataset.size,
+        concurrency=ctx.concurrency,
+        duration=perf_counter() - started,
+        latencies=latencies,
+        queries=queries,
+        statuses=statuses,
+        errors=errors,
+    )
+
+
+def _create_engine(database_url: str) -> AsyncEngine:
+    if database_url.startswith("sqlite") and ":memory:" in database_url:
+        return create_async_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    return create_async_engine(database_url, pool_pre_ping=True)
+
+
+async def run_suite(
+    *,
+    sizes: Iterable[int],
+    concurrencies: Iterable[int],
+    requests: int,
+    scenarios: Iterable[str] | None = None,
+    database_url: str = DEFAULT_DATABASE_URL,
+    seed: int = 42,
+    booking_queue_mode: str | None = None,
+) -> dict:
+    """Run every scenario for each dataset size and concurrency level.
+
+    The database at ``database_url`` is dropped and recreated per dataset size,
+    so point it at a throwaway schema. ``booking_queue_mode`` overrides the
+    ``BOOKING_QUEUE_MODE`` setting for the duration of the run.
+    """
+    names = list(scenarios or SCENARIOS)
+    unknown = sorted(set(names) - set(SCENARIOS))
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(unknown)}")
+    concurrencies = list(concurrencies)
+    settings = get_settings()
+    previous_queue_mode = settings.booking_queue_mode
+    if booking_queue_mode is not None:
+        settings.booking_queue_mode = booking_queue_mode
+    try:
+        results, dialect = await _run_sizes(
+            sizes, concurrencies, requests, names, database_url, seed
+        )
+    finally:
+        settings.booking_queue_mode = previous_queue_mode
+
+    return {
+        "meta": {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "dialect": dialect,
+            "booking_queue_mode": booking_queue_mode or previous_queue_mode,
+            "requests_per_scenario": requests,
+            "seed": seed,
+        },
+        "results": {result.key: asdict(result) for result in results},
+    }
+
+
+async def _run_sizes(
+    sizes: Iterable[int],
+    concurrencies: list[int],
+    requests: int,
+    names: list[str],
+    database_url: str,
+    seed: int,
+) -> tuple[list[ScenarioResult], str]:
+
+    results: list[ScenarioResult] = []
+    dialect = ""
+    for size in sizes:
+        engine = _create_engine(database_url)
+        dialect = engine.dialect.name
+        try:
+            dataset = await seed_dataset(engine, size, seed=seed)
+            # 스키마를 새로 만들었으므로 이전 데이터셋에서 쌓인 캐시는 무효다.
+            known_full_cache.release()
+            schedule_cache.clear()
+            catalog_cache.clear()
+            factory = async_sessionmaker(engine, expire_on_commit=False)
+            router = SessionRouter(factory)
+            patient_app = create_patient_app()
+            admin_app = create_admin_app()
+            for app in (patient_app, admin_app):
+                app.dependency_overrides[get_session_router] = lambda: router
+
+            # 500 응답도 오류로 집계해야 하므로 앱 예외를 다시 던지지 않는다.
+            async with AsyncClient(
+                transport=ASGITransport(app=patient_app, raise_app_exceptions=False),
+                base_url="http://patient",
+            ) as patient, AsyncClient(
+                transport=ASGITransport(app=admin_app, raise_app_exceptions=False),
+                base_url="http://admin",
+            ) as admin:
+                await patient.get("/api/v1/patient/doctors")
+                await admin.get("/api/v1/admin/hospital-slots")
+                for concurrency in concurrencies:
+                    ctx = ScenarioContext(
+                        patient=patient,
+                        admin=admin,
+                        dataset=dataset,
+                        concurrency=concurrency,
+                    )
+                    for name in names:
+                        results.append(await run_scenario(name, ctx, requests=requests))
+                    # 다음 동시성 단계가 같은 시간대를 다시 예약하지 않도록 날짜를 민다.
+                    dataset = dataset.shifted(WRITE_DAYS_PER_RUN)
+        finally:
+            await engine.dispose()
+    return results, dialect
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_reports(baseline: dict, current: dict) -> list[str]:
+    """Human-readable p95/throughput/query deltas for results present in both reports."""
+    lines: list[str] = []
+    for key, new in current["results"].items():
+        old = baseline["results"].get(key)
+        if old is None:
+            lines.append(f"{key}: new")
+            continue
+        lines.append(
+            f"{key}: p95 {old['latency_ms']['p95']:.2f} -> {new['latency_ms']['p95']:.2f} ms, "
+            f"throughput {old['throughput_ops_s']:.1f} -> {new['throughput_ops_s']:.1f} ops/s, "
+            f"queries/op {old['queries_per_op']['mean']:.1f} -> {new['queries_per_op']['mean']:.1f}"
+        )
+    return lines
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+from httpx import AsyncClient, Response
+
+from Assignment1.benchmarks.dataset import Dataset
+
+# Write scenarios claim days after the seeded range; each gets its own block of days.
+SCENARIO_DAY_SPAN = 365
+WRITE_DAYS_PER_RUN = 3 * SCENARIO_DAY_SPAN
+
+
+@dataclass
+class ScenarioContext:
+    patient: AsyncClient
+    admin: AsyncClient
+    dataset: Dataset
+    concurrency: int
+
+
+ScenarioOp = Callable[[ScenarioContext, int], Awaitable[list[Response]]]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    op: ScenarioOp
+    # 이 상태 코드 외의 응답은 리포트에서 오류로 집계한다.
+    expected_statuses: frozenset[int] = frozenset({200})
+
+
+def _booking_payload(ctx: ScenarioContext, index: int, doctor_id: int, start_at: datetime) -> dict:
+    patients = ctx.dataset.patient_ids
+    return {
+        "patient_id": patients[index % len(patients)],
+        "doctor_id": doctor_id,
+        "treatment_id": ctx.dataset.treatment_id,
+        "start_at": start_at.isoformat(),
+    }
+
+
+def _write_target(ctx: ScenarioContext, key: int, *, doctors: list[int], day_offset: int) -> tuple[int, datetime]:
+    """Map a key to a distinct (doctor, start_at) on days after the seeded range."""
+    windows = ctx.dataset.windows
+    doctor_id = doctors[key % len(doctors)]
+    window = (key // len(doctors)) % len(windows)
+    day = ctx.dataset.free_day + timedelta(days=day_offset + key // (len(doctors) * len(windows)))
+    return doctor_id, datetime.combine(day, windows[window][0])
+
+
+async def availability_read(ctx: ScenarioContext, index: int) -> list[Response]:
+    doctors = ctx.dataset.doctor_ids
+    resp = await ctx.patient.get(
+        "/api/v1/patient/availability",
+        params={
+            "doctor_id": doctors[index % len(doctors)],
+            "date": ctx.dataset.seeded_day(index).isoformat(),
+        },
+    )
+    return [resp]
+
+
+async def booking_contention(ctx: ScenarioContext, index: int) -> list[Response]:
+    # 동시 실행되는 요청 묶음이 같은 의사·시간대를 두고 경쟁한다.
+    hot_doctors = ctx.dataset.doctor_ids[:2]
+    doctor_id, start_at = _write_target(
+        ctx, index // ctx.concurrency, doctors=hot_doctors, day_offset=0
+    )
+    resp = await ctx.patient.post(
+        "/api/v1/patient/appointments",
+        json=_booking_payload(ctx, index, doctor_id, start_at),
+    )
+    return [resp]
+
+
+async def hot_slot_rush(ctx: ScenarioContext, index: int) -> list[Response]:
+    # 러시아워처럼 대부분의 요청이 이미 찬 소수의 인기 시간대로 몰린다.
+    hot_doctors = ctx.dataset.doctor_ids[:2]
+    hot_windows = ctx.dataset.windows[:2]
+    doctor_id = hot_doctors[index % len(hot_doctors)]
+    window = hot_windows[(index // len(hot_doctors)) % len(hot_windows)]
+    day = ctx.dataset.free_day + timedelta(days=2 * SCENARIO_DAY_SPAN)
+    resp = await ctx.patient.post(
+        "/api/v1/patient/appointments",
+        json=_booking_payload(ctx, index, doctor_id, datetime.combine(day, window[0])),
+    )
+    return [resp]
+
+
+async def cancellation_churn(ctx: ScenarioContext, index: int) -> list[Response]:
+    doctor_id, start_at = _write_target(
+        ctx, index, doctors=ctx.dataset.doctor_ids, day_offset=SCENARIO_DAY_SPAN
+    )
+    payload = _booking_payload(ctx, index, doctor_id, start_at)
+    booked = await ctx.patient.post("/api/v1/patient/appointments", json=payload)
+    if booked.status_code != 201:
+        return [booked]
+    cancelled = await ctx.patient.post(
+        f"/api/v1/patient/appointments/{booked.json()['id']}/cancel",
+        params={"patient_id": payload["patient_id"]},
+    )
+    return [booked, cancelled]
+
+
+async def admin_listing(ctx: ScenarioContext, index: int) -> list[Response]:
+    doctors = ctx.dataset.doctor_ids
+    filters = [
+        {"date": ctx.dataset.seeded_day(index).isoformat()},
+        {"doctor_id": doctors[index % len(doctors)]},
+        {"status": "PENDING", "date": ctx.dataset.seeded_day(index).isoformat()},
+    ]
+    resp = await ctx.admin.get("/api/v1/admin/appointments", params=filters[index % len(filters)])
+    return [resp]
+
+
+async def admin_stats(ctx: ScenarioContext, index: int) -> list[Response]:
+    return [await ctx.admin.get("/api/v1/admin/stats/summary")]
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("availability_read", availability_read),
+        Scenario("booking_contention", booking_contention, frozenset({201, 409})),
+        Scenario("hot_slot_rush", hot_slot_rush, frozenset({201, 409})),
+        Scenario("cancellation_churn", cancellation_churn, frozenset({200, 201})),
+        Scenario("admin_listing", admin_listing),
+        Scenario("admin_stats", admin_stats),
+    )
+}
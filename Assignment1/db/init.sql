@@ -5,6 +5,14 @@
 SET NAMES utf8mb4;
 SET time_zone = '+00:00';
 
+DROP TABLE IF EXISTS idempotency_keys;
+DROP TABLE IF EXISTS outbox_dead_letters;
+DROP TABLE IF EXISTS outbox_gaps;
+DROP TABLE IF EXISTS outbox_events;
+DROP TABLE IF EXISTS hospital_slot_overrides;
+DROP TABLE IF EXISTS hospital_slot_templates;
+DROP TABLE IF EXISTS appointment_slots_archive;
+DROP TABLE IF EXISTS appointments_archive;
 DROP TABLE IF EXISTS appointment_slots;
 DROP TABLE IF EXISTS appointments;
 DROP TABLE IF EXISTS system_configs;
@@ -73,7 +81,8 @@ CREATE TABLE appointments (
     CONSTRAINT uq_doctor_start_at UNIQUE (doctor_id, start_at),
     CONSTRAINT fk_appt_patient FOREIGN KEY (patient_id) REFERENCES patients(id),
     CONSTRAINT fk_appt_doctor FOREIGN KEY (doctor_id) REFERENCES doctors(id),
-    CONSTRAINT fk_appt_treatment FOREIGN KEY (treatment_id) REFERENCES treatments(id)
+    CONSTRAINT fk_appt_treatment FOREIGN KEY (treatment_id) REFERENCES treatments(id),
+    INDEX idx_appointments_status_end_at (status, end_at, id)
 );
 
 CREATE TABLE appointment_slots (
@@ -82,7 +91,37 @@ CREATE TABLE appointment_slots (
     slot_date      DATE NOT NULL,
     PRIMARY KEY (appointment_id, slot_id, slot_date),
     CONSTRAINT fk_apptslot_appt FOREIGN KEY (appointment_id) REFERENCES appointments(id) ON DELETE CASCADE,
-    CONSTRAINT fk_apptslot_slot FOREIGN KEY (slot_id) REFERENCES hospital_slots(id) ON DELETE CASCADE
+    CONSTRAINT fk_apptslot_slot FOREIGN KEY (slot_id) REFERENCES hospital_slots(id) ON DELETE CASCADE,
+    INDEX idx_appointment_slots_date_slot (slot_date, slot_id)
+);
+
+-- 보관 기간이 지난 COMPLETED/CANCELLED 예약 (id 는 원본 그대로)
+CREATE TABLE appointments_archive (
+    id           BIGINT PRIMARY KEY,
+    patient_id   BIGINT NOT NULL,
+    doctor_id    BIGINT NOT NULL,
+    treatment_id BIGINT NOT NULL,
+    start_at     DATETIME NOT NULL,
+    end_at       DATETIME NOT NULL,
+    status       ENUM('PENDING','CONFIRMED','COMPLETED','CANCELLED') NOT NULL,
+    visit_type   ENUM('FIRST','FOLLOW_UP') NOT NULL,
+    memo         TEXT NULL,
+    created_at   TIMESTAMP NOT NULL,
+    updated_at   TIMESTAMP NOT NULL,
+    archived_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_appt_archive_patient FOREIGN KEY (patient_id) REFERENCES patients(id),
+    CONSTRAINT fk_appt_archive_doctor FOREIGN KEY (doctor_id) REFERENCES doctors(id),
+    CONSTRAINT fk_appt_archive_treatment FOREIGN KEY (treatment_id) REFERENCES treatments(id),
+    INDEX idx_appointments_archive_patient_status (patient_id, status),
+    INDEX idx_appointments_archive_start_at (start_at)
+);
+
+CREATE TABLE appointment_slots_archive (
+    appointment_id BIGINT NOT NULL,
+    slot_id        BIGINT NOT NULL,
+    slot_date      DATE NOT NULL,
+    PRIMARY KEY (appointment_id, slot_id, slot_date),
+    CONSTRAINT fk_apptslot_archive_appt FOREIGN KEY (appointment_id) REFERENCES appointments_archive(id) ON DELETE CASCADE
 );
 
 CREATE TABLE system_configs (
@@ -95,6 +134,73 @@ CREATE TABLE system_configs (
     CONSTRAINT uq_system_config_key UNIQUE (`key`)
 );
 
+CREATE TABLE hospital_slot_templates (
+    id         BIGINT PRIMARY KEY AUTO_INCREMENT,
+    weekday    SMALLINT NOT NULL,
+    slot_id    BIGINT NOT NULL,
+    capacity   SMALLINT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    CONSTRAINT uq_slot_template_weekday_slot UNIQUE (weekday, slot_id),
+    CONSTRAINT ck_slot_template_weekday CHECK (weekday BETWEEN 0 AND 6),
+    CONSTRAINT ck_slot_template_capacity CHECK (capacity >= 0),
+    CONSTRAINT fk_slot_template_slot FOREIGN KEY (slot_id) REFERENCES hospital_slots(id) ON DELETE CASCADE
+);
+
+CREATE TABLE hospital_slot_overrides (
+    id            BIGINT PRIMARY KEY AUTO_INCREMENT,
+    override_date DATE NOT NULL,
+    slot_id       BIGINT NULL,
+    capacity      SMALLINT NOT NULL,
+    note          VARCHAR(255) NULL,
+    created_at    TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at    TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    CONSTRAINT ck_slot_override_capacity CHECK (capacity >= 0),
+    CONSTRAINT fk_slot_override_slot FOREIGN KEY (slot_id) REFERENCES hospital_slots(id) ON DELETE CASCADE,
+    INDEX idx_slot_overrides_date_slot (override_date, slot_id)
+);
+
+CREATE TABLE outbox_events (
+    id           BIGINT PRIMARY KEY AUTO_INCREMENT,
+    event_type   VARCHAR(50) NOT NULL,
+    aggregate_id BIGINT NOT NULL,
+    payload      JSON NOT NULL,
+    created_at   DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_outbox_events_created_at (created_at)
+);
+
+CREATE TABLE outbox_gaps (
+    consumer   VARCHAR(100) NOT NULL,
+    event_id   BIGINT NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (consumer, event_id)
+);
+
+CREATE TABLE outbox_dead_letters (
+    consumer         VARCHAR(100) NOT NULL,
+    event_id         BIGINT NOT NULL,
+    event_type       VARCHAR(50) NOT NULL,
+    aggregate_id     BIGINT NOT NULL,
+    payload          JSON NOT NULL,
+    attempts         INT NOT NULL,
+    event_created_at DATETIME NOT NULL,
+    created_at       DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (consumer, event_id)
+);
+
+CREATE TABLE idempotency_keys (
+    id            BIGINT PRIMARY KEY AUTO_INCREMENT,
+    scope         VARCHAR(100) NOT NULL,
+    `key`         VARCHAR(100) NOT NULL,
+    request_hash  VARCHAR(64) NOT NULL,
+    status_code   INT NULL,
+    response_body JSON NULL,
+    created_at    DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at    DATETIME NOT NULL,
+    CONSTRAINT uq_idempotency_scope_key UNIQUE (scope, `key`),
+    INDEX idx_idempotency_keys_expires_at (expires_at)
+);
+
 -- Sample data ---------------------------------------------------------------
 
 INSERT INTO doctors (id, name, department, is_active)
@@ -2,21 +2,42 @@ from __future__ import annotations
 
 from fastapi import FastAPI
 
+from Assignment1.app.core.background import worker_lifespan
+from Assignment1.app.core.config import get_settings
 from Assignment1.app.core.exceptions import register_exception_handlers
+from Assignment1.app.core.metrics import install_metrics
+from Assignment1.app.core.query_stats import QueryStatsMiddleware
+from Assignment1.app.db.session import session_router
 from Assignment1.app.routers.admin import (
     appointments as admin_appointments_router,
     catalog as admin_catalog_router,
     hospital_slots as admin_hospital_slots_router,
     stats as admin_stats_router,
 )
+from Assignment1.app.services.admin_appointments import rollup_appointment_event
+from Assignment1.app.services.appointment_archive import build_archive_worker
+from Assignment1.app.services.appointment_sweeper import build_sweeper_worker
+from Assignment1.app.services.outbox import build_service_outbox_worker
+
+
+def _background_workers():
+    workers = [build_service_outbox_worker("admin", session_router, [rollup_appointment_event])]
+    if get_settings().appointment_archive_after_days > 0:
+        workers.append(build_archive_worker(session_router))
+    if get_settings().appointment_sweep_rules:
+        workers.append(build_sweeper_worker(session_router))
+    return workers
 
 
 def create_app() -> FastAPI:
     app = FastAPI(
         title="MedisolveAI Admin API",
         version="0.1.0",
+        lifespan=worker_lifespan(_background_workers),
     )
     register_exception_handlers(app)
+    app.add_middleware(QueryStatsMiddleware)
+    install_metrics(app, service="admin")
     @app.get("/healthz")
     async def health_check():
         return {"status": "ok"}
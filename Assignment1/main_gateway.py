@@ -5,11 +5,16 @@ from typing import List
 from fastapi import Depends, FastAPI, Request, Response
 
 from Assignment1.app.core.exceptions import register_exception_handlers
+from Assignment1.app.core.metrics import install_metrics
 from Assignment1.app.gateway.health import (
     GatewayHealthService,
     get_gateway_health_service,
 )
-from Assignment1.app.gateway.proxy import GatewayProxy, get_gateway_proxy
+from Assignment1.app.gateway.proxy import (
+    GatewayProxy,
+    get_gateway_proxy,
+    observe_upstream,
+)
 
 HTTP_METHODS: List[str] = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"]
 
@@ -17,16 +22,21 @@ HTTP_METHODS: List[str] = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "
 def create_app() -> FastAPI:
     app = FastAPI(title="MedisolveAI Gateway", version="0.1.0")
     register_exception_handlers(app)
+    install_metrics(app, service="gateway")
 
     async def _proxy_patient(
         request: Request, sub_path: str, proxy: GatewayProxy
     ) -> Response:
-        return await proxy.forward_patient(request, sub_path)
+        return await observe_upstream(
+            "patient", request.method, proxy.forward_patient(request, sub_path)
+        )
 
     async def _proxy_admin(
         request: Request, sub_path: str, proxy: GatewayProxy
     ) -> Response:
-        return await proxy.forward_admin(request, sub_path)
+        return await observe_upstream(
+            "admin", request.method, proxy.forward_admin(request, sub_path)
+        )
 
     @app.api_route("/api/v1/patient/{sub_path:path}", methods=HTTP_METHODS)
     async def proxy_patient_path(
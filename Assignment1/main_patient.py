@@ -1,15 +1,42 @@
 from fastapi import FastAPI
 
+from Assignment1.app.core.background import worker_lifespan
+from Assignment1.app.core.config import get_settings
 from Assignment1.app.core.exceptions import register_exception_handlers
+from Assignment1.app.core.metrics import install_metrics
+from Assignment1.app.core.query_stats import QueryStatsMiddleware
+from Assignment1.app.db.session import session_router
 from Assignment1.app.routers.patient import availability, appointments, directory
+from Assignment1.app.services.availability_snapshots import (
+    build_snapshot_worker,
+    invalidate_from_event,
+    snapshot_store,
+)
+from Assignment1.app.services.idempotency import build_idempotency_cleanup_worker
+from Assignment1.app.services.known_full import release_from_event
+from Assignment1.app.services.outbox import build_service_outbox_worker
+
+
+def _background_workers():
+    # 관리자 API 등 다른 프로세스의 변경도 이 프로세스의 캐시에 반영한다.
+    subscribers = [release_from_event]
+    workers = [build_idempotency_cleanup_worker(session_router)]
+    if get_settings().availability_mode == "snapshot":
+        subscribers.append(invalidate_from_event)
+        workers.append(build_snapshot_worker(snapshot_store, session_router))
+    workers.append(build_service_outbox_worker("patient", session_router, subscribers))
+    return workers
 
 
 def create_app() -> FastAPI:
     app = FastAPI(
         title="MedisolveAI Patient API",
         version="0.1.0",
+        lifespan=worker_lifespan(_background_workers),
     )
     register_exception_handlers(app)
+    app.add_middleware(QueryStatsMiddleware)
+    install_metrics(app, service="patient")
     @app.get("/healthz")
     async def health_check():
         return {"status": "ok"}
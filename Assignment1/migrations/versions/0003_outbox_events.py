@@ -0,0 +1,39 @@
+"""add outbox events
+
+Revision ID: 0003_outbox_events
+Revises: 0002_seed_sample_data
+Create Date: 2025-11-10
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_outbox_events"
+down_revision = "0002_seed_sample_data"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "outbox_events",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("event_type", sa.String(length=50), nullable=False),
+        sa.Column("aggregate_id", sa.BigInteger(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+    )
+    op.create_index("idx_outbox_events_created_at", "outbox_events", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_outbox_events_created_at", table_name="outbox_events")
+    op.drop_table("outbox_events")
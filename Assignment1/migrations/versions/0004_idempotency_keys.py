@@ -0,0 +1,45 @@
+"""add idempotency keys
+
+Revision ID: 0004_idempotency_keys
+Revises: 0003_outbox_events
+Create Date: 2025-11-12
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_idempotency_keys"
+down_revision = "0003_outbox_events"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "idempotency_keys",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("scope", sa.String(length=100), nullable=False),
+        sa.Column("key", sa.String(length=100), nullable=False),
+        sa.Column("request_hash", sa.String(length=64), nullable=False),
+        sa.Column("status_code", sa.Integer(), nullable=True),
+        sa.Column("response_body", sa.JSON(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("scope", "key", name="uq_idempotency_scope_key"),
+    )
+    op.create_index(
+        "idx_idempotency_keys_expires_at", "idempotency_keys", ["expires_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_idempotency_keys_expires_at", table_name="idempotency_keys")
+    op.drop_table("idempotency_keys")
@@ -0,0 +1,79 @@
+"""add weekly templates and date overrides for hospital slots
+
+Revision ID: 0005_hospital_slot_schedule
+Revises: 0004_idempotency_keys
+Create Date: 2025-11-13
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_hospital_slot_schedule"
+down_revision = "0004_idempotency_keys"
+branch_labels = None
+depends_on = None
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "hospital_slot_templates",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("weekday", sa.SmallInteger(), nullable=False),
+        sa.Column(
+            "slot_id",
+            sa.BigInteger(),
+            sa.ForeignKey("hospital_slots.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("capacity", sa.SmallInteger(), nullable=False),
+        *_timestamps(),
+        sa.UniqueConstraint("weekday", "slot_id", name="uq_slot_template_weekday_slot"),
+        sa.CheckConstraint("weekday BETWEEN 0 AND 6", name="ck_slot_template_weekday"),
+        sa.CheckConstraint("capacity >= 0", name="ck_slot_template_capacity"),
+    )
+    op.create_table(
+        "hospital_slot_overrides",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("override_date", sa.Date(), nullable=False),
+        sa.Column(
+            "slot_id",
+            sa.BigInteger(),
+            sa.ForeignKey("hospital_slots.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+        sa.Column("capacity", sa.SmallInteger(), nullable=False),
+        sa.Column("note", sa.String(length=255), nullable=True),
+        *_timestamps(),
+        sa.CheckConstraint("capacity >= 0", name="ck_slot_override_capacity"),
+    )
+    op.create_index(
+        "idx_slot_overrides_date_slot",
+        "hospital_slot_overrides",
+        ["override_date", "slot_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_slot_overrides_date_slot", table_name="hospital_slot_overrides")
+    op.drop_table("hospital_slot_overrides")
+    op.drop_table("hospital_slot_templates")
@@ -0,0 +1,83 @@
+"""add archive tables for finished appointments
+
+Revision ID: 0006_appointment_archive
+Revises: 0005_hospital_slot_schedule
+Create Date: 2025-11-14
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_appointment_archive"
+down_revision = "0005_hospital_slot_schedule"
+branch_labels = None
+depends_on = None
+
+visit_type_enum = sa.Enum("FIRST", "FOLLOW_UP", name="visit_type_enum", create_type=False)
+appointment_status_enum = sa.Enum(
+    "PENDING",
+    "CONFIRMED",
+    "COMPLETED",
+    "CANCELLED",
+    name="appointment_status_enum",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    # id 는 원래 appointments.id 를 그대로 옮겨 온다 (자동 증가 아님).
+    op.create_table(
+        "appointments_archive",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=False),
+        sa.Column("patient_id", sa.BigInteger(), nullable=False),
+        sa.Column("doctor_id", sa.BigInteger(), nullable=False),
+        sa.Column("treatment_id", sa.BigInteger(), nullable=False),
+        sa.Column("start_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("end_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("status", appointment_status_enum, nullable=False),
+        sa.Column("visit_type", visit_type_enum, nullable=False),
+        sa.Column("memo", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.ForeignKeyConstraint(["patient_id"], ["patients.id"]),
+        sa.ForeignKeyConstraint(["doctor_id"], ["doctors.id"]),
+        sa.ForeignKeyConstraint(["treatment_id"], ["treatments.id"]),
+    )
+    op.create_index(
+        "idx_appointments_archive_patient_status",
+        "appointments_archive",
+        ["patient_id", "status"],
+    )
+    op.create_index(
+        "idx_appointments_archive_start_at", "appointments_archive", ["start_at"]
+    )
+
+    op.create_table(
+        "appointment_slots_archive",
+        sa.Column("appointment_id", sa.BigInteger(), nullable=False),
+        sa.Column("slot_id", sa.BigInteger(), nullable=False),
+        sa.Column("slot_date", sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["appointment_id"], ["appointments_archive.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("appointment_id", "slot_id", "slot_date"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("appointment_slots_archive")
+    op.drop_index(
+        "idx_appointments_archive_start_at", table_name="appointments_archive"
+    )
+    op.drop_index(
+        "idx_appointments_archive_patient_status", table_name="appointments_archive"
+    )
+    op.drop_table("appointments_archive")
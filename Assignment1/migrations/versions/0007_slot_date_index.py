@@ -0,0 +1,30 @@
+"""index appointment_slots by (slot_date, slot_id)
+
+Revision ID: 0007_slot_date_index
+Revises: 0006_appointment_archive
+Create Date: 2025-11-21
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0007_slot_date_index"
+down_revision = "0006_appointment_archive"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 파티셔닝(slot_date RANGE)은 FK 를 포기해야 하므로 마이그레이션에 넣지 않는다.
+    # 필요하면 python -m Assignment1.app.services.slot_partitions enable 로 따로 적용한다.
+    op.create_index(
+        "idx_appointment_slots_date_slot",
+        "appointment_slots",
+        ["slot_date", "slot_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_appointment_slots_date_slot", table_name="appointment_slots")
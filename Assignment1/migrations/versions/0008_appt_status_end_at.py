@@ -0,0 +1,29 @@
+"""index appointments by (status, end_at, id) for the sweeper
+
+Revision ID: 0008_appt_status_end_at
+Revises: 0007_slot_date_index
+Create Date: 2025-11-24
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0008_appt_status_end_at"
+down_revision = "0007_slot_date_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 스위퍼의 키셋 조회: status IN (...) AND end_at < :horizon ORDER BY end_at, id
+    op.create_index(
+        "idx_appointments_status_end_at",
+        "appointments",
+        ["status", "end_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_appointments_status_end_at", table_name="appointments")
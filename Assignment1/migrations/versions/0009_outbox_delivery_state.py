@@ -0,0 +1,52 @@
+"""add per-consumer outbox gaps and dead letters
+
+Revision ID: 0009_outbox_delivery_state
+Revises: 0008_appt_status_end_at
+Create Date: 2025-11-25
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_outbox_delivery_state"
+down_revision = "0008_appt_status_end_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "outbox_gaps",
+        sa.Column("consumer", sa.String(length=100), primary_key=True),
+        sa.Column("event_id", sa.BigInteger(), primary_key=True, autoincrement=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+    )
+    op.create_table(
+        "outbox_dead_letters",
+        sa.Column("consumer", sa.String(length=100), primary_key=True),
+        sa.Column("event_id", sa.BigInteger(), primary_key=True, autoincrement=False),
+        sa.Column("event_type", sa.String(length=50), nullable=False),
+        sa.Column("aggregate_id", sa.BigInteger(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("event_created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("outbox_dead_letters")
+    op.drop_table("outbox_gaps")
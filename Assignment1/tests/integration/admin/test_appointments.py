@@ -1,20 +1,31 @@
 from __future__ import annotations
 
-from datetime import datetime
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import delete
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from Assignment1.app.db import (
     Appointment,
     AppointmentSlot,
     AppointmentStatus,
+    ArchivedAppointmentSlot,
     Doctor,
     HospitalSlot,
+    OutboxEvent,
     Patient,
     Treatment,
+    VisitType,
+)
+from Assignment1.app.services.admin_appointments import list_appointments
+from Assignment1.app.services.appointment_archive import (
+    APPOINTMENTS_ARCHIVED,
+    archive_appointments,
 )
 
 
@@ -159,3 +170,294 @@ async def test_admin_appointments_flow(
 
     assert stats["visit_ratio"]["first"] >= 1
     assert stats["visit_ratio"]["follow_up"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_export_streams_filtered_rows(
+    admin_client: AsyncClient,
+    session_factory: async_sessionmaker,
+    seed_patient_data: dict[str, int | str],
+) -> None:
+    day = date.fromisoformat(seed_patient_data["date"])
+    async with session_factory() as session:
+        for offset, status in (
+            (0, AppointmentStatus.PENDING),
+            (1, AppointmentStatus.CANCELLED),
+            (3, AppointmentStatus.PENDING),
+        ):
+            start_at = datetime.combine(day + timedelta(days=offset), time(10, 0))
+            session.add(
+                Appointment(
+                    patient_id=seed_patient_data["patient_id"],
+                    doctor_id=seed_patient_data["doctor_id"],
+                    treatment_id=seed_patient_data["treatment_id"],
+                    start_at=start_at,
+                    end_at=start_at + timedelta(minutes=30),
+                    status=status,
+                    visit_type=VisitType.FIRST,
+                    memo='note, with "quotes"',
+                )
+            )
+        await session.commit()
+
+    params = {
+        "doctor_id": seed_patient_data["doctor_id"],
+        "date_from": day.isoformat(),
+        "date_to": (day + timedelta(days=1)).isoformat(),
+    }
+    ndjson = await admin_client.get("/api/v1/admin/appointments/export", params=params)
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [row["start_at"][:10] for row in rows] == [day.isoformat(), (day + timedelta(days=1)).isoformat()]
+    # 목록 API와 같은 모양의 행
+    listed = await admin_client.get("/api/v1/admin/appointments", params={"date": day.isoformat()})
+    assert rows[0] == listed.json()[0]
+
+    cancelled = await admin_client.get(
+        "/api/v1/admin/appointments/export",
+        params={**params, "format": "csv", "status": AppointmentStatus.CANCELLED.value},
+    )
+    assert cancelled.status_code == 200
+    assert cancelled.headers["content-disposition"] == 'attachment; filename="appointments.csv"'
+    records = list(csv.DictReader(io.StringIO(cancelled.text)))
+    assert len(records) == 1
+    assert records[0]["status"] == AppointmentStatus.CANCELLED.value
+    assert records[0]["memo"] == 'note, with "quotes"'
+
+    reversed_range = await admin_client.get(
+        "/api/v1/admin/appointments/export",
+        params={"date_from": "2030-01-02", "date_to": "2030-01-01"},
+    )
+    assert reversed_range.status_code == 400
+    assert reversed_range.json()["code"] == "INVALID_DATE_RANGE"
+
+
+@pytest.mark.asyncio
+async def test_catalog_lookup_listing_follows_renames(
+    admin_client: AsyncClient,
+    session_factory: async_sessionmaker,
+    seed_patient_data: dict[str, int | str],
+) -> None:
+    start_at = datetime.combine(date.fromisoformat(seed_patient_data["date"]), time(10, 0))
+    async with session_factory() as session:
+        session.add(
+            Appointment(
+                patient_id=seed_patient_data["patient_id"],
+                doctor_id=seed_patient_data["doctor_id"],
+                treatment_id=seed_patient_data["treatment_id"],
+                start_at=start_at,
+                end_at=start_at + timedelta(minutes=30),
+                status=AppointmentStatus.PENDING,
+                visit_type=VisitType.FIRST,
+            )
+        )
+        await session.commit()
+        joined = await list_appointments(session)
+        looked_up = await list_appointments(session, catalog_lookup=True)
+    assert looked_up == joined
+
+    doctor_url = f"/api/v1/admin/doctors/{seed_patient_data['doctor_id']}"
+    original = joined[0].doctor_name
+    try:
+        assert (await admin_client.patch(doctor_url, json={"name": "Dr. Renamed"})).status_code == 200
+        async with session_factory() as session:
+            renamed = await list_appointments(session, catalog_lookup=True)
+        assert renamed[0].doctor_name == "Dr. Renamed"
+    finally:
+        await admin_client.patch(doctor_url, json={"name": original})
+
+
+@pytest.mark.asyncio
+async def test_archived_history_is_only_listed_on_request(
+    admin_client: AsyncClient,
+    patient_client: AsyncClient,
+    session_factory: async_sessionmaker,
+    seed_patient_data: dict[str, int | str],
+) -> None:
+    day = date.fromisoformat(seed_patient_data["date"])
+    cutoff = datetime.combine(day - timedelta(days=30), time.min)
+    async with session_factory() as session:
+        slot_id = await session.scalar(
+            select(HospitalSlot.id).where(HospitalSlot.start_time == time(10, 0))
+        )
+        for days_ago, status in (
+            (400, AppointmentStatus.COMPLETED),
+            (380, AppointmentStatus.CANCELLED),
+            # 지난 CONFIRMED 는 아직 처리할 일이 남은 예약이라 옮기지 않는다.
+            (360, AppointmentStatus.CONFIRMED),
+            (7, AppointmentStatus.CANCELLED),
+        ):
+            start_at = datetime.combine(day - timedelta(days=days_ago), time(10, 0))
+            appointment = Appointment(
+                patient_id=seed_patient_data["patient_id"],
+                doctor_id=seed_patient_data["doctor_id"],
+                treatment_id=seed_patient_data["treatment_id"],
+                start_at=start_at,
+                end_at=start_at + timedelta(minutes=30),
+                status=status,
+                visit_type=VisitType.FIRST,
+            )
+            session.add(appointment)
+            await session.flush()
+            session.add(
+                AppointmentSlot(
+                    appointment_id=appointment.id, slot_id=slot_id, slot_date=start_at.date()
+                )
+            )
+        await session.commit()
+
+    before = APPOINTMENTS_ARCHIVED.value()
+    # 배치 크기 1: 여러 트랜잭션에 걸쳐 옮긴다.
+    assert await archive_appointments(session_factory, before=cutoff, batch_size=1) == 2
+    assert await archive_appointments(session_factory, before=cutoff, batch_size=1) == 0
+    assert APPOINTMENTS_ARCHIVED.value() - before == 2
+
+    live = (await admin_client.get("/api/v1/admin/appointments")).json()
+    assert [row["status"] for row in live] == ["CONFIRMED", "CANCELLED"]
+    history = await admin_client.get(
+        "/api/v1/admin/appointments", params={"include_archived": "true"}
+    )
+    assert [row["status"] for row in history.json()] == [
+        "COMPLETED",
+        "CANCELLED",
+        "CONFIRMED",
+        "CANCELLED",
+    ]
+    completed = await admin_client.get(
+        "/api/v1/admin/appointments",
+        params={"include_archived": "true", "status": "COMPLETED"},
+    )
+    assert completed.json() == history.json()[:1]
+    exported = await admin_client.get(
+        "/api/v1/admin/appointments/export",
+        params={"include_archived": "true", "date_to": cutoff.date().isoformat()},
+    )
+    assert [json.loads(line)["id"] for line in exported.text.splitlines()] == [
+        row["id"] for row in history.json()[:3]
+    ]
+
+    async with session_factory() as session:
+        archived_ids = {row["id"] for row in history.json()[:2]}
+        moved_slots = await session.scalar(
+            select(func.count()).select_from(ArchivedAppointmentSlot)
+        )
+        live_slots = await session.scalar(
+            select(func.count())
+            .select_from(AppointmentSlot)
+            .where(AppointmentSlot.appointment_id.in_(archived_ids))
+        )
+    assert (moved_slots, live_slots) == (2, 0)
+
+    # 유일한 COMPLETED 방문이 보관되었어도 재방문으로 판정한다.
+    booking = await patient_client.post(
+        "/api/v1/patient/appointments",
+        json={
+            "patient_id": seed_patient_data["patient_id"],
+            "doctor_id": seed_patient_data["doctor_id"],
+            "treatment_id": seed_patient_data["treatment_id"],
+            "start_at": f"{seed_patient_data['date']}T10:00:00",
+        },
+    )
+    assert booking.status_code == 201
+    assert booking.json()["visit_type"] == VisitType.FOLLOW_UP.value
+
+
+@pytest.mark.asyncio
+async def test_bulk_status_change_reports_each_id(
+    admin_client: AsyncClient,
+    session_factory: async_sessionmaker,
+    seed_patient_data: dict[str, int | str],
+) -> None:
+    day = date.fromisoformat(seed_patient_data["date"])
+    ids = []
+    async with session_factory() as session:
+        for hour, status in (
+            (10, AppointmentStatus.PENDING),
+            (11, AppointmentStatus.PENDING),
+            (14, AppointmentStatus.COMPLETED),
+        ):
+            start_at = datetime.combine(day, time(hour, 0))
+            appointment = Appointment(
+                patient_id=seed_patient_data["patient_id"],
+                doctor_id=seed_patient_data["doctor_id"],
+                treatment_id=seed_patient_data["treatment_id"],
+                start_at=start_at,
+                end_at=start_at + timedelta(minutes=30),
+                status=status,
+                visit_type=VisitType.FIRST,
+            )
+            session.add(appointment)
+            await session.flush()
+            ids.append(appointment.id)
+        await session.commit()
+        last_event = await session.scalar(select(func.max(OutboxEvent.id))) or 0
+    pending_a, pending_b, completed = ids
+    missing = completed + 1000
+
+    confirm = await admin_client.post(
+        "/api/v1/admin/appointments/status",
+        json={"ids": [pending_a, pending_b, completed, missing, pending_a], "status": "CONFIRMED"},
+    )
+    assert confirm.status_code == 200
+    body = confirm.json()
+    assert [(item["id"], item["outcome"]) for item in body["items"]] == [
+        (pending_a, "updated"),
+        (pending_b, "updated"),
+        (completed, "invalid_transition"),
+        (missing, "not_found"),
+    ]
+    assert body["items"][0]["previous_status"] == "PENDING"
+    assert body["items"][2]["status"] == "COMPLETED"
+    counts = ("updated", "unchanged", "not_found", "invalid_transition")
+    assert [body[key] for key in counts] == [2, 0, 1, 1]
+
+    again = await admin_client.post(
+        "/api/v1/admin/appointments/status",
+        json={"ids": [pending_a, pending_b], "status": "CONFIRMED"},
+    )
+    assert [item["outcome"] for item in again.json()["items"]] == ["unchanged", "unchanged"]
+
+    cancel = await admin_client.post(
+        f"/api/v1/admin/appointments/{pending_a}/status/compact", json={"status": "CANCELLED"}
+    )
+    assert cancel.status_code == 200
+    assert cancel.json() == {
+        "id": pending_a,
+        "outcome": "updated",
+        "status": "CANCELLED",
+        "previous_status": "CONFIRMED",
+    }
+    repeated = await admin_client.post(
+        f"/api/v1/admin/appointments/{pending_a}/status/compact", json={"status": "CANCELLED"}
+    )
+    assert repeated.status_code == 400
+    assert repeated.json()["code"] == "INVALID_STATUS_TRANSITION"
+    unknown = await admin_client.post(
+        f"/api/v1/admin/appointments/{missing}/status/compact", json={"status": "CANCELLED"}
+    )
+    assert unknown.status_code == 404
+
+    async with session_factory() as session:
+        rows = await session.execute(
+            select(Appointment.id, Appointment.status).where(Appointment.id.in_(ids))
+        )
+        statuses = dict(rows.all())
+        events = (
+            await session.execute(
+                select(OutboxEvent.event_type, OutboxEvent.aggregate_id)
+                .where(OutboxEvent.id > last_event)
+                .order_by(OutboxEvent.id)
+            )
+        ).all()
+    assert statuses == {
+        pending_a: AppointmentStatus.CANCELLED,
+        pending_b: AppointmentStatus.CONFIRMED,
+        completed: AppointmentStatus.COMPLETED,
+    }
+    # 실제로 바뀐 예약만 아웃박스 이벤트를 남긴다.
+    assert events == [
+        ("appointment.status_changed", pending_a),
+        ("appointment.status_changed", pending_b),
+        ("appointment.cancelled", pending_a),
+    ]
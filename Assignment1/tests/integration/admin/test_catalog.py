@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import delete
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from Assignment1.app.db import (
@@ -164,3 +164,159 @@ async def test_admin_catalog_validations(admin_client: AsyncClient) -> None:
     )
     assert after_hours.status_code == 400
     assert after_hours.json()["code"] == "INVALID_SLOT_OPERATING_HOURS"
+
+
+@pytest.mark.asyncio
+async def test_replacing_slots_keeps_ids_and_bookings(
+    admin_client: AsyncClient,
+    patient_client: AsyncClient,
+    session_factory: async_sessionmaker,
+    seed_patient_data: dict[str, int | str],
+) -> None:
+    before = {
+        slot["start_time"]: slot["id"]
+        for slot in (await admin_client.get("/api/v1/admin/hospital-slots")).json()
+    }
+    booking = await patient_client.post(
+        "/api/v1/patient/appointments",
+        json={
+            "patient_id": seed_patient_data["patient_id"],
+            "doctor_id": seed_patient_data["doctor_id"],
+            "treatment_id": seed_patient_data["treatment_id"],
+            "start_at": f"{seed_patient_data['date']}T10:00:00",
+        },
+    )
+    assert booking.status_code == 201
+
+    replaced = await admin_client.put(
+        "/api/v1/admin/hospital-slots",
+        json={
+            "slots": [
+                {"start_time": "10:00:00", "end_time": "10:30:00", "capacity": 4},
+                {"start_time": "14:00:00", "end_time": "14:30:00", "capacity": 2},
+            ]
+        },
+    )
+    assert replaced.status_code == 200
+    slots = {slot["start_time"]: slot for slot in replaced.json()}
+    assert list(slots) == ["10:00:00", "14:00:00"]
+    # 시간대가 같은 슬롯은 정원만 바뀌고 ID와 예약 연결이 그대로 남는다.
+    assert slots["10:00:00"] == {
+        "id": before["10:00:00"],
+        "start_time": "10:00:00",
+        "end_time": "10:30:00",
+        "capacity": 4,
+    }
+    async with session_factory() as session:
+        linked = (await session.scalars(select(AppointmentSlot.slot_id))).all()
+    assert linked == [before["10:00:00"]]
+
+    availability = await patient_client.get(
+        "/api/v1/patient/availability",
+        params={"doctor_id": seed_patient_data["doctor_id"], "date": seed_patient_data["date"]},
+    )
+    assert availability.status_code == 200
+    assert [slot["start_at"][11:16] for slot in availability.json()["slots"]] == ["14:00"]
+
+    duplicate = await admin_client.put(
+        "/api/v1/admin/hospital-slots",
+        json={
+            "slots": [
+                {"start_time": "10:00:00", "end_time": "10:30:00", "capacity": 1},
+                {"start_time": "10:00:00", "end_time": "10:30:00", "capacity": 2},
+            ]
+        },
+    )
+    assert duplicate.status_code == 400
+    assert duplicate.json()["code"] == "DUPLICATE_SLOT"
+
+
+@pytest.mark.asyncio
+async def test_bulk_catalog_import_reports_per_item_outcomes(
+    admin_client: AsyncClient, session_factory: async_sessionmaker
+) -> None:
+    async with session_factory() as session:
+        existing = Doctor(name="Dr. Bulk Existing", department="Surgery", is_active=True)
+        session.add(existing)
+        await session.commit()
+        existing_id = existing.id
+
+    items = [
+        {"name": "Dr. Bulk Existing", "department": "Surgery"},
+        {"name": "Dr. Bulk A", "department": "Laser"},
+        {"name": "Dr. Bulk B", "department": "Laser", "is_active": False},
+    ]
+    created = await admin_client.post("/api/v1/admin/doctors/bulk", json={"items": items})
+    assert created.status_code == 200
+    body = created.json()
+    assert [item["outcome"] for item in body["items"]] == ["unchanged", "created", "created"]
+    assert body["items"][0]["id"] == existing_id
+    assert (body["created"], body["updated"], body["unchanged"], body["skipped"]) == (2, 0, 1, 0)
+
+    items[0]["department"] = "Dermatology"
+    skipped = await admin_client.post(
+        "/api/v1/admin/doctors/bulk", json={"items": items, "on_conflict": "skip"}
+    )
+    assert [item["outcome"] for item in skipped.json()["items"]] == [
+        "skipped",
+        "unchanged",
+        "unchanged",
+    ]
+    updated = await admin_client.post("/api/v1/admin/doctors/bulk", json={"items": items})
+    assert [item["outcome"] for item in updated.json()["items"]] == [
+        "updated",
+        "unchanged",
+        "unchanged",
+    ]
+    assert [item["id"] for item in updated.json()["items"]] == [
+        item["id"] for item in body["items"]
+    ]
+
+    async with session_factory() as session:
+        rows = dict(
+            (
+                await session.execute(
+                    select(Doctor.name, Doctor.department).where(Doctor.name.like("Dr. Bulk%"))
+                )
+            ).all()
+        )
+    assert rows == {
+        "Dr. Bulk Existing": "Dermatology",
+        "Dr. Bulk A": "Laser",
+        "Dr. Bulk B": "Laser",
+    }
+
+    # 한 항목이라도 잘못되면 아무것도 쓰지 않는다.
+    treatments = [
+        {"name": "Bulk Peel", "duration_minutes": 30, "price": 9.99},
+        {"name": "Bulk Laser", "duration_minutes": 45, "price": 100},
+        {"name": "Bulk Peel", "duration_minutes": 60, "price": 10},
+    ]
+    invalid = await admin_client.post("/api/v1/admin/treatments/bulk", json={"items": treatments})
+    assert invalid.status_code == 400
+    assert invalid.json()["code"] == "INVALID_BULK_ITEMS"
+    assert "items[1]" in invalid.json()["message"] and "items[2]" in invalid.json()["message"]
+
+    treatments = treatments[:1]
+    first = await admin_client.post("/api/v1/admin/treatments/bulk", json={"items": treatments})
+    again = await admin_client.post("/api/v1/admin/treatments/bulk", json={"items": treatments})
+    assert first.json()["created"] == 1
+    assert again.json()["unchanged"] == 1
+    listed = (await admin_client.get("/api/v1/admin/treatments")).json()
+    assert {"Bulk Peel"} == {item["name"] for item in listed if item["name"].startswith("Bulk")}
+
+    # MySQL 콜레이션은 대소문자·악센트를 구분하지 않으므로 같은 이름으로 본다.
+    folded = await admin_client.post(
+        "/api/v1/admin/doctors/bulk",
+        json={
+            "items": [
+                {"name": "Dr. Bulk Case", "department": "Laser"},
+                {"name": "dr. bulk case", "department": "Laser"},
+                {"name": "Dr. Bulk Café", "department": "Laser"},
+                {"name": "DR. BULK CAFE", "department": "Laser"},
+            ]
+        },
+    )
+    assert folded.status_code == 400
+    assert "items[1]: name duplicates items[0]" in folded.json()["message"]
+    assert "items[3]: name duplicates items[2]" in folded.json()["message"]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+
+
+async def _effective(admin_client: AsyncClient, day: date) -> dict[str, int]:
+    resp = await admin_client.get("/api/v1/admin/hospital-slots/effective", params={"date": day.isoformat()})
+    assert resp.status_code == 200
+    return {slot["start_time"]: slot["capacity"] for slot in resp.json()}
+
+
+@pytest.mark.asyncio
+async def test_weekday_templates_and_date_overrides(
+    admin_client: AsyncClient,
+    patient_client: AsyncClient,
+    seed_patient_data: dict[str, int | str],
+) -> None:
+    day = date.fromisoformat(seed_patient_data["date"])
+    slots = (await admin_client.get("/api/v1/admin/hospital-slots")).json()
+    slot_id, default_capacity = next(
+        (slot["id"], slot["capacity"]) for slot in slots if slot["start_time"] == "10:00:00"
+    )
+    booking = {
+        "patient_id": seed_patient_data["patient_id"],
+        "doctor_id": seed_patient_data["doctor_id"],
+        "treatment_id": seed_patient_data["treatment_id"],
+        "start_at": f"{day.isoformat()}T10:00:00",
+    }
+    weekday_url = f"/api/v1/admin/hospital-slots/weekdays/{day.weekday()}"
+    override_url = f"/api/v1/admin/hospital-slots/overrides/{day.isoformat()}"
+
+    try:
+        # 이 요일에는 10:00 슬롯을 닫는다.
+        template = await admin_client.put(weekday_url, json={"slots": [{"slot_id": slot_id, "capacity": 0}]})
+        assert template.status_code == 200
+        assert template.json() == {"weekday": day.weekday(), "slots": [{"slot_id": slot_id, "capacity": 0}]}
+        assert "10:00:00" not in await _effective(admin_client, day)
+        assert "10:00:00" not in await _effective(admin_client, day + timedelta(days=7))
+        assert (await _effective(admin_client, day + timedelta(days=1)))["10:00:00"] == default_capacity
+
+        closed = await patient_client.post("/api/v1/patient/appointments", json=booking)
+        assert closed.status_code == 409
+
+        # 날짜 단위 예외가 요일 템플릿보다 우선한다.
+        reopened = await admin_client.put(
+            override_url, json={"slots": [{"slot_id": slot_id, "capacity": 5}], "note": "extra clinic"}
+        )
+        assert reopened.status_code == 200
+        assert (await _effective(admin_client, day))["10:00:00"] == 5
+        assert "10:00:00" not in await _effective(admin_client, day + timedelta(days=7))
+        availability = await patient_client.get(
+            "/api/v1/patient/availability",
+            params={"doctor_id": seed_patient_data["doctor_id"], "date": day.isoformat()},
+        )
+        assert any(slot["remaining_capacity"] == 5 for slot in availability.json()["slots"])
+        assert (await patient_client.post("/api/v1/patient/appointments", json=booking)).status_code == 201
+
+        holiday = await admin_client.put(override_url, json={"capacity": 0, "note": "holiday"})
+        assert holiday.status_code == 200
+        assert await _effective(admin_client, day) == {}
+
+        assert (await admin_client.delete(override_url)).status_code == 204
+        assert "10:00:00" not in await _effective(admin_client, day)
+        assert (await admin_client.delete(override_url)).status_code == 404
+    finally:
+        await admin_client.put(weekday_url, json={"slots": []})
+        await admin_client.delete(override_url)
+
+    assert (await _effective(admin_client, day))["10:00:00"] == default_capacity
+
+
+@pytest.mark.asyncio
+async def test_schedule_validation(
+    admin_client: AsyncClient, seed_patient_data: dict[str, int | str]
+) -> None:
+    unknown = await admin_client.put(
+        "/api/v1/admin/hospital-slots/weekdays/0", json={"slots": [{"slot_id": 999999, "capacity": 1}]}
+    )
+    assert unknown.status_code == 404
+
+    bad_weekday = await admin_client.put("/api/v1/admin/hospital-slots/weekdays/7", json={"slots": []})
+    assert bad_weekday.status_code == 422
+
+    empty = await admin_client.put("/api/v1/admin/hospital-slots/overrides/2030-01-01", json={})
+    assert empty.status_code == 400
+    assert empty.json()["code"] == "SLOT_REQUIRED"
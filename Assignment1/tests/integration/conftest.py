@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 import asyncio
+import re
 import sys
 from datetime import date, time
 from pathlib import Path
-from typing import AsyncIterator, Dict
+from typing import AsyncIterator, Callable, Dict
 
 import pytest
 import pytest_asyncio
 from fastapi import FastAPI
-from httpx import ASGITransport, AsyncClient
+from httpx import ASGITransport, AsyncClient, Response
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
@@ -21,17 +22,25 @@ if str(PROJECT_ROOT) not in sys.path:
 from Assignment1.app.db import (  # noqa: E402
     Appointment,
     AppointmentSlot,
+    ArchivedAppointment,
+    ArchivedAppointmentSlot,
     Base,
     Doctor,
     HospitalSlot,
     Patient,
     Treatment,
 )
-from Assignment1.app.db.session import get_session  # noqa: E402
+from Assignment1.app.db.session import SessionRouter, get_session_router  # noqa: E402
+from Assignment1.app.services.catalog_cache import catalog_cache  # noqa: E402
+from Assignment1.app.services.hospital_schedule import schedule_cache  # noqa: E402
+from Assignment1.app.services.known_full import known_full_cache  # noqa: E402
 from Assignment1.main_admin import create_app as create_admin_app  # noqa: E402
 from Assignment1.main_patient import create_app  # noqa: E402
 
 
+SERVER_TIMING_QUERY_COUNT = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
 @pytest.fixture(scope="session")
 def anyio_backend() -> str:
     return "asyncio"
@@ -64,37 +73,27 @@ def session_factory(async_engine: AsyncEngine) -> async_sessionmaker:
     return async_sessionmaker(async_engine, expire_on_commit=False)
 
 
+@pytest.fixture(autouse=True)
+def reset_known_full_cache() -> None:
+    # Tests wipe tables directly, which the caches never hear about.
+    known_full_cache.release()
+    schedule_cache.clear()
+    catalog_cache.clear()
+
+
 @pytest_asyncio.fixture
 def patient_app(session_factory: async_sessionmaker) -> FastAPI:
     app = create_app()
-
-    async def override_get_session():
-        async with session_factory() as session:
-            try:
-                yield session
-                await session.commit()
-            except Exception:
-                await session.rollback()
-                raise
-
-    app.dependency_overrides[get_session] = override_get_session
+    router = SessionRouter(session_factory)
+    app.dependency_overrides[get_session_router] = lambda: router
     return app
 
 
 @pytest_asyncio.fixture
 def admin_app(session_factory: async_sessionmaker) -> FastAPI:
     app = create_admin_app()
-
-    async def override_get_session():
-        async with session_factory() as session:
-            try:
-                yield session
-                await session.commit()
-            except Exception:
-                await session.rollback()
-                raise
-
-    app.dependency_overrides[get_session] = override_get_session
+    router = SessionRouter(session_factory)
+    app.dependency_overrides[get_session_router] = lambda: router
     return app
 
 
@@ -106,6 +105,8 @@ async def seed_patient_data(
         # clear previous reservations to guarantee deterministic tests
         await session.execute(delete(AppointmentSlot))
         await session.execute(delete(Appointment))
+        await session.execute(delete(ArchivedAppointmentSlot))
+        await session.execute(delete(ArchivedAppointment))
 
         doctor = await session.scalar(
             select(Doctor).where(Doctor.name == "Dr. Kim")
@@ -168,3 +169,19 @@ async def admin_client(admin_app: FastAPI) -> AsyncIterator[AsyncClient]:
     transport = ASGITransport(app=admin_app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as client:
         yield client
+
+
+@pytest.fixture
+def assert_query_budget() -> Callable[[Response, int], int]:
+    def _assert(response: Response, max_queries: int) -> int:
+        match = SERVER_TIMING_QUERY_COUNT.search(response.headers.get("server-timing", ""))
+        assert match, "response is missing the db Server-Timing metric"
+        count = int(match.group(1))
+        request = response.request
+        assert count <= max_queries, (
+            f"{request.method} {request.url.path} issued {count} queries "
+            f"(budget {max_queries})"
+        )
+        return count
+
+    return _assert
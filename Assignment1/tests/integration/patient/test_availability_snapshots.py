@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from Assignment1.app.core.background import PeriodicWorker
+from Assignment1.app.db import (
+    Appointment,
+    AppointmentSlot,
+    AppointmentStatus,
+    Doctor,
+    HospitalSlot,
+    Patient,
+    Treatment,
+    VisitType,
+)
+from Assignment1.app.services.availability_snapshots import (
+    AvailabilitySnapshotStore,
+    snapshot_store,
+)
+from Assignment1.app.services.slot_rules import clinic_today
+
+SLOT_CAPACITIES = {
+    time(9, 0): 2,
+    time(9, 30): 1,
+    time(10, 0): 1,
+    time(10, 30): 2,
+    time(11, 0): 2,
+    time(11, 30): 3,
+}
+
+
+async def _reset(session_factory: async_sessionmaker) -> dict[str, list[int] | int]:
+    async with session_factory() as session:
+        for model in (AppointmentSlot, Appointment, HospitalSlot, Treatment, Doctor, Patient):
+            await session.execute(delete(model))
+        doctors = [Doctor(name=f"Snapshot Doctor {i}", department="Derm") for i in range(3)]
+        patients = [Patient(name=f"Snapshot Patient {i}", phone=f"010-7000-000{i}") for i in range(4)]
+        treatment = Treatment(name="Snapshot Care", duration_minutes=30, price=1000)
+        slots = [
+            HospitalSlot(
+                start_time=start,
+                end_time=(datetime.combine(date.today(), start) + timedelta(minutes=30)).time(),
+                capacity=capacity,
+            )
+            for start, capacity in SLOT_CAPACITIES.items()
+        ]
+        session.add_all([*doctors, *patients, treatment, *slots])
+        await session.commit()
+        snapshot_store.clear()
+        return {
+            "doctors": [doctor.id for doctor in doctors],
+            "patients": [patient.id for patient in patients],
+            "treatment": treatment.id,
+        }
+
+
+async def _availability(client: AsyncClient, doctor_id: int, day: date, mode: str) -> dict:
+    resp = await client.get(
+        "/api/v1/patient/availability",
+        params={"doctor_id": doctor_id, "date": day.isoformat(), "mode": mode},
+    )
+    assert resp.status_code == 200
+    return resp.json()
+
+
+@pytest.mark.asyncio
+async def test_snapshots_match_live_after_random_bookings(
+    patient_client: AsyncClient,
+    admin_client: AsyncClient,
+    session_factory: async_sessionmaker,
+) -> None:
+    ids = await _reset(session_factory)
+    days = [clinic_today(), clinic_today() + timedelta(days=1)]
+    rng = random.Random(7)
+    used: set[tuple[int, datetime]] = set()
+    booked: list[tuple[int, int]] = []
+
+    for step in range(40):
+        action = rng.random()
+        if action < 0.6 or not booked:
+            doctor_id = rng.choice(ids["doctors"])
+            start_at = datetime.combine(rng.choice(days), rng.choice(list(SLOT_CAPACITIES)))
+            if (doctor_id, start_at) in used:
+                continue
+            patient_id = rng.choice(ids["patients"])
+            resp = await patient_client.post(
+                "/api/v1/patient/appointments",
+                json={
+                    "patient_id": patient_id,
+                    "doctor_id": doctor_id,
+                    "treatment_id": ids["treatment"],
+                    "start_at": start_at.isoformat(),
+                },
+            )
+            assert resp.status_code in {201, 409}
+            if resp.status_code == 201:
+                used.add((doctor_id, start_at))
+                booked.append((resp.json()["id"], patient_id))
+        elif action < 0.8:
+            appointment_id, patient_id = booked.pop(rng.randrange(len(booked)))
+            resp = await patient_client.post(
+                f"/api/v1/patient/appointments/{appointment_id}/cancel",
+                params={"patient_id": patient_id},
+            )
+            assert resp.status_code == 200
+        else:
+            appointment_id, _ = booked.pop(rng.randrange(len(booked)))
+            resp = await admin_client.post(
+                f"/api/v1/admin/appointments/{appointment_id}/status",
+                json={"status": rng.choice(["CONFIRMED", "CANCELLED"])},
+            )
+            assert resp.status_code == 200
+
+        if step % 3 == 0:
+            # 워커 경로와 요청 시점 계산 경로를 모두 거치게 한다.
+            await snapshot_store.refresh_due(session_factory)
+
+        for day in days:
+            for doctor_id in ids["doctors"]:
+                snapshot = await _availability(patient_client, doctor_id, day, "snapshot")
+                live = await _availability(patient_client, doctor_id, day, "live")
+                assert snapshot["snapshot_version"] is not None
+                assert live["snapshot_version"] is None
+                assert snapshot["slots"] == live["slots"], (step, doctor_id, day)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_hits_skip_the_database_until_the_day_changes(
+    patient_client: AsyncClient,
+    session_factory: async_sessionmaker,
+    assert_query_budget,
+) -> None:
+    ids = await _reset(session_factory)
+    doctor_id = ids["doctors"][0]
+    today = clinic_today()
+    params = {"doctor_id": doctor_id, "date": today.isoformat(), "mode": "snapshot"}
+
+    first = await patient_client.get("/api/v1/patient/availability", params=params)
+    cached = await patient_client.get("/api/v1/patient/availability", params=params)
+    assert_query_budget(cached, 0)
+    assert cached.json() == first.json()
+
+    other_day = await patient_client.get(
+        "/api/v1/patient/availability",
+        params={**params, "date": (today + timedelta(days=1)).isoformat()},
+    )
+    booking = await patient_client.post(
+        "/api/v1/patient/appointments",
+        json={
+            "patient_id": ids["patients"][0],
+            "doctor_id": ids["doctors"][1],
+            "treatment_id": ids["treatment"],
+            "start_at": f"{today.isoformat()}T09:30:00",
+        },
+    )
+    assert booking.status_code == 201
+
+    refreshed = await patient_client.get("/api/v1/patient/availability", params=params)
+    assert refreshed.json()["snapshot_version"] > first.json()["snapshot_version"]
+    # 09:30 슬롯 정원이 1이라 다른 의사의 예약으로도 사라진다.
+    assert len(refreshed.json()["slots"]) == len(first.json()["slots"]) - 1
+
+    untouched = await patient_client.get(
+        "/api/v1/patient/availability",
+        params={**params, "date": (today + timedelta(days=1)).isoformat()},
+    )
+    assert_query_budget(untouched, 0)
+    assert untouched.json()["snapshot_version"] == other_day.json()["snapshot_version"]
+
+    # 운영 범위를 벗어난 날짜는 항상 실시간 계산으로 응답한다.
+    far = await patient_client.get(
+        "/api/v1/patient/availability",
+        params={**params, "date": (today + timedelta(days=365)).isoformat()},
+    )
+    assert far.json()["snapshot_version"] is None
+
+
+@pytest.mark.asyncio
+async def test_snapshots_older_than_max_age_are_recomputed_on_request(
+    session_factory: async_sessionmaker,
+) -> None:
+    ids = await _reset(session_factory)
+    doctor_id = ids["doctors"][0]
+    today = clinic_today()
+    now = [0.0]
+    # 워커도 이벤트 구독도 없는 프로세스: 무효화 없이 나이만으로 다시 계산해야 한다.
+    store = AvailabilitySnapshotStore(horizon_days=2, max_age_seconds=30.0, clock=lambda: now[0])
+    first = await store.get_or_compute(session_factory, doctor_id, today)
+
+    # 다른 프로세스(관리자 API 등)가 남긴 변경: 이 저장소에는 알림이 오지 않는다.
+    async with session_factory() as session:
+        start_at = datetime.combine(today, time(9, 0))
+        session.add(
+            Appointment(
+                patient_id=ids["patients"][0],
+                doctor_id=doctor_id,
+                treatment_id=ids["treatment"],
+                start_at=start_at,
+                end_at=start_at + timedelta(minutes=30),
+                status=AppointmentStatus.PENDING,
+                visit_type=VisitType.FIRST,
+            )
+        )
+        await session.commit()
+
+    now[0] = 29.9
+    assert await store.get_or_compute(session_factory, doctor_id, today) == first
+
+    now[0] = 30.0
+    assert store.get(doctor_id, today) is None
+    refreshed = await store.get_or_compute(session_factory, doctor_id, today)
+    assert refreshed.version > first.version
+    assert len(refreshed.slots) == len(first.slots) - 1
+
+
+@pytest.mark.asyncio
+async def test_worker_refreshes_invalidated_days_when_woken(
+    session_factory: async_sessionmaker,
+) -> None:
+    await _reset(session_factory)
+    runs: list[int] = []
+
+    async def job() -> None:
+        runs.append(await snapshot_store.refresh_due(session_factory))
+
+    async def wait_for_runs(count: int) -> None:
+        for _ in range(200):
+            if len(runs) >= count:
+                return
+            await asyncio.sleep(0.01)
+
+    worker = PeriodicWorker("snapshot-test", job, interval=60)
+    snapshot_store.on_invalidate = worker.wake
+    try:
+        worker.start()
+        await wait_for_runs(1)
+        assert runs == [snapshot_store.horizon_days]
+
+        snapshot_store.invalidate([clinic_today()])
+        await wait_for_runs(2)
+        assert runs == [snapshot_store.horizon_days, 1]
+    finally:
+        snapshot_store.on_invalidate = None
+        await worker.stop()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.core.exceptions import (
+    BookingQueueFullError,
+    BookingQueueTimeoutError,
+    ReservationConflictError,
+)
+from Assignment1.app.services.booking_queue import BookingScheduler
+
+
+class _Savepoint:
+    def __init__(self, log: list[str]) -> None:
+        self.log = log
+
+    async def __aenter__(self) -> None:
+        self.log.append("savepoint")
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        self.log.append("rollback" if exc_type else "release")
+        return False
+
+
+class _Session:
+    """Records the transaction calls the scheduler makes."""
+
+    def __init__(self, log: list[str]) -> None:
+        self.log = log
+        self.info: dict = {}
+
+    async def __aenter__(self) -> "_Session":
+        return self
+
+    async def __aexit__(self, *exc_info) -> bool:
+        return False
+
+    def begin_nested(self) -> _Savepoint:
+        return _Savepoint(self.log)
+
+    async def commit(self) -> None:
+        self.log.append("commit")
+
+
+def _scheduler(log: list[str], **kwargs) -> BookingScheduler:
+    return BookingScheduler(lambda: _Session(log), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_same_key_jobs_run_in_order_and_commit_together() -> None:
+    log: list[str] = []
+    scheduler = _scheduler(log, batch_size=8)
+    key = scheduler.key_for(1, date(2030, 1, 7))
+
+    def job(name: str, *, fail: bool = False):
+        async def operation(session) -> str:
+            log.append(f"start {name}")
+            await asyncio.sleep(0)
+            log.append(f"end {name}")
+            if fail:
+                raise ReservationConflictError("Doctor is already booked for this period")
+            return name
+
+        return operation
+
+    results = await asyncio.gather(
+        scheduler.submit(key, job("a")),
+        scheduler.submit(key, job("b", fail=True)),
+        scheduler.submit(key, job("c")),
+        return_exceptions=True,
+    )
+
+    assert results[0] == "a" and results[2] == "c"
+    assert isinstance(results[1], ReservationConflictError)
+    # 실패한 작업은 자기 savepoint만 되돌리고 나머지는 한 번에 커밋된다.
+    assert log == [
+        "savepoint", "start a", "end a", "release",
+        "savepoint", "start b", "end b", "rollback",
+        "savepoint", "start c", "end c", "release",
+        "commit",
+    ]
+    assert scheduler.pending(key) == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_in_parallel() -> None:
+    scheduler = _scheduler([])
+    both_started = asyncio.Event()
+    started: list[int] = []
+
+    def job(doctor_id: int):
+        async def operation(session) -> int:
+            started.append(doctor_id)
+            if len(started) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), timeout=1)
+            return doctor_id
+
+        return operation
+
+    day = date(2030, 1, 7)
+    assert await asyncio.gather(
+        scheduler.submit(scheduler.key_for(1, day), job(1)),
+        scheduler.submit(scheduler.key_for(2, day), job(2)),
+    ) == [1, 2]
+
+    per_day = _scheduler([], key_mode="day")
+    assert per_day.key_for(1, day) == per_day.key_for(2, day)
+
+
+@pytest.mark.asyncio
+async def test_waits_are_bounded_by_timeout_and_queue_size() -> None:
+    log: list[str] = []
+    scheduler = _scheduler(log, timeout_seconds=0.05, max_pending=1)
+    key = scheduler.key_for(1, date(2030, 1, 7))
+    release = asyncio.Event()
+
+    async def slow(session) -> str:
+        await release.wait()
+        return "slow"
+
+    async def queued(session) -> str:
+        log.append("queued ran")
+        return "queued"
+
+    slow_task = asyncio.create_task(scheduler.submit(key, slow))
+    await asyncio.sleep(0)
+    queued_task = asyncio.create_task(scheduler.submit(key, queued))
+    await asyncio.sleep(0)
+    with pytest.raises(BookingQueueFullError):
+        await scheduler.submit(key, queued)
+
+    with pytest.raises(BookingQueueTimeoutError):
+        await queued_task
+    # 이미 시작한 작업은 커밋될 수 있으므로 시간 초과 없이 끝까지 기다린다.
+    assert not slow_task.done()
+
+    release.set()
+    assert await slow_task == "slow"
+    for _ in range(20):
+        if scheduler.pending(key) == 0:
+            break
+        await asyncio.sleep(0.01)
+    # 시작 전에 시간 초과된 작업은 실행되지 않는다.
+    assert "queued ran" not in log
+
+
+@pytest.mark.asyncio
+async def test_queued_bookings_for_one_slot_never_error(
+    patient_client: AsyncClient,
+    seed_patient_data: dict[str, int | str],
+    monkeypatch: pytest.MonkeyPatch,
+    assert_query_budget,
+) -> None:
+    monkeypatch.setattr(get_settings(), "booking_queue_mode", "day")
+    payload = {
+        "patient_id": seed_patient_data["patient_id"],
+        "doctor_id": seed_patient_data["doctor_id"],
+        "treatment_id": seed_patient_data["treatment_id"],
+        "start_at": f"{seed_patient_data['date']}T10:00:00",
+    }
+
+    responses = await asyncio.gather(
+        *(patient_client.post("/api/v1/patient/appointments", json=payload) for _ in range(6))
+    )
+
+    statuses = sorted(resp.status_code for resp in responses)
+    assert statuses == [201, 409, 409, 409, 409, 409]
+    created = next(resp for resp in responses if resp.status_code == 201)
+    assert created.json()["start_at"].startswith(f"{seed_patient_data['date']}T10:00")
+    # 큐에서 실행된 쿼리도 요청의 Server-Timing에 집계된다(첫 요청은 슬롯 일정·카탈로그 로드,
+    # 첫 방문 환자의 보관 이력 확인 포함).
+    assert assert_query_budget(created, 20) >= 5
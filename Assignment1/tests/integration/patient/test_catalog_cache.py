@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from Assignment1.app.db import Doctor
+from Assignment1.app.services.catalog_cache import (
+    CATALOG_LOOKUPS,
+    CatalogCache,
+    bump_catalog_version,
+)
+
+
+def _lookups() -> dict[str, float]:
+    return {
+        result: CATALOG_LOOKUPS.value(result)
+        for result in ("hit", "revalidated", "fetched", "reload")
+    }
+
+
+@pytest.mark.asyncio
+async def test_admin_edits_show_up_on_the_patient_api_after_commit(
+    admin_client: AsyncClient,
+    patient_client: AsyncClient,
+    seed_patient_data: dict[str, int | str],
+) -> None:
+    doctor_url = f"/api/v1/admin/doctors/{seed_patient_data['doctor_id']}"
+    doctors = (await patient_client.get("/api/v1/patient/doctors")).json()
+    original = next(doc for doc in doctors if doc["id"] == seed_patient_data["doctor_id"])
+    before = _lookups()
+
+    try:
+        assert (await admin_client.patch(doctor_url, json={"name": "Dr. Cached"})).status_code == 200
+        renamed = (await patient_client.get("/api/v1/patient/doctors")).json()
+        assert {"id": original["id"], "name": "Dr. Cached", "department": original["department"]} in renamed
+
+        assert (await admin_client.patch(doctor_url, json={"is_active": False})).status_code == 200
+        by_department = await patient_client.get(
+            "/api/v1/patient/doctors", params={"department": original["department"]}
+        )
+        assert original["id"] not in {doc["id"] for doc in by_department.json()}
+        booking = await patient_client.post(
+            "/api/v1/patient/appointments",
+            json={
+                "patient_id": seed_patient_data["patient_id"],
+                "doctor_id": seed_patient_data["doctor_id"],
+                "treatment_id": seed_patient_data["treatment_id"],
+                "start_at": f"{seed_patient_data['date']}T10:00:00",
+            },
+        )
+        assert booking.status_code == 400
+        assert booking.json()["code"] == "DOCTOR_INACTIVE"
+    finally:
+        await admin_client.patch(doctor_url, json={"name": original["name"], "is_active": True})
+
+    after = _lookups()
+    # 관리자 수정마다 한 번 다시 읽고, 같은 카탈로그로 이어지는 예약은 캐시에서 끝난다.
+    assert after["reload"] - before["reload"] == 2
+    assert after["hit"] - before["hit"] == 1
+
+
+@pytest.mark.asyncio
+async def test_edits_from_another_process_are_visible_within_ttl(
+    session_factory: async_sessionmaker,
+    seed_patient_data: dict[str, int | str],
+) -> None:
+    now = [0.0]
+    cache = CatalogCache(ttl_seconds=5.0, clock=lambda: now[0])
+    doctor_id = seed_patient_data["doctor_id"]
+    before = _lookups()
+
+    async with session_factory() as session:
+        original = (await cache.load(session)).doctors[doctor_id].name
+
+    # 다른 프로세스의 관리자 API가 이름을 바꾸고 버전을 올린 상황
+    async with session_factory() as session:
+        await session.execute(update(Doctor).where(Doctor.id == doctor_id).values(name="Dr. Elsewhere"))
+        await bump_catalog_version(session)
+        await session.commit()
+
+    try:
+        now[0] = 4.9
+        async with session_factory() as session:
+            assert (await cache.load(session)).doctors[doctor_id].name == original
+        now[0] = 5.1
+        async with session_factory() as session:
+            assert (await cache.load(session)).doctors[doctor_id].name == "Dr. Elsewhere"
+        now[0] = 10.2
+        async with session_factory() as session:
+            assert (await cache.load(session)).doctors[doctor_id].name == "Dr. Elsewhere"
+    finally:
+        async with session_factory() as session:
+            await session.execute(update(Doctor).where(Doctor.id == doctor_id).values(name=original))
+            await bump_catalog_version(session)
+            await session.commit()
+
+    after = _lookups()
+    assert after["reload"] - before["reload"] == 2
+    assert after["hit"] - before["hit"] == 1
+    assert after["revalidated"] - before["revalidated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_ids_are_fetched_once_instead_of_reloading(
+    session_factory: async_sessionmaker,
+    seed_patient_data: dict[str, int | str],
+) -> None:
+    now = [0.0]
+    cache = CatalogCache(ttl_seconds=5.0, clock=lambda: now[0])
+    async with session_factory() as session:
+        await cache.load(session)
+    before = _lookups()
+
+    # 존재하지 않는 ID를 반복해도 카탈로그 전체를 다시 읽지 않는다.
+    for _ in range(3):
+        async with session_factory() as session:
+            catalog = await cache.load(session, doctor_ids=(999_999,))
+        assert 999_999 not in catalog.doctors
+
+    # 관리자 API를 거치지 않고 넣은 행은 그 ID만 읽어 채운다.
+    async with session_factory() as session:
+        late = Doctor(name="Dr. Around The API", department="Surgery")
+        session.add(late)
+        await session.commit()
+    try:
+        async with session_factory() as session:
+            catalog = await cache.load(session, doctor_ids=(late.id,))
+        assert catalog.doctors[late.id].name == "Dr. Around The API"
+        assert late.id in {doctor.id for doctor in catalog.doctors_in("Surgery")}
+
+        after = _lookups()
+        assert after["reload"] - before["reload"] == 0
+        assert after["fetched"] - before["fetched"] == 2
+        assert after["hit"] - before["hit"] == 2
+
+        # 없다고 기억한 ID는 TTL이 지나 재확인할 때 다시 찾아본다.
+        now[0] = 5.1
+        async with session_factory() as session:
+            await cache.load(session, doctor_ids=(999_999,))
+        assert _lookups()["fetched"] - after["fetched"] == 1
+    finally:
+        async with session_factory() as session:
+            await session.delete(await session.get(Doctor, late.id))
+            await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cold_loads_reload_the_catalog_once(
+    session_factory: async_sessionmaker,
+    seed_patient_data: dict[str, int | str],
+) -> None:
+    now = [0.0]
+    cache = CatalogCache(ttl_seconds=5.0, clock=lambda: now[0])
+    before = _lookups()
+
+    async def load():
+        async with session_factory() as session:
+            return await cache.load(session)
+
+    # 캐시가 비어 있을 때 몰린 요청들은 한 번만 읽고 나머지는 그 결과를 기다린다.
+    catalogs = await asyncio.gather(*(load() for _ in range(10)))
+    assert len({id(catalog) for catalog in catalogs}) == 1
+    after = _lookups()
+    assert after["reload"] - before["reload"] == 1
+    assert after["hit"] - before["hit"] == 9
+
+    # TTL이 지나 몰린 요청들도 버전은 한 번만 확인한다.
+    now[0] = 5.1
+    catalogs = await asyncio.gather(*(load() for _ in range(10)))
+    assert all(catalog is catalogs[0] for catalog in catalogs)
+    again = _lookups()
+    assert again["revalidated"] - after["revalidated"] == 1
+    assert again["hit"] - after["hit"] == 9
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.db import Appointment
+from Assignment1.app.services.availability_snapshots import AvailabilitySnapshotStore
+from Assignment1.app.services.slot_rules import (
+    available_windows,
+    expand_reservation,
+    to_clinic_aware,
+    to_clinic_local,
+)
+
+
+@pytest.mark.asyncio
+async def test_api_converts_between_utc_and_clinic_time(
+    patient_client: AsyncClient,
+    session_factory: async_sessionmaker,
+    seed_patient_data: dict[str, int | str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(get_settings(), "clinic_timezone", "Asia/Seoul")
+    day = seed_patient_data["date"]
+
+    availability = await patient_client.get(
+        "/api/v1/patient/availability",
+        params={"doctor_id": seed_patient_data["doctor_id"], "date": day},
+    )
+    assert availability.status_code == 200
+    starts = [slot["start_at"] for slot in availability.json()["slots"]]
+    assert f"{day}T10:00:00+09:00" in starts
+    assert all(start.endswith("+09:00") for start in starts)
+
+    # 01:00Z는 서울 10:00이므로 10:00-10:30 병원 슬롯에 예약된다.
+    created = await patient_client.post(
+        "/api/v1/patient/appointments",
+        json={
+            "patient_id": seed_patient_data["patient_id"],
+            "doctor_id": seed_patient_data["doctor_id"],
+            "treatment_id": seed_patient_data["treatment_id"],
+            "start_at": f"{day}T01:00:00Z",
+        },
+    )
+    assert created.status_code == 201
+    assert created.json()["start_at"] == f"{day}T10:00:00+09:00"
+    assert created.json()["end_at"] == f"{day}T10:30:00+09:00"
+
+    async with session_factory() as session:
+        stored = await session.scalar(select(Appointment.start_at))
+    assert stored.replace(tzinfo=None) == datetime.combine(date.fromisoformat(day), time(10, 0))
+
+
+def test_slot_arithmetic_ignores_dst_transitions(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "clinic_timezone", "America/New_York")
+    # 2030-03-10 02:00에 서머타임이 시작되어 벽시계가 03:00으로 건너뛴다.
+    transition = date(2030, 3, 10)
+    slots = [
+        SimpleNamespace(id=index, start_time=time(hour, 0), end_time=time(hour, 30), capacity=1)
+        for index, hour in enumerate((1, 3))
+    ] + [
+        SimpleNamespace(id=10 + index, start_time=time(hour, 30), end_time=time(hour + 1, 0), capacity=1)
+        for index, hour in enumerate((1, 3))
+    ]
+    slots.sort(key=lambda slot: slot.start_time)
+
+    windows = available_windows(transition, slots, {}, [], duration_minutes=60)
+    assert [(start.time(), end.time()) for start, end, _ in windows] == [
+        (time(1, 0), time(2, 0)),
+        (time(3, 0), time(4, 0)),
+    ]
+    # 벽시계 기준 분 단위로 계산하므로 전환 직후 예약도 정확히 1시간이다.
+    assert expand_reservation(windows[1][0], 60)[-1][1] == windows[1][1]
+
+    before, after = (to_clinic_aware(start) for start, _, _ in windows)
+    assert before.utcoffset().total_seconds() == -5 * 3600
+    assert after.utcoffset().total_seconds() == -4 * 3600
+    assert to_clinic_local(after) == windows[1][0]
+    assert to_clinic_local(datetime.fromisoformat("2030-03-10T07:00:00+00:00")) == datetime(
+        2030, 3, 10, 3, 0
+    )
+
+
+def test_snapshot_horizon_starts_on_the_clinic_date(monkeypatch: pytest.MonkeyPatch) -> None:
+    starts = {}
+    # UTC+14 와 UTC-11 은 항상 날짜가 다르므로 서버 날짜와 상관없이 구분된다.
+    for zone in ("Pacific/Kiritimati", "Pacific/Pago_Pago"):
+        monkeypatch.setattr(get_settings(), "clinic_timezone", zone)
+        store = AvailabilitySnapshotStore(horizon_days=2, max_age_seconds=30)
+        starts[zone] = store.horizon()[0]
+        assert starts[zone] == datetime.now(ZoneInfo(zone)).date()
+        assert store.in_horizon(starts[zone])
+    assert starts["Pacific/Kiritimati"] > starts["Pacific/Pago_Pago"]
@@ -5,6 +5,7 @@ from httpx import AsyncClient
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from Assignment1.app.core.config import get_settings
 from Assignment1.app.db import Doctor, Treatment
 
 
@@ -38,6 +39,56 @@ async def test_patient_doctor_directory_filters(
     assert body[0]["name"] == "Dr. Park"
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["index", "db"])
+async def test_patient_doctor_search_by_prefix_and_department(
+    mode: str,
+    patient_client: AsyncClient,
+    session_factory: async_sessionmaker,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(get_settings(), "doctor_search_mode", mode)
+    async with session_factory() as session:
+        await session.execute(delete(Doctor))
+        session.add_all(
+            [
+                Doctor(name="Dr. Park", department="Surgery", is_active=True),
+                Doctor(name="dr. parker", department="Dermatology", is_active=True),
+                Doctor(name="Dr. Pak", department="Surgery", is_active=True),
+                Doctor(name="Dr. Pa_k", department="Surgery", is_active=True),
+                Doctor(name="Dr. Parsons", department="Surgery", is_active=False),
+                Doctor(name="Dr. Choi", department="Dermatology", is_active=True),
+            ]
+        )
+        await session.commit()
+
+    async def search(**params) -> dict:
+        resp = await patient_client.get("/api/v1/patient/doctors/search", params=params)
+        assert resp.status_code == 200
+        return resp.json()
+
+    body = await search(q="DR. PAR")
+    assert [item["name"] for item in body["items"]] == ["Dr. Park", "dr. parker"]
+    assert body["total"] == 2
+
+    surgery = await search(q="dr. pa", department="Surgery")
+    assert [item["name"] for item in surgery["items"]] == ["Dr. Pa_k", "Dr. Pak", "Dr. Park"]
+
+    # LIKE 와일드카드는 글자 그대로 비교한다.
+    assert [item["name"] for item in (await search(q="Dr. Pa_"))["items"]] == ["Dr. Pa_k"]
+
+    first, second = await search(limit=2), await search(limit=2, offset=4)
+    assert first["total"] == second["total"] == 5
+    assert [item["name"] for item in first["items"]] == ["Dr. Choi", "Dr. Pa_k"]
+    assert [item["name"] for item in second["items"]] == ["dr. parker"]
+    assert (await search(q="Dr. Kim"))["items"] == []
+
+    invalid = await patient_client.get(
+        "/api/v1/patient/doctors/search", params={"limit": 0}
+    )
+    assert invalid.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_patient_treatment_directory_lists_active_only(
     patient_client: AsyncClient,
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from Assignment1.app.db import (
+    Appointment,
+    Base,
+    Doctor,
+    HospitalSlot,
+    IdempotencyKey,
+    Patient,
+    Treatment,
+)
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.db.session import SessionRouter, get_session_router
+from Assignment1.app.routers.patient import appointments as appointments_router
+from Assignment1.app.services import booking_queue
+from Assignment1.app.services.catalog_cache import catalog_cache
+from Assignment1.app.services.idempotency import purge_expired_keys
+from Assignment1.main_patient import create_app
+
+
+def _booking(seed: dict, start: str = "10:00:00") -> dict:
+    return {
+        "patient_id": seed["patient_id"],
+        "doctor_id": seed["doctor_id"],
+        "treatment_id": seed["treatment_id"],
+        "start_at": f"{seed['date']}T{start}",
+    }
+
+
+async def _count(session_factory: async_sessionmaker, model) -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(model))
+
+
+@pytest.mark.asyncio
+async def test_retried_booking_replays_the_original_response(
+    patient_client: AsyncClient,
+    session_factory: async_sessionmaker,
+    seed_patient_data: dict[str, int | str],
+    assert_query_budget,
+) -> None:
+    headers = {"Idempotency-Key": "booking-retry-1"}
+    first = await patient_client.post(
+        "/api/v1/patient/appointments", json=_booking(seed_patient_data), headers=headers
+    )
+    assert first.status_code == 201
+    assert "idempotent-replayed" not in first.headers
+
+    retry = await patient_client.post(
+        "/api/v1/patient/appointments", json=_booking(seed_patient_data), headers=headers
+    )
+    assert retry.status_code == 201
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+    assert_query_budget(retry, 1)
+    assert await _count(session_factory, Appointment) == 1
+
+    # 같은 키를 다른 요청에 재사용하면 거절한다.
+    reused = await patient_client.post(
+        "/api/v1/patient/appointments",
+        json=_booking(seed_patient_data, start="10:30:00"),
+        headers=headers,
+    )
+    assert reused.status_code == 422
+    assert reused.json()["code"] == "IDEMPOTENCY_KEY_REUSED"
+
+    cancel_headers = {"Idempotency-Key": "cancel-retry-1"}
+    cancel_url = f"/api/v1/patient/appointments/{first.json()['id']}/cancel"
+    params = {"patient_id": seed_patient_data["patient_id"]}
+    cancelled = await patient_client.post(cancel_url, params=params, headers=cancel_headers)
+    cancel_retry = await patient_client.post(cancel_url, params=params, headers=cancel_headers)
+    assert cancelled.status_code == cancel_retry.status_code == 200
+    assert cancel_retry.headers["idempotent-replayed"] == "true"
+    assert cancel_retry.json() == cancelled.json()
+
+
+@pytest.mark.asyncio
+async def test_failed_requests_release_their_key(
+    patient_client: AsyncClient,
+    session_factory: async_sessionmaker,
+    seed_patient_data: dict[str, int | str],
+) -> None:
+    headers = {"Idempotency-Key": "booking-after-failure"}
+    payload = _booking(seed_patient_data)
+    async with session_factory() as session:
+        treatment = await session.get(Treatment, seed_patient_data["treatment_id"])
+        treatment.is_active = True
+        doctor = await session.get(Doctor, seed_patient_data["doctor_id"])
+        doctor.is_active = False
+        await session.commit()
+
+    try:
+        failed = await patient_client.post(
+            "/api/v1/patient/appointments", json=payload, headers=headers
+        )
+        assert failed.status_code == 400
+    finally:
+        async with session_factory() as session:
+            doctor = await session.get(Doctor, seed_patient_data["doctor_id"])
+            doctor.is_active = True
+            await session.commit()
+        # 관리자 API를 거치지 않은 변경이므로 카탈로그 캐시를 직접 비운다.
+        catalog_cache.clear()
+
+    retried = await patient_client.post(
+        "/api/v1/patient/appointments", json=payload, headers=headers
+    )
+    assert retried.status_code == 201
+    assert "idempotent-replayed" not in retried.headers
+
+
+@pytest.mark.asyncio
+async def test_queued_booking_that_outlives_the_timeout_is_replayed(
+    patient_client: AsyncClient,
+    session_factory: async_sessionmaker,
+    seed_patient_data: dict[str, int | str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "booking_queue_mode", "doctor")
+    monkeypatch.setattr(settings, "booking_queue_timeout_seconds", 0.05)
+    monkeypatch.setattr(booking_queue, "_schedulers", {})
+    create_reservation = appointments_router.create_reservation
+
+    async def slow_create_reservation(session, **kwargs):
+        # 배치에서 시작한 뒤 대기 시간 초과를 넘겨서야 커밋된다.
+        await asyncio.sleep(0.2)
+        return await create_reservation(session, **kwargs)
+
+    monkeypatch.setattr(appointments_router, "create_reservation", slow_create_reservation)
+    headers = {"Idempotency-Key": "queued-slow-booking"}
+
+    first = await patient_client.post(
+        "/api/v1/patient/appointments", json=_booking(seed_patient_data), headers=headers
+    )
+    assert first.status_code == 201
+    async with session_factory() as session:
+        stored = await session.scalar(
+            select(IdempotencyKey.status_code).where(
+                IdempotencyKey.key == headers["Idempotency-Key"]
+            )
+        )
+    # 응답은 예약과 같은 배치 커밋에 기록된다.
+    assert stored == 201
+
+    retry = await patient_client.post(
+        "/api/v1/patient/appointments", json=_booking(seed_patient_data), headers=headers
+    )
+    assert retry.status_code == 201
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+    assert await _count(session_factory, Appointment) == 1
+
+
+@pytest.mark.asyncio
+async def test_purge_removes_only_expired_keys(session_factory: async_sessionmaker) -> None:
+    now = datetime.utcnow()
+    async with session_factory() as session:
+        await session.execute(delete(IdempotencyKey))
+        session.add_all(
+            [
+                IdempotencyKey(
+                    scope="test", key="expired", request_hash="x", expires_at=now - timedelta(minutes=1)
+                ),
+                IdempotencyKey(
+                    scope="test", key="live", request_hash="x", expires_at=now + timedelta(hours=1)
+                ),
+            ]
+        )
+        await session.commit()
+
+    assert await purge_expired_keys(session_factory) == 1
+    async with session_factory() as session:
+        remaining = (await session.scalars(select(IdempotencyKey.key))).all()
+    assert remaining == ["live"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_book_once(tmp_path: Path) -> None:
+    # 공유 커넥션(StaticPool)으로는 동시 트랜잭션을 재현할 수 없어 파일 DB를 따로 쓴다.
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'idempotency.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        doctor = Doctor(name="Dr. Idem", department="Derm")
+        patient = Patient(name="Idem Patient", phone="010-9999-0000")
+        treatment = Treatment(name="Idem Care", duration_minutes=30, price=1000)
+        session.add_all(
+            [doctor, patient, treatment, HospitalSlot(start_time=time(10, 0), end_time=time(10, 30), capacity=1)]
+        )
+        await session.commit()
+        payload = {
+            "patient_id": patient.id,
+            "doctor_id": doctor.id,
+            "treatment_id": treatment.id,
+            "start_at": f"{date.today().isoformat()}T10:00:00",
+        }
+
+    app = create_app()
+    router = SessionRouter(factory)
+    app.dependency_overrides[get_session_router] = lambda: router
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://testserver"
+        ) as client:
+            responses = await asyncio.gather(
+                *(
+                    client.post(
+                        "/api/v1/patient/appointments",
+                        json=payload,
+                        headers={"Idempotency-Key": "double-tap"},
+                    )
+                    for _ in range(4)
+                )
+            )
+        assert [resp.status_code for resp in responses] == [201] * 4
+        assert len({resp.json()["id"] for resp in responses}) == 1
+        assert sum("idempotent-replayed" in resp.headers for resp in responses) == 3
+        assert await _count(factory, Appointment) == 1
+    finally:
+        await engine.dispose()
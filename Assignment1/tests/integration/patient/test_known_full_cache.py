@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from Assignment1.app.db import Doctor
+from Assignment1.app.services.known_full import PRECHECK_REJECTIONS, KnownFullCache
+
+
+def _booking(seed: dict, doctor_id: int) -> dict:
+    return {
+        "patient_id": seed["patient_id"],
+        "doctor_id": doctor_id,
+        "treatment_id": seed["treatment_id"],
+        "start_at": f"{seed['date']}T10:00:00",
+    }
+
+
+async def _second_doctor(session_factory: async_sessionmaker) -> int:
+    async with session_factory() as session:
+        doctor = await session.scalar(select(Doctor).where(Doctor.name == "Dr. Full"))
+        if doctor is None:
+            doctor = Doctor(name="Dr. Full", department="Dermatology")
+            session.add(doctor)
+            await session.commit()
+        return doctor.id
+
+
+@pytest.mark.asyncio
+async def test_repeated_conflicts_are_rejected_before_the_database(
+    patient_client: AsyncClient,
+    session_factory: async_sessionmaker,
+    seed_patient_data: dict[str, int | str],
+    assert_query_budget,
+) -> None:
+    other_doctor = await _second_doctor(session_factory)
+    url = "/api/v1/patient/appointments"
+    booked = await patient_client.post(url, json=_booking(seed_patient_data, seed_patient_data["doctor_id"]))
+    assert booked.status_code == 201
+
+    doctor_hits = PRECHECK_REJECTIONS.value("doctor")
+    slot_hits = PRECHECK_REJECTIONS.value("slot")
+
+    # 첫 실패는 DB 검사로 판정되고, 같은 요청의 재시도부터는 캐시로 거절된다.
+    busy = await patient_client.post(url, json=_booking(seed_patient_data, seed_patient_data["doctor_id"]))
+    busy_again = await patient_client.post(url, json=_booking(seed_patient_data, seed_patient_data["doctor_id"]))
+    assert busy.status_code == busy_again.status_code == 409
+    assert busy_again.json()["message"] == busy.json()["message"]
+    assert PRECHECK_REJECTIONS.value("doctor") == doctor_hits + 1
+    # 치료/의사/환자 조회만 남고 잠금을 잡는 검사 쿼리는 실행되지 않는다.
+    assert assert_query_budget(busy_again, 3) < assert_query_budget(busy, 10)
+
+    # 10:00 슬롯 정원이 1이라 다른 의사도 병원 정원 초과로 거절된다.
+    full = await patient_client.post(url, json=_booking(seed_patient_data, other_doctor))
+    full_again = await patient_client.post(url, json=_booking(seed_patient_data, other_doctor))
+    assert full.status_code == full_again.status_code == 409
+    assert full_again.json()["message"] == "Hospital capacity exceeded for selected slot"
+    assert PRECHECK_REJECTIONS.value("slot") == slot_hits + 1
+
+    cancelled = await patient_client.post(
+        f"{url}/{booked.json()['id']}/cancel",
+        params={"patient_id": seed_patient_data["patient_id"]},
+    )
+    assert cancelled.status_code == 200
+    rebooked = await patient_client.post(url, json=_booking(seed_patient_data, other_doctor))
+    assert rebooked.status_code == 201
+
+
+def test_entries_expire_after_ttl_and_release_per_day() -> None:
+    now = [100.0]
+    cache = KnownFullCache(ttl_seconds=5, clock=lambda: now[0])
+    day = date(2030, 1, 7)
+    start, end = datetime.combine(day, time(10)), datetime.combine(day, time(10, 30))
+    slot = (time(10), time(10, 30))
+
+    cache.mark_doctor_busy(1, start, end)
+    cache.mark_slot_full(day, slot)
+    cache.mark_slot_full(date(2030, 1, 8), slot)
+    assert cache.doctor_busy(1, start, end)
+    assert not cache.doctor_busy(2, start, end)
+    assert cache.full_slot(day, [slot])
+
+    cache.release(day)
+    assert not cache.doctor_busy(1, start, end)
+    assert not cache.full_slot(day, [slot])
+    assert cache.full_slot(date(2030, 1, 8), [slot])
+
+    now[0] += 5
+    assert not cache.full_slot(date(2030, 1, 8), [slot])
+    assert len(cache) == 0
+
+    disabled = KnownFullCache(ttl_seconds=0)
+    disabled.mark_slot_full(day, slot)
+    assert not disabled.full_slot(day, [slot])
@@ -1,7 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+from datetime import date, time
+from pathlib import Path
+
 import pytest
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from Assignment1.app.db import Base, Doctor, HospitalSlot, Patient, Treatment
+from Assignment1.app.db.session import SessionRouter, get_session_router
+from Assignment1.main_patient import create_app
 
 
 @pytest.mark.asyncio
@@ -28,3 +37,52 @@ async def test_patient_reservation_conflict_capacity(
     assert second_resp.status_code == 409
     detail = second_resp.json()["message"].lower()
     assert ("capacity" in detail) or ("booked" in detail)
+
+
+
+@pytest.mark.asyncio
+async def test_concurrent_bookings_of_one_doctor_time_return_409(tmp_path: Path) -> None:
+    # 공유 인메모리 연결이 아니라 요청마다 연결을 따로 쓰는 파일 DB: 여러 요청이 모두 중복
+    # 검사를 통과한 뒤 INSERT 에서 uq_doctor_start_at 에 걸리는 경합이 실제로 일어난다.
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'race.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        doctor = Doctor(name="Dr. Race", department="Dermatology")
+        treatment = Treatment(name="Race Care", duration_minutes=30, price=1000)
+        patients = [Patient(name=f"Racer {i}", phone=f"010-5555-000{i}") for i in range(8)]
+        slot = HospitalSlot(start_time=time(10, 0), end_time=time(10, 30), capacity=8)
+        session.add_all([doctor, treatment, *patients, slot])
+        await session.commit()
+
+    app = create_app()
+    router = SessionRouter(factory)
+    app.dependency_overrides[get_session_router] = lambda: router
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://testserver"
+        ) as client:
+            responses = await asyncio.gather(
+                *(
+                    client.post(
+                        "/api/v1/patient/appointments",
+                        json={
+                            "patient_id": patient.id,
+                            "doctor_id": doctor.id,
+                            "treatment_id": treatment.id,
+                            "start_at": f"{date.today().isoformat()}T10:00:00",
+                        },
+                    )
+                    for patient in patients
+                )
+            )
+    finally:
+        await engine.dispose()
+
+    assert sorted(response.status_code for response in responses) == [201] + [409] * 7
+    assert all(
+        "booked" in response.json()["message"].lower()
+        for response in responses
+        if response.status_code == 409
+    )
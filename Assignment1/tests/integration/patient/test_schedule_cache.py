@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from Assignment1.app.services.hospital_schedule import ScheduleCache, bump_schedule_version
+
+
+@pytest.mark.asyncio
+async def test_schedule_version_is_checked_once_per_ttl_and_reloads_are_single_flight(
+    async_engine: AsyncEngine,
+    session_factory: async_sessionmaker,
+    seed_patient_data: dict[str, int | str],
+) -> None:
+    now = [0.0]
+    cache = ScheduleCache(ttl_seconds=5.0, clock=lambda: now[0])
+    queries: Counter[str] = Counter()
+
+    def count(conn, cursor, statement, parameters, context, executemany) -> None:
+        if "FROM hospital_slots" in statement:
+            queries["reload"] += 1
+        elif "FROM system_configs" in statement:
+            queries["version"] += 1
+
+    async def load():
+        async with session_factory() as session:
+            return await cache.load(session)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        # 캐시가 비어 있을 때 몰린 요청들은 한 번만 읽는다.
+        schedules = await asyncio.gather(*(load() for _ in range(10)))
+        assert len({id(schedule) for schedule in schedules}) == 1
+        assert queries == {"version": 1, "reload": 1}
+
+        now[0] = 4.9
+        await load()
+        assert queries == {"version": 1, "reload": 1}
+
+        # TTL이 지나면 버전만 확인하고, 바뀌지 않았으면 같은 표를 계속 쓴다.
+        now[0] = 5.1
+        assert await load() is schedules[0]
+        assert queries == {"version": 2, "reload": 1}
+
+        # 다른 프로세스가 버전을 올린 상황
+        async with session_factory() as session:
+            await bump_schedule_version(session)
+            await session.commit()
+        queries.clear()
+        now[0] = 10.2
+        assert await load() is not schedules[0]
+        assert queries == {"version": 1, "reload": 1}
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
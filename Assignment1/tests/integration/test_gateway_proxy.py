@@ -149,3 +149,19 @@ async def test_gateway_healthz(gateway_client: AsyncClient):
     resp = await gateway_client.get("/healthz")
     assert resp.status_code == 200
     assert resp.json()["gateway"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_gateway_metrics_label_upstream_target(gateway_client: AsyncClient):
+    await gateway_client.get("/api/v1/admin/doctors")
+
+    resp = await gateway_client.get("/metrics")
+    assert resp.status_code == 200
+    assert (
+        'gateway_upstream_requests_total{upstream="admin",method="GET",status="200"}'
+        in resp.text
+    )
+    assert (
+        'http_requests_total{service="gateway",method="GET",'
+        'route="/api/v1/admin/{sub_path:path}",status="200"}' in resp.text
+    )
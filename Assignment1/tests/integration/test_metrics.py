@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+from httpx import AsyncClient
+
+from Assignment1.app.core.metrics import HTTP_LATENCY, HTTP_REQUESTS, MetricsRegistry
+
+
+@pytest.mark.asyncio
+async def test_patient_metrics_use_route_templates(
+    patient_client: AsyncClient,
+    seed_patient_data: dict[str, int | str],
+) -> None:
+    route = "/api/v1/patient/appointments/{appointment_id}/cancel"
+    before = HTTP_REQUESTS.value("patient", "POST", route, "409")
+
+    resp = await patient_client.post(
+        "/api/v1/patient/appointments/999999/cancel",
+        params={"patient_id": seed_patient_data["patient_id"]},
+    )
+    assert resp.status_code == 409
+    assert HTTP_REQUESTS.value("patient", "POST", route, "409") == before + 1
+    assert HTTP_LATENCY.count("patient", "POST", route) >= 1
+
+    metrics = await patient_client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain")
+    assert (
+        'http_requests_total{service="patient",method="POST",'
+        f'route="{route}",status="409"}}'
+    ) in metrics.text
+    assert "# TYPE http_request_duration_seconds histogram" in metrics.text
+
+
+@pytest.mark.asyncio
+async def test_admin_metrics_endpoint(admin_client: AsyncClient) -> None:
+    await admin_client.get("/api/v1/admin/stats/summary")
+
+    metrics = await admin_client.get("/metrics")
+    assert metrics.status_code == 200
+    assert (
+        'http_request_duration_seconds_count{service="admin",method="GET",'
+        'route="/api/v1/admin/stats/summary"}'
+    ) in metrics.text
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Demo.", ("route",), buckets=(0.1, 1.0))
+    counter = registry.counter("demo_total", "Demo.", ("route",))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, "/x")
+    counter.inc('/quote"d')
+
+    lines = registry.render().splitlines()
+    assert 'demo_seconds_bucket{route="/x",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/x",le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{route="/x",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{route="/x"} 3' in lines
+    assert 'demo_total{route="/quote\\"d"} 1' in lines
+    assert registry.counter("demo_total", "Demo.", ("route",)) is counter
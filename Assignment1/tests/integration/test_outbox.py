@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import itertools
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from Assignment1.app.db import OutboxDeadLetter, OutboxEvent, OutboxGap, SystemConfig
+from Assignment1.app.services.admin_appointments import (
+    APPOINTMENT_EVENTS,
+    rollup_appointment_event,
+)
+from Assignment1.app.services.outbox import (
+    APPOINTMENT_CANCELLED,
+    APPOINTMENT_CREATED,
+    APPOINTMENT_STATUS_CHANGED,
+    OUTBOX_LAG,
+    OutboxDispatcher,
+    OutboxMessage,
+    consumer_name,
+)
+
+_consumers = itertools.count(1)
+
+
+def _consumer() -> str:
+    return f"test-{next(_consumers)}"
+
+
+async def _max_event_id(session_factory: async_sessionmaker) -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(func.max(OutboxEvent.id))) or 0
+
+
+async def _book(client: AsyncClient, seed: dict, start: str = "10:00:00"):
+    return await client.post(
+        "/api/v1/patient/appointments",
+        json={
+            "patient_id": seed["patient_id"],
+            "doctor_id": seed["doctor_id"],
+            "treatment_id": seed["treatment_id"],
+            "start_at": f"{seed['date']}T{start}",
+        },
+    )
+
+
+async def _add_event(session_factory: async_sessionmaker, event_id: int | None = None) -> int:
+    async with session_factory() as session:
+        event = OutboxEvent(
+            id=event_id,
+            event_type=APPOINTMENT_CREATED,
+            aggregate_id=0,
+            payload={"status": "PENDING", "date": None},
+        )
+        session.add(event)
+        await session.commit()
+        return event.id
+
+
+@pytest.mark.asyncio
+async def test_mutations_write_events_in_their_transaction(
+    patient_client: AsyncClient,
+    admin_client: AsyncClient,
+    session_factory: async_sessionmaker,
+    seed_patient_data: dict[str, int | str],
+) -> None:
+    start_id = await _max_event_id(session_factory)
+
+    created = await _book(patient_client, seed_patient_data)
+    assert created.status_code == 201
+    appointment_id = created.json()["id"]
+    conflict = await _book(patient_client, seed_patient_data)
+    assert conflict.status_code == 409
+    confirmed = await admin_client.post(
+        f"/api/v1/admin/appointments/{appointment_id}/status", json={"status": "CONFIRMED"}
+    )
+    assert confirmed.status_code == 200
+    cancelled = await patient_client.post(
+        f"/api/v1/patient/appointments/{appointment_id}/cancel",
+        params={"patient_id": seed_patient_data["patient_id"]},
+    )
+    assert cancelled.status_code == 200
+
+    async with session_factory() as session:
+        events = (
+            await session.scalars(
+                select(OutboxEvent).where(OutboxEvent.id > start_id).order_by(OutboxEvent.id)
+            )
+        ).all()
+    # 409로 롤백된 예약은 이벤트를 남기지 않는다.
+    assert [event.event_type for event in events] == [
+        APPOINTMENT_CREATED,
+        APPOINTMENT_STATUS_CHANGED,
+        APPOINTMENT_CANCELLED,
+    ]
+    assert all(event.aggregate_id == appointment_id for event in events)
+    assert [event.payload["status"] for event in events] == ["PENDING", "CONFIRMED", "CANCELLED"]
+    assert [event.payload["previous_status"] for event in events] == [None, "PENDING", "CONFIRMED"]
+    assert events[0].payload["date"] == seed_patient_data["date"]
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_delivers_in_order_and_persists_cursor(
+    session_factory: async_sessionmaker,
+) -> None:
+    received: list[OutboxMessage] = []
+
+    async def subscriber(message: OutboxMessage) -> None:
+        received.append(message)
+
+    consumer = _consumer()
+    dispatcher = OutboxDispatcher(session_factory, consumer, [subscriber], batch_size=2)
+    assert await dispatcher.drain() == 0
+
+    ids = [await _add_event(session_factory) for _ in range(5)]
+    assert await dispatcher.drain() == 5
+    assert [message.id for message in received] == ids
+    assert await dispatcher.drain() == 0
+    assert OUTBOX_LAG.value(consumer) == 0.0
+
+    async with session_factory() as session:
+        stored = await session.scalar(
+            select(SystemConfig.value).where(SystemConfig.key == dispatcher.cursor_key)
+        )
+    assert stored == str(ids[-1])
+
+    # 재시작한 프로세스는 저장된 커서부터 이어서 받는다.
+    restarted = OutboxDispatcher(session_factory, consumer, [subscriber])
+    next_id = await _add_event(session_factory)
+    assert await restarted.drain() == 1
+    assert received[-1].id == next_id
+
+
+@pytest.mark.asyncio
+async def test_failed_delivery_is_retried_then_dead_lettered(
+    session_factory: async_sessionmaker,
+) -> None:
+    calls: list[int] = []
+    failures = {"remaining": 1}
+
+    async def flaky(message: OutboxMessage) -> None:
+        calls.append(message.id)
+        if failures["remaining"]:
+            failures["remaining"] -= 1
+            raise RuntimeError("subscriber unavailable")
+
+    dispatcher = OutboxDispatcher(session_factory, _consumer(), [flaky], max_attempts=2)
+    await dispatcher.drain()
+    first = await _add_event(session_factory)
+    second = await _add_event(session_factory)
+
+    assert await dispatcher.drain() == 0
+    assert dispatcher.cursor == first - 1
+    assert await dispatcher.drain() == 2
+    assert calls == [first, first, second]
+
+    async def broken(message: OutboxMessage) -> None:
+        raise RuntimeError("always fails")
+
+    dropping = OutboxDispatcher(session_factory, _consumer(), [broken], max_attempts=2)
+    await dropping.drain()
+    poison = await _add_event(session_factory)
+    assert await dropping.drain() == 0
+    # 최대 시도 횟수를 넘기면 뒤따르는 이벤트를 막지 않도록 dead letter 로 옮긴다.
+    assert await dropping.drain() == 1
+    assert dropping.cursor == poison
+    async with session_factory() as session:
+        dead = await session.get(OutboxDeadLetter, (dropping.consumer, poison))
+    assert dead is not None
+    assert (dead.event_type, dead.attempts) == (APPOINTMENT_CREATED, 2)
+    assert dead.payload == {"status": "PENDING", "date": None}
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_waits_for_id_gaps_and_delivers_late_commits(
+    session_factory: async_sessionmaker,
+) -> None:
+    received: list[int] = []
+
+    async def subscriber(message: OutboxMessage) -> None:
+        received.append(message.id)
+
+    consumer = _consumer()
+    dispatcher = OutboxDispatcher(session_factory, consumer, [subscriber], gap_timeout_seconds=3600)
+    await dispatcher.drain()
+    cursor = dispatcher.cursor
+    # cursor + 1은 아직 커밋되지 않은 트랜잭션이 잡고 있는 id로 본다.
+    next_id = await _add_event(session_factory, event_id=cursor + 2)
+
+    assert await dispatcher.drain() == 0
+    assert received == []
+
+    dispatcher.gap_timeout_seconds = 0
+    assert await dispatcher.drain() == 1
+    assert received == [next_id]
+    async with session_factory() as session:
+        gaps = (
+            await session.scalars(select(OutboxGap.event_id).where(OutboxGap.consumer == consumer))
+        ).all()
+    assert gaps == [cursor + 1]
+
+    # 느린 트랜잭션이 커서가 지나간 뒤에 커밋해도 (재시작한 프로세스에서도) 전달된다.
+    slow = await _add_event(session_factory, event_id=cursor + 1)
+    restarted = OutboxDispatcher(session_factory, consumer, [subscriber])
+    assert await restarted.drain() == 1
+    assert received == [next_id, slow]
+    assert await restarted.drain() == 0
+    assert received == [next_id, slow]
+    async with session_factory() as session:
+        remaining = await session.scalar(
+            select(func.count()).select_from(OutboxGap).where(OutboxGap.consumer == consumer)
+        )
+    assert remaining == 0
+
+
+def test_consumer_names_are_unique_per_process() -> None:
+    assert consumer_name("patient-api") != consumer_name("admin-api")
+    assert consumer_name("patient-api").endswith(f":{os.getpid()}")
+    assert consumer_name("patient-api", "worker-2") == "patient-api@worker-2"
+
+
+@pytest.mark.asyncio
+async def test_lag_gauge_reports_oldest_pending_event(
+    session_factory: async_sessionmaker,
+) -> None:
+    async def broken(message: OutboxMessage) -> None:
+        raise RuntimeError("down")
+
+    consumer = _consumer()
+    dispatcher = OutboxDispatcher(session_factory, consumer, [broken], max_attempts=100)
+    await dispatcher.drain()
+    async with session_factory() as session:
+        session.add(
+            OutboxEvent(
+                event_type=APPOINTMENT_CREATED,
+                aggregate_id=0,
+                payload={"status": "PENDING"},
+                created_at=datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=5),
+            )
+        )
+        await session.commit()
+
+    await dispatcher.drain()
+    assert OUTBOX_LAG.value(consumer) >= 300
+
+
+@pytest.mark.asyncio
+async def test_admin_rollup_subscriber_counts_events() -> None:
+    before = APPOINTMENT_EVENTS.value(APPOINTMENT_CANCELLED, "CANCELLED")
+    await rollup_appointment_event(
+        OutboxMessage(
+            id=1,
+            event_type=APPOINTMENT_CANCELLED,
+            aggregate_id=1,
+            payload={"status": "CANCELLED"},
+            created_at=datetime.now(timezone.utc).replace(tzinfo=None),
+        )
+    )
+    assert APPOINTMENT_EVENTS.value(APPOINTMENT_CANCELLED, "CANCELLED") == before + 1
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.core.query_stats import track_queries
+
+
+@pytest.mark.asyncio
+async def test_patient_endpoint_query_budgets(
+    patient_client: AsyncClient,
+    seed_patient_data: dict[str, int | str],
+    assert_query_budget,
+) -> None:
+    doctor_id = seed_patient_data["doctor_id"]
+    patient_id = seed_patient_data["patient_id"]
+
+    # The first request loads the catalog (version, doctors, treatments); later ones reuse it.
+    assert_query_budget(await patient_client.get("/api/v1/patient/doctors"), 3)
+    assert_query_budget(await patient_client.get("/api/v1/patient/treatments"), 0)
+    availability_params = {"doctor_id": doctor_id, "date": seed_patient_data["date"]}
+    # The first request loads the slot schedule (slots, weekly templates, date overrides).
+    assert_query_budget(
+        await patient_client.get("/api/v1/patient/availability", params=availability_params), 6
+    )
+    assert_query_budget(
+        await patient_client.get("/api/v1/patient/availability", params=availability_params), 3
+    )
+
+    booking = await patient_client.post(
+        "/api/v1/patient/appointments",
+        json={
+            "patient_id": patient_id,
+            "doctor_id": doctor_id,
+            "treatment_id": seed_patient_data["treatment_id"],
+            "start_at": f"{seed_patient_data['date']}T10:00:00",
+        },
+    )
+    assert booking.status_code == 201
+    # Includes the outbox_events insert committed with the appointment and, for a
+    # patient with no live COMPLETED visit, the archived-history check.
+    assert_query_budget(booking, 12)
+
+    # One joined query regardless of how many appointments the patient has.
+    listing = await patient_client.get(
+        "/api/v1/patient/appointments", params={"patient_id": patient_id}
+    )
+    assert_query_budget(listing, 1)
+
+    cancel = await patient_client.post(
+        f"/api/v1/patient/appointments/{booking.json()['id']}/cancel",
+        params={"patient_id": patient_id},
+    )
+    assert cancel.status_code == 200
+    assert_query_budget(cancel, 6)
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoint_query_budgets(
+    admin_client: AsyncClient,
+    seed_patient_data: dict[str, int | str],
+    assert_query_budget,
+) -> None:
+    assert_query_budget(await admin_client.get("/api/v1/admin/appointments"), 1)
+    assert_query_budget(await admin_client.get("/api/v1/admin/stats/summary"), 4)
+    assert_query_budget(await admin_client.get("/api/v1/admin/hospital-slots"), 1)
+
+
+@pytest.mark.asyncio
+async def test_slow_requests_are_logged(
+    patient_client: AsyncClient,
+    seed_patient_data: dict[str, int | str],
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # The middleware reads the threshold when the app builds its stack on the first request.
+    monkeypatch.setattr(get_settings(), "slow_query_threshold_ms", 0)
+
+    with caplog.at_level(logging.WARNING, logger="Assignment1.app.core.query_stats"):
+        resp = await patient_client.get(
+            "/api/v1/patient/appointments", params={"patient_id": seed_patient_data["patient_id"]}
+        )
+
+    assert resp.status_code == 200
+    record = next(item for item in caplog.records if item.message == "slow_db_request")
+    assert record.path == "/api/v1/patient/appointments"
+    assert record.db_statements == 1
+    assert "appointments" in record.db_slowest_statement
+
+
+@pytest.mark.asyncio
+async def test_track_queries_outside_requests(session_factory) -> None:
+    with track_queries() as stats:
+        async with session_factory() as session:
+            await session.execute(text("SELECT 1"))
+            await session.execute(text("SELECT 2"))
+
+    assert stats.count == 2
+    assert stats.slowest_statement in {"SELECT 1", "SELECT 2"}
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from datetime import date, time
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from Assignment1.app.db import Base, Doctor, HospitalSlot, Patient, Treatment
+from Assignment1.app.db.session import (
+    READ_YOUR_WRITES_COOKIE,
+    SessionRouter,
+    call_after_commit,
+    get_session_router,
+    savepoint,
+)
+from Assignment1.main_patient import create_app
+
+
+async def _build_factory(path: Path) -> async_sessionmaker:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def _seed(factory: async_sessionmaker, doctor_name: str) -> None:
+    async with factory() as session:
+        session.add_all(
+            [
+                Doctor(id=1, name=doctor_name, department="Dermatology"),
+                Patient(id=1, name="Routing Patient", phone="010-7777-0000"),
+                Treatment(
+                    id=1,
+                    name="Routing Treatment",
+                    duration_minutes=30,
+                    price=10000,
+                ),
+                HospitalSlot(start_time=time(10, 0), end_time=time(10, 30), capacity=2),
+            ]
+        )
+        await session.commit()
+
+
+@pytest_asyncio.fixture
+async def routed_factories(tmp_path: Path) -> AsyncIterator[tuple[async_sessionmaker, ...]]:
+    primary = await _build_factory(tmp_path / "primary.db")
+    replica = await _build_factory(tmp_path / "replica.db")
+    await _seed(primary, "Dr. Primary")
+    await _seed(replica, "Dr. Replica")
+    yield primary, replica
+    for factory in (primary, replica):
+        await factory.kw["bind"].dispose()
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_and_writes_pin_primary(routed_factories) -> None:
+    primary, replica = routed_factories
+    app = create_app()
+    router = SessionRouter(primary, [replica], read_your_writes_seconds=30)
+    app.dependency_overrides[get_session_router] = lambda: router
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        doctors = await client.get("/api/v1/patient/doctors")
+        assert [item["name"] for item in doctors.json()] == ["Dr. Replica"]
+
+        booking = await client.post(
+            "/api/v1/patient/appointments",
+            json={
+                "patient_id": 1,
+                "doctor_id": 1,
+                "treatment_id": 1,
+                "start_at": f"{date.today().isoformat()}T10:00:00",
+            },
+        )
+        assert booking.status_code == 201
+        assert booking.json()["doctor"]["name"] == "Dr. Primary"
+        assert READ_YOUR_WRITES_COOKIE in booking.cookies
+
+        # The client now carries the cookie, so its reads see its own write.
+        pinned = await client.get("/api/v1/patient/appointments", params={"patient_id": 1})
+        assert [item["id"] for item in pinned.json()["items"]] == [booking.json()["id"]]
+
+        client.cookies.clear()
+        unpinned = await client.get(
+            "/api/v1/patient/appointments", params={"patient_id": 1}
+        )
+        assert unpinned.json()["items"] == []
+
+
+def test_reader_round_robins_replicas() -> None:
+    primary = async_sessionmaker()
+    replicas = [async_sessionmaker(), async_sessionmaker()]
+    router = SessionRouter(primary, replicas)
+
+    assert [router.reader() for _ in range(4)] == [*replicas, *replicas]
+    assert router.reader(pin_primary=True) is primary
+    assert router.writer() is primary
+    assert SessionRouter(primary).reader() is primary
+
+
+@pytest.mark.asyncio
+async def test_savepoint_rollback_keeps_earlier_after_commit_callbacks(
+    session_factory: async_sessionmaker,
+) -> None:
+    fired: list[str] = []
+    async with session_factory() as session:
+        call_after_commit(session, lambda: fired.append("kept"))
+        with pytest.raises(RuntimeError):
+            async with savepoint(session):
+                call_after_commit(session, lambda: fired.append("discarded"))
+                raise RuntimeError("conflict")
+        await session.commit()
+    assert fired == ["kept"]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import tracemalloc
+from datetime import date
+from pathlib import Path
+from time import perf_counter
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import joinedload
+
+from Assignment1.app.db import Appointment
+from Assignment1.app.services.admin_appointments import AppointmentListRow, list_appointments
+from Assignment1.app.services.catalog_cache import catalog_cache
+from Assignment1.benchmarks.generator import DatasetSpec, generate_dataset
+
+APPOINTMENTS = 50_000
+
+
+async def _legacy_list(session) -> list[AppointmentListRow]:
+    """list_appointments as it was: three joinedloads into full ORM objects."""
+    appointments = (
+        await session.scalars(
+            select(Appointment)
+            .options(
+                joinedload(Appointment.patient),
+                joinedload(Appointment.doctor),
+                joinedload(Appointment.treatment),
+            )
+            .order_by(Appointment.start_at.asc(), Appointment.id.asc())
+        )
+    ).all()
+    return [
+        AppointmentListRow(
+            item.id,
+            item.patient_id,
+            item.patient.name,
+            item.patient.phone,
+            item.doctor_id,
+            item.doctor.name,
+            item.treatment_id,
+            item.treatment.name,
+            item.start_at,
+            item.end_at,
+            item.status,
+            item.visit_type,
+            item.memo,
+        )
+        for item in appointments
+    ]
+
+
+async def _measure(factory: async_sessionmaker, listing) -> tuple[list, float, int]:
+    """Run ``listing`` in a fresh session; returns (rows, seconds, peak traced bytes)."""
+    tracemalloc.start()
+    start = perf_counter()
+    try:
+        async with factory() as session:
+            rows = await listing(session)
+        elapsed = perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return rows, elapsed, peak
+
+
+@pytest.mark.asyncio
+async def test_projected_listing_beats_joinedload(tmp_path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'listing.db'}")
+    spec = DatasetSpec.for_months(
+        3,
+        today=date(2025, 11, 8),
+        doctors=80,
+        patients=5_000,
+        treatments=8,
+        appointments=APPOINTMENTS,
+    )
+    await generate_dataset(engine, spec)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    catalog_cache.clear()
+
+    async def projected(session):
+        return await list_appointments(session)
+
+    async def by_ids(session):
+        return await list_appointments(session, catalog_lookup=True)
+
+    try:
+        async with factory() as session:
+            await by_ids(session)  # 이름 캐시를 채워 둔다.
+        legacy_rows, legacy_s, legacy_peak = await _measure(factory, _legacy_list)
+        projected_rows, projected_s, projected_peak = await _measure(factory, projected)
+        id_rows, id_s, id_peak = await _measure(factory, by_ids)
+    finally:
+        catalog_cache.clear()
+        await engine.dispose()
+
+    for label, seconds, peak in (
+        ("joinedload", legacy_s, legacy_peak),
+        ("projection", projected_s, projected_peak),
+        ("ids+cached names", id_s, id_peak),
+    ):
+        print(f"{label}: {APPOINTMENTS / seconds:,.0f} rows/s, peak {peak / 1e6:.1f} MB")
+
+    assert len(legacy_rows) == APPOINTMENTS
+    assert projected_rows == legacy_rows
+    assert id_rows == legacy_rows
+    assert projected_s < legacy_s
+    assert projected_peak * 1.5 < legacy_peak
+    assert id_peak * 2 < legacy_peak
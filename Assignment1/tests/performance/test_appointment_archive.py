@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from Assignment1.app.db import Appointment
+from Assignment1.app.services import reservation_queries as queries
+from Assignment1.app.services.admin_appointments import compute_stats, list_appointments
+from Assignment1.app.services.appointment_archive import archive_appointments
+from Assignment1.benchmarks.generator import DatasetSpec, generate_dataset
+
+TODAY = date(2025, 11, 8)
+APPOINTMENTS_PER_MONTH = 4_000
+ARCHIVE_AFTER = timedelta(days=30)
+REPEATS = 5
+
+
+async def _hot_path(factory: async_sessionmaker) -> float:
+    """Median seconds for one round of the queries every booking/admin screen runs."""
+    day_start = datetime.combine(TODAY + timedelta(days=3), time(10, 0))
+    rounds = []
+    for _ in range(REPEATS):
+        start = perf_counter()
+        async with factory() as session:
+            for patient_id in range(1, 21):
+                await session.scalar(queries.PATIENT_COMPLETED_COUNT, {"patient_id": patient_id})
+            for doctor_id in range(1, 21):
+                await session.scalar(
+                    queries.DOCTOR_OVERLAP_COUNT_FOR_UPDATE,
+                    {
+                        "doctor_id": doctor_id,
+                        "range_start": day_start,
+                        "range_end": day_start + timedelta(minutes=30),
+                    },
+                )
+            await list_appointments(session, target_date=TODAY)
+            await compute_stats(session)
+        rounds.append(perf_counter() - start)
+    return median(rounds)
+
+
+async def _history(tmp_path: Path, months: int) -> tuple[AsyncEngine, async_sessionmaker]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / f'history_{months}.db'}")
+    spec = DatasetSpec.for_months(
+        months,
+        today=TODAY,
+        doctors=20,
+        patients=2_000,
+        treatments=5,
+        appointments=APPOINTMENTS_PER_MONTH * months,
+    )
+    await generate_dataset(engine, spec)
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+@pytest.mark.asyncio
+async def test_hot_path_cost_follows_live_rows_not_history(tmp_path: Path) -> None:
+    cutoff = datetime.combine(TODAY - ARCHIVE_AFTER, time.min)
+    timings: dict[int, tuple[float, float, int]] = {}
+    for months in (3, 12):
+        engine, factory = await _history(tmp_path, months)
+        try:
+            before = await _hot_path(factory)
+            start = perf_counter()
+            moved = await archive_appointments(factory, before=cutoff, batch_size=1000)
+            archive_s = perf_counter() - start
+            after = await _hot_path(factory)
+            async with factory() as session:
+                live = await session.scalar(select(func.count()).select_from(Appointment))
+        finally:
+            await engine.dispose()
+        timings[months] = (before, after, live)
+        print(
+            f"{months:>2} months ({APPOINTMENTS_PER_MONTH * months} appointments):"
+            f" hot path {before * 1e3:.1f} ms -> {after * 1e3:.1f} ms after archiving"
+            f" {moved} rows in {archive_s:.2f} s ({live} live rows left)"
+        )
+
+    short_before, short_after, short_live = timings[3]
+    long_before, long_after, long_live = timings[12]
+    # 이력이 4배여도 옮긴 뒤에는 라이브 행 수도, 핫 경로 시간도 비슷하다.
+    assert long_live < short_live * 1.5
+    assert long_before > short_before * 2
+    assert long_after < short_after * 1.6
+    assert long_after * 2 < long_before
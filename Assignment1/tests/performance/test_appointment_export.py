@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import tracemalloc
+from datetime import date
+from pathlib import Path
+from time import perf_counter
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from Assignment1.app.services.admin_appointments import list_appointments
+from Assignment1.app.services.appointment_export import export_statement, stream_export
+from Assignment1.benchmarks.generator import DatasetSpec, generate_dataset
+
+APPOINTMENTS = 20_000
+
+
+async def _export(
+    factory: async_sessionmaker, export_format: str, **filters
+) -> tuple[int, int, float, int]:
+    """Consume the export like a client would; returns (lines, bytes, seconds, peak memory)."""
+    lines = size = 0
+    tracemalloc.start()
+    start = perf_counter()
+    try:
+        async for chunk in stream_export(factory, export_statement(**filters), export_format):
+            lines += chunk.count(b"\n")
+            size += len(chunk)
+        elapsed = perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return lines, size, elapsed, peak
+
+
+@pytest.mark.asyncio
+async def test_export_memory_stays_bounded(tmp_path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'export.db'}")
+    spec = DatasetSpec.for_months(
+        2,
+        today=date(2025, 11, 8),
+        doctors=40,
+        patients=2_000,
+        treatments=5,
+        appointments=APPOINTMENTS,
+    )
+    await generate_dataset(engine, spec)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    try:
+        await _export(factory, "ndjson")  # 문장 컴파일 캐시 등 일회성 할당을 먼저 치른다.
+        week_lines, _, _, week_peak = await _export(
+            factory, "ndjson", date_from=date(2025, 10, 20), date_to=date(2025, 10, 26)
+        )
+        ndjson_lines, ndjson_bytes, ndjson_seconds, ndjson_peak = await _export(factory, "ndjson")
+        csv_lines, _, _, csv_peak = await _export(factory, "csv")
+
+        tracemalloc.start()
+        try:
+            async with factory() as session:
+                materialized = len(await list_appointments(session))
+            list_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    finally:
+        await engine.dispose()
+
+    print(
+        f"export {APPOINTMENTS} rows: ndjson {ndjson_bytes / 1e6:.1f} MB in {ndjson_seconds:.2f} s,"
+        f" peak {ndjson_peak / 1e6:.2f} MB (one week {week_peak / 1e6:.2f} MB, csv {csv_peak / 1e6:.2f} MB)"
+        f" vs list_appointments peak {list_peak / 1e6:.1f} MB"
+    )
+    assert ndjson_lines == materialized == APPOINTMENTS
+    assert csv_lines == APPOINTMENTS + 1
+    assert 0 < week_lines * 5 < APPOINTMENTS
+    # 한 번에 한 배치(1,000행)만 메모리에 둔다: 내보내는 행 수와 무관하다.
+    assert ndjson_peak < week_peak * 1.5
+    assert ndjson_peak < ndjson_bytes / 2
+    assert max(ndjson_peak, csv_peak) * 5 < list_peak
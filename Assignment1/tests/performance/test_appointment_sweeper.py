@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from time import perf_counter
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from Assignment1.app.db import Appointment, AppointmentStatus, Base, VisitType
+from Assignment1.app.services.appointment_sweeper import (
+    APPOINTMENTS_SWEPT,
+    SWEEP_LAG,
+    load_sweep_cursor,
+    parse_sweep_rules,
+    SweepCursor,
+    sweep_appointments,
+    sweep_statement,
+)
+from Assignment1.benchmarks.generator import DatasetSpec, generate_dataset
+
+TODAY = date(2025, 11, 8)
+# 데이터셋 기준일보다 1주 뒤로 고정한 시계: 그 사이 미래 예약들이 지난 예약이 된다.
+FROZEN_NOW = datetime(2025, 11, 15, 12, 0, tzinfo=timezone.utc)
+GRACE = timedelta(hours=1)
+HORIZON = datetime(2025, 11, 15, 11, 0)
+RULES = parse_sweep_rules({"CONFIRMED": "COMPLETED", "PENDING": "CANCELLED"})
+OPEN = (AppointmentStatus.PENDING, AppointmentStatus.CONFIRMED)
+
+
+async def _open_counts(factory: async_sessionmaker) -> tuple[Counter, int]:
+    """Open appointments before the horizon by status, and open ones after it."""
+    async with factory() as session:
+        rows = await session.execute(
+            select(Appointment.status, func.count())
+            .where(Appointment.status.in_(OPEN), Appointment.end_at < HORIZON)
+            .group_by(Appointment.status)
+        )
+        past = Counter(dict(rows.all()))
+        future = await session.scalar(
+            select(func.count())
+            .select_from(Appointment)
+            .where(Appointment.status.in_(OPEN), Appointment.end_at >= HORIZON)
+        )
+    return past, future
+
+
+def _swept() -> dict[str, float]:
+    return {
+        current: APPOINTMENTS_SWEPT.value(current, target.value)
+        for current, target in (
+            ("CONFIRMED", AppointmentStatus.COMPLETED),
+            ("PENDING", AppointmentStatus.CANCELLED),
+        )
+    }
+
+
+@pytest.mark.asyncio
+async def test_sweeper_resumes_throttled_runs_with_a_frozen_clock(tmp_path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'sweep.db'}")
+    spec = DatasetSpec.for_months(
+        3, today=TODAY, doctors=20, patients=2_000, treatments=5, appointments=12_000
+    )
+    await generate_dataset(engine, spec)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    pauses: list[float] = []
+
+    async def sleep(seconds: float) -> None:
+        pauses.append(seconds)
+
+    async def run(max_batches: int):
+        return await sweep_appointments(
+            factory,
+            now=FROZEN_NOW,
+            rules=RULES,
+            grace=GRACE,
+            batch_size=100,
+            max_batches=max_batches,
+            pause_seconds=0.05,
+            sleep=sleep,
+        )
+
+    try:
+        expected, future_before = await _open_counts(factory)
+        before = _swept()
+
+        # 한 번에 3배치까지만: 커서를 남기고 멈춘다.
+        first = await run(max_batches=3)
+        assert (first.batches, first.swept, first.caught_up) == (3, 300, False)
+        assert pauses == [0.05, 0.05]
+        async with factory() as session:
+            assert await load_sweep_cursor(session) == first.cursor
+        assert SWEEP_LAG.value() > 0
+
+        # 새 프로세스처럼 저장된 커서에서 이어서 끝까지 간다.
+        start = perf_counter()
+        rest = await run(max_batches=1_000)
+        elapsed = perf_counter() - start
+        assert rest.caught_up and rest.cursor is None
+        assert first.swept + rest.swept == sum(expected.values())
+        async with factory() as session:
+            assert await load_sweep_cursor(session) is None
+        assert SWEEP_LAG.value() == 0
+
+        after = _swept()
+        assert after["CONFIRMED"] - before["CONFIRMED"] == expected[AppointmentStatus.CONFIRMED]
+        assert after["PENDING"] - before["PENDING"] == expected[AppointmentStatus.PENDING]
+        remaining, future_after = await _open_counts(factory)
+        assert sum(remaining.values()) == 0
+        assert future_after == future_before
+
+        # 지나간 뒤에 과거 시각으로 들어온 예약도 다음 회차가 처음부터 훑으며 잡는다.
+        async with factory() as session:
+            # 생성기는 진료 시간 안에만 예약을 만들므로 07:00 은 비어 있다.
+            start_at = datetime.combine(TODAY - timedelta(days=30), time(7, 0))
+            late = Appointment(
+                patient_id=1,
+                doctor_id=1,
+                treatment_id=1,
+                start_at=start_at,
+                end_at=start_at + timedelta(minutes=30),
+                status=AppointmentStatus.PENDING,
+                visit_type=VisitType.FIRST,
+            )
+            session.add(late)
+            await session.commit()
+        again = await run(max_batches=1_000)
+        assert (again.swept, again.caught_up) == (1, True)
+        async with factory() as session:
+            assert (await session.get(Appointment, late.id)).status == AppointmentStatus.CANCELLED
+    finally:
+        await engine.dispose()
+
+    print(
+        f"swept {first.swept + rest.swept} past appointments"
+        f" ({expected[AppointmentStatus.CONFIRMED]} confirmed,"
+        f" {expected[AppointmentStatus.PENDING]} pending) in"
+        f" {first.batches + rest.batches} batches; resumed run took {elapsed:.2f} s"
+    )
+
+
+def test_sweep_rules_must_be_allowed_transitions() -> None:
+    with pytest.raises(ValueError):
+        parse_sweep_rules({"COMPLETED": "CANCELLED"})
+    with pytest.raises(ValueError):
+        parse_sweep_rules({"PENDING": "COMPLETED"})
+
+
+@pytest.mark.asyncio
+async def test_sweep_query_uses_the_status_end_at_index() -> None:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            for after in (None, SweepCursor(HORIZON - GRACE, 42)):
+                statement = sweep_statement(
+                    rules=RULES, horizon=HORIZON, after=after, batch_size=100
+                )
+                compiled = statement.compile(
+                    dialect=conn.dialect, compile_kwargs={"render_postcompile": True}
+                )
+                params = compiled.construct_params()
+                bound = tuple(
+                    getattr(params[name], "value", params[name]) for name in compiled.positiontup
+                )
+                rows = (
+                    await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", bound)
+                ).all()
+                plan = "\n".join(row[-1] for row in rows)
+                assert "idx_appointments_status_end_at" in plan, plan
+    finally:
+        await engine.dispose()
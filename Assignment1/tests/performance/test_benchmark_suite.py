@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from Assignment1.benchmarks import SCENARIOS, compare_reports, run_suite
+from Assignment1.benchmarks.__main__ import main
+from Assignment1.benchmarks.runner import percentile
+
+READ_SCENARIOS = {"availability_read", "admin_listing", "admin_stats"}
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_suite_reports_every_scenario_and_parameter() -> None:
+    report = await run_suite(sizes=[30], concurrencies=[1, 2], requests=6)
+
+    assert report["meta"]["dialect"] == "sqlite"
+    assert len(report["results"]) == len(SCENARIOS) * 2
+    for key, result in report["results"].items():
+        assert result["ops"] == 6, key
+        assert set(result["latency_ms"]) == {"mean", "p50", "p95", "p99", "max"}
+        assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+        assert result["queries_per_op"]["mean"] >= 1, key
+        if result["scenario"] in READ_SCENARIOS or result["concurrency"] == 1:
+            assert result["errors"] == 0, (key, result["statuses"])
+
+    churn = report["results"]["cancellation_churn[size=30,concurrency=1]"]
+    assert churn["statuses"] == {"200": 6, "201": 6}
+    assert len(compare_reports(report, report)) == len(report["results"])
+
+
+@pytest.mark.benchmark
+def test_cli_writes_diffable_json(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    output = tmp_path / "report.json"
+    assert (
+        main(
+            [
+                "run",
+                "--sizes",
+                "20",
+                "--concurrency",
+                "1",
+                "--requests",
+                "3",
+                "--scenarios",
+                "availability_read",
+                "admin_stats",
+                "--output",
+                str(output),
+            ]
+        )
+        == 0
+    )
+    report = json.loads(output.read_text())
+    assert sorted(report["results"]) == [
+        "admin_stats[size=20,concurrency=1]",
+        "availability_read[size=20,concurrency=1]",
+    ]
+
+    assert main(["compare", str(output), str(output)]) == 0
+    printed = capsys.readouterr().out
+    assert "availability_read[size=20,concurrency=1]: p95" in printed
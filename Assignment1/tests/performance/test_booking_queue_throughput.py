@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import pytest
+
+from Assignment1.benchmarks import run_suite
+
+REQUESTS = 64
+CONCURRENCY = 8
+KEY = f"booking_contention[size=30,concurrency={CONCURRENCY}]"
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_day_queue_serializes_skewed_contention_without_errors() -> None:
+    reports = {
+        mode: await run_suite(
+            sizes=[30],
+            concurrencies=[CONCURRENCY],
+            requests=REQUESTS,
+            scenarios=["booking_contention"],
+            booking_queue_mode=mode,
+        )
+        for mode in ("off", "day")
+    }
+    queued = reports["day"]["results"][KEY]
+    assert reports["day"]["meta"]["booking_queue_mode"] == "day"
+
+    # 같은 시간대를 두고 경쟁하는 요청 묶음마다 정확히 한 건만 성공하고 나머지는 409로 끝난다.
+    assert queued["errors"] == 0
+    assert queued["statuses"] == {
+        "201": REQUESTS // CONCURRENCY,
+        "409": REQUESTS - REQUESTS // CONCURRENCY,
+    }
+    baseline = reports["off"]["results"][KEY]
+    print(
+        f"booking_contention x{CONCURRENCY}: "
+        f"off {baseline['throughput_ops_s']:.1f} ops/s ({baseline['errors']} errors), "
+        f"day queue {queued['throughput_ops_s']:.1f} ops/s"
+    )
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import perf_counter
+
+import pytest
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from Assignment1.app.db import (
+    Appointment,
+    AppointmentStatus,
+    Base,
+    Doctor,
+    OutboxEvent,
+    Patient,
+    Treatment,
+    VisitType,
+)
+from Assignment1.app.services import admin_appointments
+
+APPOINTMENTS = 1_000
+FIRST_START = datetime(2025, 11, 10, 9, 0)
+
+
+@pytest.mark.asyncio
+async def test_confirming_a_day_in_one_request(tmp_path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'status.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Doctor), [{"id": 1, "name": "Dr. Desk", "department": "Laser"}])
+        await conn.execute(insert(Patient), [{"id": 1, "name": "Front Desk", "phone": "010-1"}])
+        await conn.execute(
+            insert(Treatment),
+            [{"id": 1, "name": "Toning", "duration_minutes": 30, "price": 100000}],
+        )
+        await conn.execute(
+            insert(Appointment),
+            [
+                {
+                    "patient_id": 1,
+                    "doctor_id": 1,
+                    "treatment_id": 1,
+                    "start_at": FIRST_START + timedelta(minutes=30 * index),
+                    "end_at": FIRST_START + timedelta(minutes=30 * index + 30),
+                    "status": AppointmentStatus.PENDING,
+                    "visit_type": VisitType.FIRST,
+                }
+                for index in range(2 * APPOINTMENTS)
+            ],
+        )
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    try:
+        async with factory() as session:
+            ids = (await session.scalars(select(Appointment.id).order_by(Appointment.id))).all()
+        one_by_one, bulk_ids = ids[:APPOINTMENTS], ids[APPOINTMENTS:]
+
+        # 기존 방식: 예약마다 요청 하나(관계 3개 joinedload·flush·커밋)
+        start = perf_counter()
+        for appointment_id in one_by_one:
+            async with factory() as session:
+                await admin_appointments.update_status(
+                    session, appointment_id, AppointmentStatus.CONFIRMED
+                )
+                await session.commit()
+        single_s = perf_counter() - start
+
+        start = perf_counter()
+        async with factory() as session:
+            results = await admin_appointments.change_statuses(
+                session, bulk_ids, AppointmentStatus.CONFIRMED
+            )
+            await session.commit()
+        bulk_s = perf_counter() - start
+
+        async with factory() as session:
+            statuses = Counter((await session.scalars(select(Appointment.status))).all())
+            events = await session.scalar(select(func.count()).select_from(OutboxEvent))
+    finally:
+        await engine.dispose()
+
+    print(
+        f"confirm {APPOINTMENTS} appointments: one request each {single_s * 1e3:.0f} ms,"
+        f" one bulk request {bulk_s * 1e3:.0f} ms"
+    )
+    assert Counter(result.outcome for result in results) == {"updated": APPOINTMENTS}
+    assert statuses == {AppointmentStatus.CONFIRMED: 2 * APPOINTMENTS}
+    assert events == 2 * APPOINTMENTS
+    assert bulk_s * 10 < single_s
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections import Counter
+from pathlib import Path
+from time import perf_counter
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from Assignment1.app.db import Base, Doctor
+from Assignment1.app.services import admin_catalog
+
+BULK_ROWS = 5_000
+SINGLE_ROWS = 500
+
+
+def _doctors(count: int, *, prefix: str, department: str = "Dermatology") -> list[dict]:
+    return [
+        {"name": f"{prefix} {index:05d}", "department": department, "is_active": True}
+        for index in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_outpaces_single_creates(tmp_path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'catalog.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    try:
+        # 기존 방식: 항목마다 요청 하나(세션·INSERT·refresh·커밋)
+        start = perf_counter()
+        for item in _doctors(SINGLE_ROWS, prefix="Single"):
+            async with factory() as session:
+                await admin_catalog.create_doctor(session, **item)
+                await session.commit()
+        single_rate = SINGLE_ROWS / (perf_counter() - start)
+
+        items = _doctors(BULK_ROWS, prefix="Bulk")
+        start = perf_counter()
+        async with factory() as session:
+            created = await admin_catalog.bulk_upsert_doctors(session, items)
+            await session.commit()
+        bulk_rate = BULK_ROWS / (perf_counter() - start)
+
+        # 절반만 바꿔 다시 보내면 바뀐 행만 쓴다.
+        for item in items[::2]:
+            item["department"] = "Laser"
+        start = perf_counter()
+        async with factory() as session:
+            upserted = await admin_catalog.bulk_upsert_doctors(session, items)
+            await session.commit()
+        upsert_rate = BULK_ROWS / (perf_counter() - start)
+
+        async with factory() as session:
+            departments = Counter(
+                (
+                    await session.scalars(
+                        select(Doctor.department).where(Doctor.name.like("Bulk%"))
+                    )
+                ).all()
+            )
+            total = await session.scalar(select(func.count()).select_from(Doctor))
+    finally:
+        await engine.dispose()
+
+    print(
+        f"single create {single_rate:,.0f} rows/s, bulk create {bulk_rate:,.0f} rows/s,"
+        f" bulk upsert (half changed) {upsert_rate:,.0f} rows/s"
+    )
+    assert Counter(result.outcome for result in created) == {"created": BULK_ROWS}
+    assert Counter(result.outcome for result in upserted) == {
+        "updated": BULK_ROWS // 2,
+        "unchanged": BULK_ROWS // 2,
+    }
+    assert [result.id for result in upserted] == [result.id for result in created]
+    assert departments == {"Laser": BULK_ROWS // 2, "Dermatology": BULK_ROWS // 2}
+    assert total == SINGLE_ROWS + BULK_ROWS
+    assert bulk_rate > single_rate * 10
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import replace
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from Assignment1.app.db import (
+    Appointment,
+    AppointmentSlot,
+    AppointmentStatus,
+    HospitalSlot,
+    Treatment,
+)
+from Assignment1.app.services.slot_rules import overlaps_lunch
+from Assignment1.benchmarks.generator import DatasetSpec, generate_dataset
+
+TODAY = date(2025, 11, 8)
+
+
+@pytest.mark.asyncio
+async def test_generated_dataset_is_consistent(tmp_path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'generated.db'}")
+    spec = DatasetSpec.for_months(
+        1,
+        future_days=10,
+        today=TODAY,
+        doctors=4,
+        patients=50,
+        treatments=5,
+        appointments=1_500,
+        batch_size=257,
+    )
+    summary = await generate_dataset(engine, spec)
+
+    assert summary.appointments == 1_500
+    async with engine.connect() as conn:
+        assert await conn.scalar(select(func.count()).select_from(Appointment)) == 1_500
+        appointments = (
+            await conn.execute(
+                select(
+                    Appointment.id,
+                    Appointment.doctor_id,
+                    Appointment.start_at,
+                    Appointment.end_at,
+                    Appointment.status,
+                    Treatment.duration_minutes,
+                ).join(Treatment)
+            )
+        ).all()
+        slot_rows = Counter(
+            appointment_id
+            for appointment_id, in await conn.execute(select(AppointmentSlot.appointment_id))
+        )
+        hospital_slots = (
+            await conn.execute(select(HospitalSlot.start_time, HospitalSlot.end_time))
+        ).all()
+    await engine.dispose()
+
+    # 관리자 API가 받아 주는 슬롯만 만든다: 점심시간(12:00-13:00)은 비어 있다.
+    assert len(hospital_slots) == len(summary.windows) == 16
+    assert not any(overlaps_lunch(start, end) for start, end in hospital_slots)
+
+    assert sum(slot_rows.values()) == summary.appointment_slots
+    by_doctor: dict[int, list[tuple]] = {}
+    for appointment_id, doctor_id, start_at, end_at, status, duration in appointments:
+        assert end_at - start_at == timedelta(minutes=duration)
+        assert not overlaps_lunch(start_at.time(), end_at.time())
+        # 30분 구간마다 AppointmentSlot 한 행
+        assert slot_rows[appointment_id] == duration // 30
+        if start_at.date() < TODAY:
+            assert status != AppointmentStatus.PENDING
+        else:
+            assert status != AppointmentStatus.COMPLETED
+        by_doctor.setdefault(doctor_id, []).append((start_at, end_at))
+
+    for ranges in by_doctor.values():
+        ranges.sort()
+        for (_, previous_end), (next_start, _) in zip(ranges, ranges[1:]):
+            assert previous_end <= next_start
+
+
+@pytest.mark.asyncio
+async def test_generator_refuses_overfull_or_populated_targets(tmp_path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'generated.db'}")
+    spec = DatasetSpec(
+        doctors=1, patients=1, treatments=1, appointments=10, start_date=TODAY, days=1
+    )
+    with pytest.raises(ValueError, match="do not fit"):
+        await generate_dataset(engine, replace(spec, appointments=17))
+
+    await generate_dataset(engine, spec)
+    with pytest.raises(ValueError, match="already has rows"):
+        await generate_dataset(engine, spec)
+    assert (await generate_dataset(engine, spec, reset=True)).appointments == 10
+    await engine.dispose()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import random
+from datetime import date
+from pathlib import Path
+from statistics import quantiles
+from time import perf_counter
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.services.catalog_cache import catalog_cache
+from Assignment1.app.services.patient_directory import search_doctors
+from Assignment1.benchmarks.generator import DEPARTMENTS, DatasetSpec, generate_dataset
+
+DOCTORS = 10_000
+QUERIES = 300
+
+
+def _queries() -> list[dict]:
+    rng = random.Random(7)
+    queries = []
+    for _ in range(QUERIES):
+        # "doctor 0" 처럼 짧으면 수천 건, "doctor 00123" 이면 10건 안팎이 걸린다.
+        prefix = f"doctor {rng.randrange(DOCTORS):06d}"[: rng.randint(8, 12)]
+        queries.append(
+            {
+                "prefix": prefix,
+                "department": rng.choice((None, *DEPARTMENTS)),
+                "limit": 20,
+                "offset": rng.choice((0, 0, 20)),
+            }
+        )
+    return queries
+
+
+async def _run(factory: async_sessionmaker, queries: list[dict]) -> tuple[list, list[float]]:
+    pages, latencies = [], []
+    async with factory() as session:
+        for query in queries:
+            start = perf_counter()
+            page = await search_doctors(session, **query)
+            latencies.append(perf_counter() - start)
+            pages.append((tuple(doctor.id for doctor in page.items), page.total))
+    return pages, latencies
+
+
+@pytest.mark.asyncio
+async def test_indexed_search_beats_db_fallback(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'directory.db'}")
+    spec = DatasetSpec.for_months(
+        1, today=date(2025, 11, 8), doctors=DOCTORS, patients=1, treatments=1, appointments=0
+    )
+    await generate_dataset(engine, spec)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    queries = _queries()
+    catalog_cache.clear()
+
+    try:
+        monkeypatch.setattr(get_settings(), "doctor_search_mode", "db")
+        db_pages, db_latencies = await _run(factory, queries)
+
+        monkeypatch.setattr(get_settings(), "doctor_search_mode", "index")
+        start = perf_counter()
+        await _run(factory, queries[:1])  # 카탈로그 적재 + 인덱스 생성
+        cold_s = perf_counter() - start
+        index_pages, index_latencies = await _run(factory, queries)
+    finally:
+        catalog_cache.clear()
+        await engine.dispose()
+
+    db_p50, *_, db_p95 = quantiles(db_latencies, n=20)
+    index_p50, *_, index_p95 = quantiles(index_latencies, n=20)
+    print(
+        f"{DOCTORS} doctors: db p50 {db_p50 * 1e3:.2f} ms / p95 {db_p95 * 1e3:.2f} ms,"
+        f" index p50 {index_p50 * 1e3:.3f} ms / p95 {index_p95 * 1e3:.3f} ms"
+        f" (first query incl. catalog load and index build {cold_s * 1e3:.0f} ms)"
+    )
+    assert index_pages == db_pages
+    assert any(total > 1000 for _, total in index_pages)
+    assert index_p95 * 5 < db_p50
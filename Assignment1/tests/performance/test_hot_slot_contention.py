@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import pytest
+
+from Assignment1.app.services.known_full import known_full_cache
+from Assignment1.benchmarks import run_suite
+
+KEY = "hot_slot_rush[size=30,concurrency=1]"
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_known_full_cache_skips_locking_checks_under_contention() -> None:
+    ttl = known_full_cache.ttl_seconds
+    try:
+        known_full_cache.ttl_seconds = 0
+        uncached = (
+            await run_suite(sizes=[30], concurrencies=[1], requests=40, scenarios=["hot_slot_rush"])
+        )["results"][KEY]
+        known_full_cache.ttl_seconds = 60
+        cached = (
+            await run_suite(sizes=[30], concurrencies=[1], requests=40, scenarios=["hot_slot_rush"])
+        )["results"][KEY]
+    finally:
+        known_full_cache.ttl_seconds = ttl
+        known_full_cache.release()
+
+    assert cached["statuses"] == uncached["statuses"]
+    # 반복 실패 요청(40건 중 32건)에서 잠금을 잡는 중복/정원 검사(최소 1쿼리)가 빠진다.
+    # 스케줄 버전 확인은 TTL 캐시라 두 실행 모두 요청마다 쿼리를 쓰지 않는다.
+    assert cached["queries_per_op"]["mean"] <= uncached["queries_per_op"]["mean"] - 0.75
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Callable
+
+import pytest
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from Assignment1.app.core.config import get_settings
+from Assignment1.app.core.responses import FastJSONResponse
+from Assignment1.app.db.models import AppointmentStatus, VisitType
+from Assignment1.app.routers.admin import appointments as admin_router
+from Assignment1.app.routers.admin.schemas import AppointmentAdminResponse
+from Assignment1.app.routers.patient import appointments as patient_router
+from Assignment1.app.routers.patient.schemas import AppointmentListResponse
+from Assignment1.app.services.admin_appointments import AppointmentListRow
+
+ROWS = 10_000
+
+
+def _appointments() -> list[SimpleNamespace]:
+    doctors = [SimpleNamespace(id=index, name=f"doctor-{index}", department="derm") for index in range(20)]
+    treatments = [
+        SimpleNamespace(id=index, name=f"treatment-{index}", duration_minutes=30) for index in range(5)
+    ]
+    start = datetime(2030, 1, 7, 9, 0)
+    rows = []
+    for index in range(ROWS):
+        doctor, treatment = doctors[index % 20], treatments[index % 5]
+        start_at = start + timedelta(minutes=30 * index)
+        rows.append(
+            SimpleNamespace(
+                id=index,
+                patient_id=index,
+                patient=SimpleNamespace(name=f"patient-{index}", phone=f"010-{index:08d}"),
+                doctor_id=doctor.id,
+                doctor=doctor,
+                treatment_id=treatment.id,
+                treatment=treatment,
+                start_at=start_at,
+                end_at=start_at + timedelta(minutes=30),
+                status=AppointmentStatus.CONFIRMED,
+                visit_type=VisitType.FIRST,
+                memo=None if index % 2 else "memo",
+            )
+        )
+    return rows
+
+
+def _best_ms(encode: Callable[[], bytes]) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = perf_counter()
+        encode()
+        best = min(best, perf_counter() - start)
+    return best * 1000
+
+
+def _admin_encoders() -> tuple[Callable[[], bytes], Callable[[], bytes]]:
+    """The response_model path and the fast path over the same appointments."""
+    appointments = _appointments()
+    adapter = TypeAdapter(list[AppointmentAdminResponse])
+
+    def pydantic_path() -> bytes:
+        # FastAPI 의 response_model 처리: 모델 생성 → dict → 재검증 → JSON 호환 값 → json.dumps
+        models = [admin_router._to_response_model(item) for item in appointments]
+        validated = adapter.validate_python([model.model_dump() for model in models])
+        return JSONResponse(adapter.dump_python(validated, mode="json")).body
+
+    rows = [
+        AppointmentListRow(
+            item.id,
+            item.patient_id,
+            item.patient.name,
+            item.patient.phone,
+            item.doctor_id,
+            item.doctor.name,
+            item.treatment_id,
+            item.treatment.name,
+            item.start_at,
+            item.end_at,
+            item.status,
+            item.visit_type,
+            item.memo,
+        )
+        for item in appointments
+    ]
+
+    def fast_path() -> bytes:
+        return FastJSONResponse([admin_router._to_row(row) for row in rows]).body
+
+    return pydantic_path, fast_path
+
+
+def test_admin_list_fast_path_matches_pydantic() -> None:
+    pydantic_path, fast_path = _admin_encoders()
+
+    assert json.loads(fast_path()) == json.loads(pydantic_path())
+
+
+@pytest.mark.benchmark
+def test_admin_list_fast_path_is_faster() -> None:
+    pydantic_path, fast_path = _admin_encoders()
+
+    legacy_ms = _best_ms(pydantic_path)
+    fast_ms = _best_ms(fast_path)
+    assert fast_ms * 2 < legacy_ms, (
+        f"admin list encode per {ROWS} rows:"
+        f" pydantic {legacy_ms:.1f} ms -> fast path {fast_ms:.1f} ms"
+    )
+
+
+def test_patient_list_fast_path_matches_pydantic(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "clinic_timezone", "Asia/Seoul")
+    appointments = _appointments()[:100]
+    legacy = AppointmentListResponse(items=[patient_router._to_summary(item) for item in appointments])
+    fast = FastJSONResponse({"items": [patient_router._to_row(item) for item in appointments]})
+
+    assert json.loads(fast.body) == legacy.model_dump(mode="json")
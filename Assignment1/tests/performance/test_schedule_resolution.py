@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from datetime import date, time, timedelta
+from time import perf_counter
+
+from Assignment1.app.services.hospital_schedule import EffectiveSlot, HospitalSchedule
+
+SLOTS = [
+    EffectiveSlot(index + 1, time(9 + index // 2, 30 * (index % 2)), time(9 + (index + 1) // 2, 30 * ((index + 1) % 2)), 4)
+    for index in range(18)
+]
+YEAR = [date(2030, 1, 1) + timedelta(days=offset) for offset in range(365)]
+HOLIDAYS = [date(2030, 1, 1), date(2030, 3, 1), date(2030, 5, 5), date(2030, 8, 15), date(2030, 12, 25)]
+
+
+def _schedule() -> HospitalSchedule:
+    templates = [(5, slot.id, 2) for slot in SLOTS]  # 토요일은 정원 절반
+    templates += [(6, slot.id, 0) for slot in SLOTS]  # 일요일 휴진
+    overrides = [(day, None, 0) for day in HOLIDAYS]
+    overrides += [(date(2030, 6, 2), None, 1), (date(2030, 6, 2), SLOTS[0].id, 3)]  # 일요일 특별 진료
+    return HospitalSchedule(SLOTS, templates, overrides)
+
+
+def test_effective_tables_resolve_per_date() -> None:
+    schedule = _schedule()
+    monday, saturday, sunday = date(2030, 1, 7), date(2030, 1, 12), date(2030, 1, 13)
+
+    assert [slot.capacity for slot in schedule.for_date(monday).slots] == [4] * 18
+    assert {slot.capacity for slot in schedule.for_date(saturday).slots} == {2}
+    assert schedule.for_date(sunday).slots == ()
+    assert schedule.for_date(date(2030, 3, 1)).slots == ()
+
+    special = schedule.for_date(date(2030, 6, 2))
+    assert special.slots[0].capacity == 3
+    assert {slot.capacity for slot in special.slots[1:]} == {1}
+    assert special.by_range[(time(9, 0), time(9, 30))] is special.slots[0]
+    # 예외가 없는 날은 요일 표를 그대로 공유한다.
+    assert schedule.for_date(monday) is schedule.for_date(monday + timedelta(days=7))
+
+
+def test_year_of_dates_resolves_quickly() -> None:
+    build_start = perf_counter()
+    schedule = _schedule()
+    build = perf_counter() - build_start
+
+    best = float("inf")
+    for _ in range(5):
+        start = perf_counter()
+        open_days = sum(1 for day in YEAR if schedule.for_date(day).slots)
+        best = min(best, perf_counter() - start)
+    print(f"schedule: build {build * 1000:.2f} ms, 365 dates resolved in {best * 1000:.3f} ms")
+
+    # 일요일 52일과 평일 공휴일 4일이 닫히고, 특별 진료하는 일요일 하루가 열린다.
+    assert open_days == 365 - 52 - 4 + 1
+    assert best < 0.01
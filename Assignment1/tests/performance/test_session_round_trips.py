@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date, time
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from Assignment1.app.db import Base, Doctor, HospitalSlot, Patient, Treatment
+from Assignment1.app.db.session import SessionRouter, get_session_router, has_pending_writes
+from Assignment1.app.services.catalog_cache import catalog_cache
+from Assignment1.main_patient import create_app
+
+
+def _count_round_trips(engine: AsyncEngine, counts: Counter) -> None:
+    """Count statements plus COMMIT/ROLLBACK calls that actually reach the driver."""
+    sync_engine = engine.sync_engine
+    dialect = sync_engine.dialect
+    do_commit, do_rollback = dialect.do_commit, dialect.do_rollback
+
+    def counted_commit(dbapi_connection) -> None:
+        counts["commit"] += 1
+        do_commit(dbapi_connection)
+
+    def counted_rollback(dbapi_connection) -> None:
+        if not (
+            dialect.skip_autocommit_rollback
+            and dialect.detect_autocommit_setting(dbapi_connection)
+        ):
+            counts["rollback"] += 1
+        do_rollback(dbapi_connection)
+
+    dialect.do_commit = counted_commit
+    dialect.do_rollback = counted_rollback
+    event.listen(
+        sync_engine,
+        "before_cursor_execute",
+        lambda *args: counts.update(["execute"]),
+    )
+
+
+@pytest.mark.asyncio
+async def test_patient_reads_skip_transaction_round_trips(tmp_path: Path) -> None:
+    url = f"sqlite+aiosqlite:///{tmp_path / 'round_trips.db'}"
+    engine = create_async_engine(url)
+    read_only_engine = create_async_engine(
+        url,
+        isolation_level="AUTOCOMMIT",
+        skip_autocommit_rollback=True,
+        pool_reset_on_return=None,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        session.add_all(
+            [
+                Doctor(id=1, name="Dr. Trip", department="Dermatology"),
+                Patient(id=1, name="Trip Patient", phone="010-5555-0000"),
+                Treatment(id=1, name="Trip Care", duration_minutes=30, price=1000),
+                HospitalSlot(start_time=time(10, 0), end_time=time(10, 30), capacity=2),
+            ]
+        )
+        await session.commit()
+
+    counts: Counter = Counter()
+    _count_round_trips(engine, counts)
+    _count_round_trips(read_only_engine, counts)
+
+    app = create_app()
+    router = SessionRouter(
+        factory,
+        primary_reader=async_sessionmaker(read_only_engine, expire_on_commit=False),
+    )
+    app.dependency_overrides[get_session_router] = lambda: router
+    today = date.today().isoformat()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as client:
+        # Warm up connections so first-connect initialisation is not counted.
+        await client.get("/api/v1/patient/doctors")
+        await client.post("/api/v1/patient/appointments/0/cancel?patient_id=0")
+
+        for path, params in [
+            ("/api/v1/patient/doctors", {}),
+            ("/api/v1/patient/treatments", {}),
+            ("/api/v1/patient/availability", {"doctor_id": 1, "date": today}),
+            ("/api/v1/patient/appointments", {"patient_id": 1}),
+        ]:
+            # 카탈로그 캐시가 있으면 목록 조회가 DB에 닿지 않으므로 매번 비운다.
+            catalog_cache.clear()
+            counts.clear()
+            resp = await client.get(path, params=params)
+            assert resp.status_code == 200
+            # Reads cost exactly their SELECTs: no COMMIT, no ROLLBACK.
+            assert counts["commit"] == 0, path
+            assert counts["rollback"] == 0, path
+            assert counts["execute"] >= 1, path
+
+        counts.clear()
+        missing = await client.post(
+            "/api/v1/patient/appointments",
+            json={
+                "patient_id": 1,
+                "doctor_id": 1,
+                "treatment_id": 999,
+                "start_at": f"{today}T10:00:00",
+            },
+        )
+        assert missing.status_code == 404
+        assert counts["commit"] == 0
+
+        counts.clear()
+        booked = await client.post(
+            "/api/v1/patient/appointments",
+            json={
+                "patient_id": 1,
+                "doctor_id": 1,
+                "treatment_id": 1,
+                "start_at": f"{today}T10:00:00",
+            },
+        )
+        assert booked.status_code == 201
+        assert counts["commit"] == 1
+
+    await engine.dispose()
+    await read_only_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_orm_dml_statements_count_as_pending_writes() -> None:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with factory() as session:
+            await session.scalar(select(Doctor.id))
+            assert not has_pending_writes(session)
+            # flush 없이 문장으로만 쓴 경우도 get_session 이 커밋하도록 표시된다.
+            await session.execute(update(Doctor).values(is_active=False))
+            assert has_pending_writes(session)
+    finally:
+        await engine.dispose()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, async_sessionmaker, create_async_engine
+
+from Assignment1.app.services import reservation_queries as queries
+from Assignment1.app.services.slot_partitions import (
+    SlotPartition,
+    enable_statements,
+    monthly_partitions,
+    plan_maintenance,
+)
+from Assignment1.benchmarks.generator import DatasetSpec, generate_dataset
+
+TODAY = date(2025, 11, 8)
+DATE_INDEX = "idx_appointment_slots_date_slot"
+REPEATS = 5
+
+
+async def _query_plan(conn: AsyncConnection, statement, params: dict) -> str:
+    compiled = statement.compile(dialect=conn.dialect)
+    values = compiled.construct_params(params)
+    bound = tuple(getattr(values[name], "value", values[name]) for name in compiled.positiontup)
+    rows = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", bound)).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+async def _slot_lookups(factory: async_sessionmaker) -> float:
+    """Median seconds for the per-date reads a day of booking checks runs."""
+    rounds = []
+    for _ in range(REPEATS):
+        start = perf_counter()
+        async with factory() as session:
+            for offset in range(10):
+                day = TODAY + timedelta(days=offset)
+                (await session.execute(queries.SLOT_OCCUPANCY_BY_DATE, {"slot_date": day})).all()
+                for slot_id in range(1, 11):
+                    await session.scalar(
+                        queries.SLOT_USAGE_COUNT_FOR_UPDATE, {"slot_id": slot_id, "slot_date": day}
+                    )
+        rounds.append(perf_counter() - start)
+    return median(rounds)
+
+
+@pytest.mark.asyncio
+async def test_slot_date_reads_use_the_date_index(tmp_path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'slots.db'}")
+    spec = DatasetSpec.for_months(
+        12, today=TODAY, doctors=50, patients=5_000, treatments=5, appointments=60_000
+    )
+    summary = await generate_dataset(engine, spec)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with engine.connect() as conn:
+            occupancy = await _query_plan(
+                conn, queries.SLOT_OCCUPANCY_BY_DATE, {"slot_date": TODAY}
+            )
+            usage = await _query_plan(
+                conn, queries.SLOT_USAGE_COUNT_FOR_UPDATE, {"slot_id": 1, "slot_date": TODAY}
+            )
+        assert DATE_INDEX in occupancy, occupancy
+        assert DATE_INDEX in usage, usage
+
+        indexed = await _slot_lookups(factory)
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP INDEX {DATE_INDEX}"))
+        scanned = await _slot_lookups(factory)
+    finally:
+        await engine.dispose()
+
+    print(
+        f"{summary.appointment_slots} slot rows: 10 days of occupancy/usage reads"
+        f" {scanned * 1e3:.1f} ms without the index -> {indexed * 1e3:.1f} ms with it"
+    )
+    # 인덱스가 없으면 날짜마다 appointment_slots 전체를 훑는다.
+    assert indexed * 5 < scanned
+
+
+def test_partition_maintenance_plan() -> None:
+    partitions = monthly_partitions(date(2025, 1, 15), date(2025, 3, 2))
+    assert [(p.name, p.upper) for p in partitions] == [
+        ("p202501", date(2025, 2, 1)),
+        ("p202502", date(2025, 3, 1)),
+        ("p202503", date(2025, 4, 1)),
+    ]
+    ddl = enable_statements(partitions, ["fk_apptslot_appt", "fk_apptslot_slot"])
+    assert ddl[0] == "ALTER TABLE appointment_slots DROP FOREIGN KEY fk_apptslot_appt"
+    assert "PARTITION BY RANGE COLUMNS(slot_date)" in ddl[-1]
+    assert "PARTITION pmax VALUES LESS THAN (MAXVALUE)" in ddl[-1]
+
+    existing = [
+        SlotPartition("p202501", date(2025, 2, 1), has_rows=False),
+        SlotPartition("p202502", date(2025, 3, 1), has_rows=True),
+        SlotPartition("p202503", date(2025, 4, 1), has_rows=True),
+        SlotPartition("pmax", None),
+    ]
+    plan = plan_maintenance(existing, today=date(2025, 4, 20), months_ahead=2, retain_months=1)
+    # 4월~6월을 pmax 에서 떼어 내고, 보관 경계(3/1) 이전 파티션은 비어 있을 때만 지운다.
+    assert [p.name for p in plan.create] == ["p202504", "p202505", "p202506"]
+    assert [p.name for p in plan.drop] == ["p202501"]
+    assert [p.name for p in plan.kept] == ["p202502"]
+    assert plan.statements[0].startswith(
+        "ALTER TABLE appointment_slots REORGANIZE PARTITION pmax INTO ("
+    )
+    assert plan.statements[1] == "ALTER TABLE appointment_slots DROP PARTITION p202501"
+
+    settled = plan_maintenance(
+        existing[:3] + plan.create + existing[3:],
+        today=date(2025, 4, 20),
+        months_ahead=2,
+        retain_months=12,
+    )
+    assert settled.statements == []
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, time, timedelta
+from pathlib import Path
+from time import perf_counter
+
+import pytest
+from sqlalchemy import delete, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from Assignment1.app.db import Base, HospitalSlot
+from Assignment1.app.services.admin_catalog import replace_hospital_slots
+
+ROUNDS = 20
+
+
+def _every_valid_slot() -> list[tuple[time, time]]:
+    """All 30-minute ranges on 15-minute boundaries inside operating hours, lunch excluded."""
+    ranges = []
+    cursor = datetime(2030, 1, 1, 9, 0)
+    while cursor + timedelta(minutes=30) <= datetime(2030, 1, 1, 18, 0):
+        start, end = cursor.time(), (cursor + timedelta(minutes=30)).time()
+        if end <= time(12, 0) or start >= time(13, 0):
+            ranges.append((start, end))
+        cursor += timedelta(minutes=15)
+    return ranges
+
+
+async def _legacy_replace(session, slot_specs) -> list[HospitalSlot]:
+    """replace_hospital_slots as it was: wipe the table, reinsert and refresh every row."""
+    new_slots = [
+        HospitalSlot(start_time=start_time, end_time=end_time, capacity=capacity)
+        for start_time, end_time, capacity in slot_specs
+    ]
+    await session.execute(delete(HospitalSlot))
+    session.add_all(new_slots)
+    await session.flush()
+    for slot in new_slots:
+        await session.refresh(slot)
+    return new_slots
+
+
+@pytest.mark.asyncio
+async def test_diff_replace_uses_constant_statements(tmp_path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'slots.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    statements: Counter = Counter()
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.update(["n"]))
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    ranges = _every_valid_slot()
+
+    async def measure(replace) -> tuple[float, float]:
+        async with factory() as session:
+            await _legacy_replace(session, [(start, end, 1) for start, end in ranges])
+            await session.commit()
+        statements.clear()
+        start = perf_counter()
+        for round_ in range(ROUNDS):
+            async with factory() as session:
+                # 매번 정원을 바꾸고, 마지막 슬롯은 번갈아 빠졌다 들어온다.
+                specs = [(start, end, 1 + round_ % 3) for start, end in ranges]
+                await replace(session, specs if round_ % 2 else specs[:-1])
+                await session.commit()
+        elapsed = perf_counter() - start
+        return elapsed / ROUNDS * 1000, statements["n"] / ROUNDS
+
+    try:
+        legacy_ms, legacy_statements = await measure(_legacy_replace)
+        diff_ms, diff_statements = await measure(replace_hospital_slots)
+    finally:
+        await engine.dispose()
+
+    print(
+        f"replace {len(ranges)} slots: wipe+refresh {legacy_ms:.2f} ms / {legacy_statements:.0f} statements"
+        f" -> diff {diff_ms:.2f} ms / {diff_statements:.0f} statements"
+    )
+    assert legacy_statements >= len(ranges)
+    # 조회 1 + UPDATE(executemany) 1 + 삭제/추가 1 + 버전 갱신 1~2
+    assert diff_statements <= 6
+    assert diff_ms < legacy_ms
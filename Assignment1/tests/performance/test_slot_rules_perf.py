@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import random
+from datetime import date, datetime, time, timedelta
+from time import perf_counter
+from types import SimpleNamespace
+
+from Assignment1.app.services.slot_rules import available_windows
+
+ITERATIONS = 300
+DAY = date(2030, 1, 7)
+SLOTS = [
+    SimpleNamespace(id=index + 1, start_time=start.time(), end_time=(start + timedelta(minutes=30)).time(), capacity=3)
+    for index, start in enumerate(
+        datetime.combine(DAY, time(9, 0)) + timedelta(minutes=30 * step) for step in range(18)
+    )
+]
+
+
+def _legacy_available_windows(target_date, slots, slot_counts, booked_ranges, duration_minutes=30):
+    """available_windows as it was before minute offsets: timedeltas and datetimes per step."""
+
+    def expand(start_at, duration):
+        result = []
+        cursor = start_at.replace(minute=(start_at.minute // 15) * 15, second=0, microsecond=0)
+        remaining = timedelta(minutes=duration)
+        while remaining > timedelta():
+            slot_end = cursor + timedelta(minutes=30)
+            result.append((cursor, slot_end))
+            cursor = slot_end
+            remaining -= timedelta(minutes=30)
+        return result
+
+    slot_map = {(slot.start_time, slot.end_time): slot for slot in slots}
+    availability = []
+    cursor = datetime.combine(target_date, slots[0].start_time)
+    close_boundary = datetime.combine(target_date, slots[-1].end_time) - timedelta(
+        minutes=duration_minutes
+    )
+    while cursor <= close_boundary:
+        reservation_slots = expand(cursor, duration_minutes)
+        window_start, window_end = reservation_slots[0][0], reservation_slots[-1][1]
+        cursor += timedelta(minutes=15)
+        min_remaining = None
+        for slot_start, slot_end in reservation_slots:
+            slot = slot_map.get((slot_start.time(), slot_end.time()))
+            remaining = 0 if slot is None else slot.capacity - slot_counts.get(slot.id, 0)
+            if remaining <= 0:
+                break
+            if min_remaining is None or remaining < min_remaining:
+                min_remaining = remaining
+        else:
+            if not any(
+                booked_start < window_end and booked_end > window_start
+                for booked_start, booked_end in booked_ranges
+            ):
+                availability.append((window_start, window_end, min_remaining or 0))
+    return availability
+
+
+def _cases(count: int):
+    rng = random.Random(38)
+    for _ in range(count):
+        counts = {slot.id: rng.randint(0, 3) for slot in SLOTS}
+        booked = []
+        for _ in range(rng.randint(0, 4)):
+            start = datetime.combine(DAY, time(9, 0)) + timedelta(minutes=15 * rng.randint(0, 34))
+            booked.append((start, start + timedelta(minutes=30 * rng.randint(1, 3))))
+        yield counts, booked, rng.choice((30, 60, 90))
+
+
+def test_minute_offsets_match_legacy_windows() -> None:
+    for counts, booked, duration in _cases(200):
+        assert available_windows(DAY, SLOTS, counts, booked, duration) == _legacy_available_windows(
+            DAY, SLOTS, counts, booked, duration
+        )
+
+
+def _per_call_us(compute, cases) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = perf_counter()
+        for counts, booked, duration in cases:
+            compute(DAY, SLOTS, counts, booked, duration)
+        best = min(best, perf_counter() - start)
+    return best / len(cases) * 1_000_000
+
+
+def test_minute_offsets_cut_per_call_cost() -> None:
+    cases = list(_cases(ITERATIONS))
+    legacy = _per_call_us(_legacy_available_windows, cases)
+    current = _per_call_us(available_windows, cases)
+    print(f"available_windows: legacy {legacy:.1f} us/call -> minute offsets {current:.1f} us/call")
+    assert current * 2 < legacy
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time
+from time import perf_counter
+
+import pytest
+from sqlalchemy import and_, func, select, tuple_
+
+from Assignment1.app.db import Appointment, AppointmentSlot, AppointmentStatus, HospitalSlot
+from Assignment1.app.services import reservation_queries as queries
+
+ITERATIONS = 2_000
+DAY = date(2025, 11, 8)
+START = datetime(2025, 11, 8, 10, 0)
+END = datetime(2025, 11, 8, 11, 0)
+SLOT_KEYS = [(time(10, 0), time(10, 30)), (time(10, 30), time(11, 0))]
+
+
+def _legacy_availability():
+    """Statements as list_availability built them inline before the prebuilt module."""
+    return [
+        select(HospitalSlot).order_by(HospitalSlot.start_time),
+        select(AppointmentSlot.slot_id, func.count(AppointmentSlot.appointment_id))
+        .join(Appointment)
+        .where(AppointmentSlot.slot_date == DAY)
+        .where(Appointment.status != AppointmentStatus.CANCELLED)
+        .group_by(AppointmentSlot.slot_id),
+        select(Appointment)
+        .where(Appointment.doctor_id == 1)
+        .where(Appointment.status != AppointmentStatus.CANCELLED)
+        .where(Appointment.start_at < END)
+        .where(Appointment.end_at > START),
+    ]
+
+
+def _legacy_booking():
+    statements = [
+        select(HospitalSlot).where(
+            tuple_(HospitalSlot.start_time, HospitalSlot.end_time).in_(SLOT_KEYS)
+        ),
+        select(func.count())
+        .select_from(Appointment)
+        .where(Appointment.doctor_id == 1)
+        .where(Appointment.status != AppointmentStatus.CANCELLED)
+        .where(and_(Appointment.start_at < END, Appointment.end_at > START))
+        .with_for_update(),
+    ]
+    for slot_id in (1, 2):
+        statements.append(
+            select(func.count())
+            .select_from(AppointmentSlot)
+            .join(Appointment)
+            .where(AppointmentSlot.slot_id == slot_id)
+            .where(AppointmentSlot.slot_date == DAY)
+            .where(Appointment.status != AppointmentStatus.CANCELLED)
+            .with_for_update()
+        )
+    statements.append(
+        select(func.count())
+        .select_from(Appointment)
+        .where(Appointment.patient_id == 1)
+        .where(Appointment.status == AppointmentStatus.COMPLETED)
+    )
+    return statements
+
+
+def _prebuilt_availability():
+    return [
+        queries.SCHEDULE_VERSION,
+        queries.SLOT_OCCUPANCY_BY_DATE,
+        queries.DOCTOR_APPOINTMENTS_IN_RANGE,
+    ]
+
+
+def _prebuilt_booking():
+    return [
+        queries.SCHEDULE_VERSION,
+        queries.DOCTOR_OVERLAP_COUNT_FOR_UPDATE,
+        queries.SLOT_USAGE_COUNT_FOR_UPDATE,
+        queries.SLOT_USAGE_COUNT_FOR_UPDATE,
+        queries.PATIENT_COMPLETED_COUNT,
+    ]
+
+
+def _per_call_us(build) -> float:
+    """Statement construction plus the cache-key lookup SQLAlchemy does per execute."""
+    best = float("inf")
+    for _ in range(3):
+        start = perf_counter()
+        for _ in range(ITERATIONS):
+            for statement in build():
+                statement._generate_cache_key()
+        best = min(best, perf_counter() - start)
+    return best / ITERATIONS * 1_000_000
+
+
+@pytest.mark.benchmark
+def test_prebuilt_statements_cut_per_call_overhead() -> None:
+    results = {
+        "availability": (_per_call_us(_legacy_availability), _per_call_us(_prebuilt_availability)),
+        "booking": (_per_call_us(_legacy_booking), _per_call_us(_prebuilt_booking)),
+    }
+    for name, (legacy, prebuilt) in results.items():
+        assert prebuilt * 10 < legacy, (
+            f"{name}: inline {legacy:.1f} us/call -> prebuilt {prebuilt:.1f} us/call"
+        )